@@ -1,10 +1,81 @@
 # backend/main.py
 
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES
 from fastapi.responses import JSONResponse
 from fastapi.openapi.utils import get_openapi
-from app.routes.simulation_routes import router as simulation_router
+from app.routes.simulation_routes import case_catalog, job_queue, simulation_executor, router as simulation_router
+from app.routes.metrics_routes import router as metrics_router
+from app.routes.session_routes import router as session_router
+from app.routes.job_routes import router as job_router
+from app.services import metrics
+from app.services.upload_reader import MAX_UPLOAD_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Folga para os cabeçalhos e campos do multipart além do arquivo MATPOWER
+UPLOAD_FORM_OVERHEAD = 64 * 1024
+
+# Compressão gzip das respostas a partir deste tamanho (bytes; 0 desativa) e nível usado
+GZIP_MIN_SIZE = int(os.getenv("SISEP_GZIP_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("SISEP_GZIP_LEVEL", "5"))
+
+# Converter e resolver os modelos de data/ na inicialização (catálogo em memória)
+PRELOAD_CASES = os.getenv("SISEP_PRELOAD_CASES", "1") != "0"
+
+async def warm_up(app: FastAPI):
+    """Carrega o catálogo e aquece o solver em segundo plano; depois verifica o catálogo periodicamente"""
+    start = time.perf_counter()
+    try:
+        if PRELOAD_CASES:
+            summary = await asyncio.to_thread(case_catalog.refresh)
+            logger.info("Catálogo carregado em %.2f s: %d modelos", time.perf_counter() - start, summary["added"])
+        # Sem catálogo (ou com processos no pool) o solver é aquecido com um caso mínimo
+        if not PRELOAD_CASES or simulation_executor.mode == "process":
+            await simulation_executor.warm_up()
+    except Exception as e:
+        logger.exception("Falha ao aquecer o solver")
+        app.state.warm_up_error = str(e)
+        return
+    app.state.ready = True
+    logger.info("Solver pronto em %.2f s", time.perf_counter() - start)
+
+    if PRELOAD_CASES and case_catalog.REFRESH_INTERVAL > 0:
+        await case_catalog.watch()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Inicialização: aquecimento em segundo plano (o processo já atende /health/live); encerramento do pool"""
+    app.state.ready = False
+    app.state.warm_up_error = None
+    task = asyncio.create_task(warm_up(app))
+    try:
+        yield
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+        job_queue.shutdown()
+        simulation_executor.shutdown()
+
+def _route_template(scope) -> str:
+    """Caminho da rota com os parâmetros (ex: /sisep/matpower/{filename}), usado como rótulo das métricas"""
+    route = scope.get("route")
+    if route is None:
+        return "desconhecida"
+    # Rotas de routers incluídos guardam o caminho sem o prefixo
+    path = scope["path"]
+    for start, char in enumerate(path):
+        if char == "/" and route.path_regex.match(path[start:]):
+            return path[:start] + route.path
+    return route.path
 
 def create_app():
     app = FastAPI(
@@ -31,6 +102,7 @@ def create_app():
         license_info={
             "name": "Open Source",
         },
+        lifespan=lifespan,
     )
 
     # Configurar CORS
@@ -48,8 +120,45 @@ def create_app():
         allow_headers=["*"],
     )
 
+    # Cronometrar as requisições (cabeçalho Server-Timing e métricas)
+    @app.middleware("http")
+    async def server_timing_middleware(request: Request, call_next):
+        with metrics.collect() as timings:
+            start = time.perf_counter()
+            response = await call_next(request)
+            timings.add("total", time.perf_counter() - start)
+
+        metrics.registry.request_duration.observe(
+            timings.spans["total"], request.method, _route_template(request.scope), str(response.status_code),
+        )
+        response.headers["Server-Timing"] = metrics.server_timing_header(timings)
+        return response
+
+    # Recusar uploads MATPOWER grandes pelo Content-Length, antes de receber o corpo
+    @app.middleware("http")
+    async def upload_size_middleware(request: Request, call_next):
+        length = request.headers.get("content-length")
+        if (request.method == "POST" and request.url.path.endswith("/upload") and length and length.isdigit()
+                and int(length) > MAX_UPLOAD_BYTES + UPLOAD_FORM_OVERHEAD):
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"Arquivo MATPOWER excede o limite de {MAX_UPLOAD_BYTES} bytes"},
+            )
+        return await call_next(request)
+
+    # Compressão das respostas grandes (corpos pré comprimidos do catálogo passam direto; o
+    # .npz da série temporal já é compactado e os eventos SSE não podem ficar retidos)
+    if GZIP_MIN_SIZE > 0:
+        app.add_middleware(
+            GZipMiddleware, minimum_size=GZIP_MIN_SIZE, compresslevel=GZIP_LEVEL,
+            exclude_content_types=(*DEFAULT_EXCLUDED_CONTENT_TYPES, "application/octet-stream"),
+        )
+
     # Incluir rotas
     app.include_router(simulation_router, prefix="/sisep", tags=["Simulação de Sistema Elétrico de Potência"])
+    app.include_router(session_router, prefix="/sisep", tags=["Sessões de edição"])
+    app.include_router(job_router, prefix="/sisep", tags=["Jobs"])
+    app.include_router(metrics_router, tags=["Monitoramento"])
 
     return app
 
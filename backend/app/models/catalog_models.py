@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class CaseInfo(BaseModel):
+    """Modelo pré carregado no catálogo, com o tamanho da rede e o caso base resolvido"""
+    filename: str
+    buses: int = 0
+    branches: int = 0                  # Linhas e transformadores
+    generators: int = 0                # Geradores e barra slack (ext_grid)
+    loads: int = 0
+    iterations: Optional[int] = None   # Iterações do fluxo de potência do caso base
+    error: Optional[str] = None        # Falha ao converter/simular o modelo
+
+class CompiledCase(BaseModel):
+    """Caso compilado de um modelo .m (arrays .npy em um .npz sem compressão)"""
+    filename: str                      # Modelo .m de origem
+    compiled: str                      # Caminho do .npz, relativo ao diretório de dados
+    arrays: List[str]                  # Matrizes armazenadas (bus, gen, branch, gencost, ...)
+    size_bytes: int
+    regenerated: bool                  # Se foi compilado agora (False: já estava atualizado)
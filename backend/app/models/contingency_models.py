@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class ContingencyResult(BaseModel):
+    """Resultado de uma contingência (ou do caso base) da análise N-1"""
+    outage_type: str                              # "base", "branch" ou "generator"
+    element: Optional[int] = None                 # Posição do ramo na lista `lines` ou barra do gerador
+    name: str
+    status: str = "ok"                            # "ok", "islanding" ou "error"
+    dc_loading_percent: Optional[float] = None    # Maior carregamento estimado na triagem DC
+    max_loading_percent: Optional[float] = None   # Maior loading_percent (LineResult) no fluxo AC
+    max_loading_line: Optional[int] = None
+    min_vm_pu: Optional[float] = None             # Menor vm_pu (BusResult) no fluxo AC
+    min_vm_bus: Optional[int] = None
+    max_vm_pu: Optional[float] = None
+    max_vm_bus: Optional[int] = None
+    overloaded_lines: List[int] = []              # Ramos acima do limite de carregamento
+    voltage_violations: List[int] = []            # Barras fora da faixa de tensão
+    detail: Optional[str] = None
+
+class ContingencyAnalysis(BaseModel):
+    """Resultado da análise N-1: contingências críticas ordenadas por severidade"""
+    loading_limit: float                          # Limite de carregamento (%)
+    vm_min: float                                 # Faixa de tensão admissível (pu)
+    vm_max: float
+    screening_threshold: float                    # Carregamento estimado (%) que leva ao fluxo AC
+    total: int                                    # Contingências avaliadas na triagem DC
+    ac_solved: int                                # Contingências simuladas com fluxo AC
+    base: ContingencyResult
+    contingencies: List[ContingencyResult] = []
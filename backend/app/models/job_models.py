@@ -0,0 +1,36 @@
+from pydantic import BaseModel, model_validator
+from typing import List, Optional
+from app.models.power_system_results import PowerSystemResult
+from app.models.scenario_models import ScenarioResult
+from app.models.solver_models import SolverOptions
+
+class JobRequest(BaseModel):
+    """Caso simulado em segundo plano (arquivo pré carregado ou conteúdo MATPOWER)"""
+    filename: Optional[str] = None          # Nome de um arquivo pré carregado (ex: case14p.m)
+    matpower: Optional[str] = None          # Conteúdo de um arquivo MATPOWER
+    solver: Optional[SolverOptions] = None  # Opções do fluxo de potência (None: padrão do servidor)
+
+    @model_validator(mode="after")
+    def check_case_source(self):
+        if (self.filename is None) == (self.matpower is None):
+            raise ValueError("Informe exatamente um entre 'filename' e 'matpower'")
+        return self
+
+class JobInfo(BaseModel):
+    """Estado de um job"""
+    job_id: str
+    kind: str                             # "simulation" ou "batch"
+    source: str                           # Nome do modelo ou "upload"
+    status: str                           # queued, running, done, failed ou cancelled
+    progress: float = 0.0                 # Fração concluída (0 a 1)
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = None    # Instante em que o resultado deixa de estar disponível
+    detail: Optional[str] = None          # Mensagem de erro quando status == "failed"
+
+class JobResult(BaseModel):
+    """Estado do job e, quando concluído, o resultado"""
+    job: JobInfo
+    result: Optional[PowerSystemResult] = None           # Jobs de simulação
+    scenarios: Optional[List[ScenarioResult]] = None     # Jobs de lote, na ordem dos cenários
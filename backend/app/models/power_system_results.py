@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 class BusResult(BaseModel):
     bus_id: int
@@ -45,6 +45,15 @@ class ExtGridResult(BaseModel):
     p_mw: float
     q_mvar: float
 
+class SolverInfo(BaseModel):
+    iterations: int            # Iterações do fluxo de potência na solução final
+    warm_start: bool = False   # Partiu da solução anterior da mesma topologia
+    algorithm: str = "nr"      # Algoritmo usado (nr, iwamoto_nr, fdbx, fdxb ou dc)
+    backend: str = "pandapower"  # Implementação que resolveu o fluxo (pandapower ou lightsim2grid)
+    numba: bool = False        # Funções compiladas com numba
+    time_ms: float = 0.0       # Tempo do solver (ms)
+    cached: bool = False       # Resultado reaproveitado: iterações e tempo são da simulação original
+
 class PowerSystemResult(BaseModel):
     buses: List[BusResult]
     lines: List[LineResult]
@@ -56,3 +65,20 @@ class PowerSystemResult(BaseModel):
     genCapacityQmax: Optional[float] = 0.0   # Capacidade total dos geradores - Potência Reativa Máxima (Q_max)
     loadSystemP: Optional[float] = 0.0       # Carga total ativa do sistema (P)
     loadSystemQ: Optional[float] = 0.0       # Carga total reativa do sistema (Q)
+    solver: Optional[SolverInfo] = None      # Informações do fluxo de potência
+
+
+class ColumnarPowerSystemResult(BaseModel):
+    """Resultado no formato colunar: cada tabela é um dicionário campo -> lista de valores"""
+    format: str = "columnar"
+    buses: Dict[str, List[Any]]
+    lines: Dict[str, List[Any]]
+    loads: Dict[str, List[Any]] = {}
+    generators: Dict[str, List[Any]] = {}
+    ext_grid: Optional[Dict[str, Any]] = None
+    genCapacityP: Optional[float] = 0.0
+    genCapacityQmin: Optional[float] = 0.0
+    genCapacityQmax: Optional[float] = 0.0
+    loadSystemP: Optional[float] = 0.0
+    loadSystemQ: Optional[float] = 0.0
+    solver: Optional[Dict[str, Any]] = None
@@ -0,0 +1,48 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+from app.models.power_system_results import PowerSystemResult
+
+class LoadChange(BaseModel):
+    bus_id: int                       # Barra da carga (mesmo bus_id de LoadResult)
+    p_mw: Optional[float] = None      # Nova potência ativa
+    q_mvar: Optional[float] = None    # Nova potência reativa
+    in_service: Optional[bool] = None
+
+class GeneratorChange(BaseModel):
+    bus_id: int                       # Barra do gerador (mesmo bus_id de GeneratorResult ou da ext_grid)
+    p_mw: Optional[float] = None      # Novo despacho de potência ativa
+    vm_pu: Optional[float] = None     # Nova tensão de referência
+    in_service: Optional[bool] = None
+
+class BranchChange(BaseModel):
+    index: int                        # Posição do ramo na lista `lines` do resultado (linhas e depois transformadores)
+    in_service: bool
+
+class ScenarioDelta(BaseModel):
+    """Alterações aplicadas sobre o caso base antes de simular um cenário"""
+    name: Optional[str] = None
+    load_scaling: Optional[float] = Field(None, ge=0)  # Fator aplicado a todas as cargas
+    gen_scaling: Optional[float] = Field(None, ge=0)   # Fator aplicado a todos os geradores
+    loads: List[LoadChange] = []
+    generators: List[GeneratorChange] = []
+    branches: List[BranchChange] = []
+
+class BatchSimulationRequest(BaseModel):
+    """Caso base (arquivo pré carregado ou conteúdo MATPOWER) e lista de cenários"""
+    filename: Optional[str] = None    # Nome de um arquivo pré carregado (ex: case14p.m)
+    matpower: Optional[str] = None    # Conteúdo de um arquivo MATPOWER
+    scenarios: List[ScenarioDelta] = Field(..., min_length=1)
+
+    @model_validator(mode="after")
+    def check_case_source(self):
+        if (self.filename is None) == (self.matpower is None):
+            raise ValueError("Informe exatamente um entre 'filename' e 'matpower'")
+        return self
+
+class ScenarioResult(BaseModel):
+    """Linha NDJSON devolvida pelo endpoint de lote para cada cenário"""
+    index: int                                 # Posição do cenário na requisição
+    name: Optional[str] = None
+    status: str                                # "ok" ou "error"
+    result: Optional[PowerSystemResult] = None
+    detail: Optional[str] = None               # Mensagem de erro quando status == "error"
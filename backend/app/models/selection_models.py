@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class ResultSelection(BaseModel):
+    """Tabelas, campos e filtros da resposta de uma simulação"""
+    tables: Optional[List[str]] = None      # Tabelas retornadas (None: todas)
+    fields: Optional[List[str]] = None      # Campos no formato "tabela.campo" (None: todos)
+    min_loading: Optional[float] = None     # Apenas ramos com loading_percent acima do valor (%)
+    vm_min: Optional[float] = None          # Apenas barras com vm_pu abaixo de vm_min ...
+    vm_max: Optional[float] = None          # ... ou acima de vm_max (pu)
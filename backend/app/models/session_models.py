@@ -0,0 +1,26 @@
+from pydantic import BaseModel, model_validator
+from typing import Optional
+from app.models.power_system_results import PowerSystemResult
+
+class SessionCreateRequest(BaseModel):
+    """Caso que dá origem à sessão: arquivo pré carregado ou conteúdo MATPOWER"""
+    filename: Optional[str] = None    # Nome de um arquivo pré carregado (ex: case14p.m)
+    matpower: Optional[str] = None    # Conteúdo de um arquivo MATPOWER
+
+    @model_validator(mode="after")
+    def check_case_source(self):
+        if (self.filename is None) == (self.matpower is None):
+            raise ValueError("Informe exatamente um entre 'filename' e 'matpower'")
+        return self
+
+class SessionInfo(BaseModel):
+    session_id: str
+    source: str          # Nome do modelo ou "upload"
+    revision: int        # Quantidade de alterações aplicadas desde a criação
+    created_at: float    # Instantes em segundos desde a época (Unix)
+    expires_at: float    # Expira se ficar sem uso até este instante
+
+class SessionResult(BaseModel):
+    """Estado da sessão e resultado da última simulação da rede"""
+    session: SessionInfo
+    result: PowerSystemResult
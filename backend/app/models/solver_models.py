@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class SolverOptions(BaseModel):
+    """Opções do fluxo de potência (None: padrão configurado no servidor)"""
+    algorithm: Optional[str] = None         # nr, iwamoto_nr, fdbx, fdxb ou dc
+    tolerance_mva: Optional[float] = None   # Tolerância de convergência (MVA)
+    max_iteration: Optional[int] = None     # Máximo de iterações (None: automático do pandapower)
+    numba: Optional[bool] = None            # Funções compiladas com numba, se instalado
+    backend: Optional[str] = None           # auto, pandapower ou lightsim2grid
@@ -0,0 +1,205 @@
+import asyncio
+from fastapi import APIRouter, File, HTTPException, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, Optional
+from app.models.job_models import JobInfo, JobRequest, JobResult
+from app.models.scenario_models import BatchSimulationRequest
+from app.models.solver_models import SolverOptions
+from app.services.batch_service import run_batch
+from app.services.job_queue import Job, JobQueueFullError
+from app.services.solver_backend import solver_key
+from app.routes.simulation_routes import (
+    ALGORITHM_QUERY, BACKEND_QUERY, BATCH_MAX_SCENARIOS, MAX_ITERATION_QUERY, NUMBA_QUERY, TOLERANCE_QUERY, UPLOAD_RESPONSES,
+    _solver_options, case_catalog, job_queue, matpower_service, read_upload, simulation_executor
+)
+
+router = APIRouter()
+
+# Intervalo (s) dos comentários enviados no stream de eventos para manter a conexão aberta em proxies
+EVENTS_KEEPALIVE = 15.0
+
+JOB_RESPONSES = {404: {"description": "Job inexistente ou expirado"}}
+SUBMIT_RESPONSES = {
+    400: {"description": "Caso ou opções inválidos"},
+    503: {"description": "Limite de jobs atingido; tente novamente"},
+}
+
+def _submit(kind: str, source: str, work) -> Response:
+    """Enfileira o job e responde 202 com seu estado e endereço"""
+    try:
+        job = job_queue.submit(kind, source, work)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    return Response(
+        content=job.info().model_dump_json(), media_type="application/json", status_code=202,
+        headers={"Location": f"/sisep/jobs/{job.job_id}"},
+    )
+
+def _get_job(job_id: str) -> Job:
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job inexistente ou expirado: {job_id}")
+    return job
+
+def _job_result(job: Job) -> JobResult:
+    """Estado do job com o resultado, se concluído"""
+    if job.status != 'done':
+        return JobResult(job=job.info())
+    if job.kind == 'batch':
+        return JobResult(job=job.info(), scenarios=job.result)
+    return JobResult(job=job.info(), result=matpower_service.result_from_columns(job.result))
+
+def _simulation_work(filename: Optional[str] = None, matpower: Optional[str] = None,
+                     ppc: Optional[Dict[str, Any]] = None, key: Optional[str] = None,
+                     solver: Optional[SolverOptions] = None):
+    """Função do job de simulação (resultado por coluna)
+
+    Sem o tempo limite das requisições interativas; com o pool cheio, o job
+    aguarda vaga em vez de falhar (ele já foi aceito com 202).
+    """
+    async def work(job: Job):
+        if filename is not None:
+            entry = case_catalog.lookup(filename) if solver is None else None
+            if entry is not None:
+                return entry.columns
+            columns, _ = await simulation_executor.run_coalesced(
+                filename + solver_key(solver), "simulate_columns_from_filename", filename, None, solver,
+                timeout=job_queue.TIMEOUT, wait=True,
+            )
+            return columns
+        if ppc is not None:
+            (columns, _), _ = await simulation_executor.run_coalesced(
+                key + solver_key(solver), "simulate_columns_from_ppc", ppc, key, None, solver,
+                timeout=job_queue.TIMEOUT, wait=True,
+            )
+            return columns
+        columns, _ = await simulation_executor.run(
+            "simulate_columns_from_string", matpower, None, None, solver, timeout=job_queue.TIMEOUT, wait=True
+        )
+        return columns
+    return work
+
+@router.post("/jobs", response_model=JobInfo, status_code=202, responses=SUBMIT_RESPONSES)
+async def submit_job(request: JobRequest):
+    """
+    Enfileira a simulação de um modelo pré carregado ou de conteúdo MATPOWER.
+    
+    A resposta (202) traz o identificador do job logo após o enfileiramento;
+    o resultado é obtido em `GET /jobs/{job_id}` ou acompanhado em
+    `GET /jobs/{job_id}/events`.
+    
+    Returns:
+        JobInfo: Estado inicial do job
+    """
+    if request.filename is not None:
+        try:
+            matpower_service.case_path(request.filename)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    # As opções do corpo passam pela mesma validação dos parâmetros de query
+    solver = _solver_options(**request.solver.model_dump()) if request.solver is not None else None
+    work = _simulation_work(request.filename, request.matpower, solver=solver)
+    return _submit("simulation", request.filename or "upload", work)
+
+@router.post("/jobs/upload", response_model=JobInfo, status_code=202,
+             responses={**SUBMIT_RESPONSES, **UPLOAD_RESPONSES})
+async def submit_upload_job(
+    file: UploadFile = File(..., description="Arquivo MATPOWER (.m)"),
+    algorithm: Optional[str] = ALGORITHM_QUERY,
+    tolerance_mva: Optional[float] = TOLERANCE_QUERY,
+    max_iteration: Optional[int] = MAX_ITERATION_QUERY,
+    numba: Optional[bool] = NUMBA_QUERY,
+    backend: Optional[str] = BACKEND_QUERY,
+):
+    """
+    Enfileira a simulação de um arquivo MATPOWER enviado.
+    
+    O arquivo é lido e validado na requisição; apenas o fluxo de potência
+    roda em segundo plano.
+    
+    Returns:
+        JobInfo: Estado inicial do job
+    """
+    solver = _solver_options(algorithm, tolerance_mva, max_iteration, numba, backend)
+    ppc, key = await read_upload(file)
+    return _submit("simulation", "upload", _simulation_work(ppc=ppc, key=key, solver=solver))
+
+@router.post("/jobs/batch", response_model=JobInfo, status_code=202, responses=SUBMIT_RESPONSES)
+async def submit_batch_job(request: BatchSimulationRequest):
+    """
+    Enfileira um lote de cenários sobre um caso base.
+    
+    O progresso do job é a fração de cenários concluídos; o resultado traz
+    todos os cenários na ordem da requisição.
+    
+    Returns:
+        JobInfo: Estado inicial do job
+    """
+    # O resultado guarda todos os cenários até o job expirar: mesmo limite do lote interativo
+    if len(request.scenarios) > BATCH_MAX_SCENARIOS:
+        raise HTTPException(status_code=400, detail=f"Máximo de {BATCH_MAX_SCENARIOS} cenários por lote")
+
+    async def work(job: Job):
+        net = await simulation_executor.run(
+            "load_case_net", request.filename, request.matpower, timeout=job_queue.TIMEOUT, wait=True
+        )
+        results = []
+        async for scenario_result in run_batch(simulation_executor, net, request.scenarios, wait=True):
+            results.append(scenario_result)
+            job.set_progress(len(results) / len(request.scenarios))
+        return sorted(results, key=lambda result: result.index)
+
+    return _submit("batch", request.filename or "upload", work)
+
+@router.get("/jobs/{job_id}", response_model=JobResult, responses=JOB_RESPONSES)
+async def get_job(job_id: str):
+    """
+    Retorna o estado do job e, quando concluído, o resultado.
+    
+    Returns:
+        JobResult: Estado (queued, running, done, failed ou cancelled), progresso e resultado
+    """
+    job = _get_job(job_id)
+    return Response(content=_job_result(job).model_dump_json(), media_type="application/json")
+
+@router.get("/jobs/{job_id}/events", response_class=StreamingResponse, responses=JOB_RESPONSES)
+async def get_job_events(job_id: str):
+    """
+    Acompanha o job por Server-Sent Events.
+    
+    Cada mudança de estado ou progresso gera um evento `progress` com o
+    `JobInfo`; ao terminar, um evento com o estado final (`done`, `failed`
+    ou `cancelled`) traz o `JobResult` e o stream é encerrado.
+    
+    Returns:
+        StreamingResponse: Eventos em `text/event-stream`
+    """
+    job = _get_job(job_id)
+
+    async def events():
+        sent = None
+        while True:
+            version = job.version
+            if job.finished:
+                yield f"event: {job.status}\ndata: {_job_result(job).model_dump_json()}\n\n"
+                return
+            # Após um keep-alive, o progresso só é reenviado se o job mudou
+            if version != sent:
+                yield f"event: progress\ndata: {job.info().model_dump_json()}\n\n"
+                sent = version
+            try:
+                await asyncio.wait_for(job.wait_change(version), EVENTS_KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.delete("/jobs/{job_id}", status_code=204, responses=JOB_RESPONSES)
+async def delete_job(job_id: str):
+    """
+    Cancela o job (na fila ou em execução) ou, se já concluído, descarta o resultado.
+    """
+    if job_queue.cancel(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job inexistente ou expirado: {job_id}")
+    return Response(status_code=204)
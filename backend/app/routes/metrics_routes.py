@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from typing import List
+from app.services import metrics
+from app.services.metrics import Gauge
+from app.routes.simulation_routes import case_catalog, matpower_service, simulation_executor
+
+router = APIRouter()
+
+# Tipo de conteúdo do formato texto do Prometheus
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _runtime_gauges() -> List[Gauge]:
+    """Estado atual do pool de simulações e dos caches do serviço"""
+    executor = Gauge("sisep_executor", "Estado do pool de simulações", ("field",))
+    for field in ("max_workers", "max_pending", "pending", "rejected", "timeouts"):
+        executor.set(simulation_executor.stats()[field], field)
+
+    # Processo principal (catálogo e, no modo thread, todas as simulações) e cada processo do pool
+    services = {"main": {"caches": matpower_service.cache_stats()}, **simulation_executor.service_stats()}
+    caches = Gauge("sisep_cache", "Estatísticas dos caches do serviço", ("worker", "cache", "field"))
+    for worker, service in services.items():
+        for cache, stats in service["caches"].items():
+            for field, value in stats.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    caches.set(value, worker, cache, field)
+    return [executor, caches]
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Métricas no formato texto do Prometheus.
+    
+    Inclui histogramas de latência por etapa (leitura, parse, montagem da
+    rede, fluxo de potência, extração, conversão e serialização) e por caso,
+    iterações do solver, tamanho das redes, duração das requisições e o
+    estado do pool de simulações e dos caches.
+    """
+    return PlainTextResponse(metrics.registry.render(_runtime_gauges()), media_type=PROMETHEUS_MEDIA_TYPE)
+
+@router.get("/health/live")
+async def liveness():
+    """
+    Processo no ar (não depende do solver).
+    """
+    return {"status": "live"}
+
+@router.get("/health/ready")
+async def readiness(request: Request):
+    """
+    Solver aquecido e catálogo carregado.
+    
+    Retorna 503 enquanto o aquecimento da inicialização não termina (ou se
+    ele falhou), para que o orquestrador só envie tráfego depois disso.
+    """
+    state = request.app.state
+    ready = getattr(state, "ready", False)
+    error = getattr(state, "warm_up_error", None)
+    content = {
+        "status": "ready" if ready else ("error" if error else "warming"),
+        "solver_warm": simulation_executor.solver_warm,
+        "catalog_loaded": case_catalog.loaded,
+    }
+    if error:
+        content["detail"] = error
+    return JSONResponse(content, status_code=200 if ready else 503)
@@ -0,0 +1,107 @@
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+from fastapi import HTTPException, Request, Response
+from pydantic import BaseModel
+from app.models.power_system_results import ColumnarPowerSystemResult
+from app.services import metrics
+from app.services.encoded_response import EncodedBody, dumps
+from app.services.result_projection import columns_to_rows
+
+try:
+    import msgpack
+except ImportError:  # Dependência opcional: apenas o formato MessagePack fica indisponível
+    msgpack = None
+
+# Formatos de resposta suportados
+ROWS = "rows"          # Padrão: PowerSystemResult (lista de objetos por tabela)
+COLUMNAR = "columnar"  # JSON colunar: um array por campo de cada tabela
+MSGPACK = "msgpack"    # Mesmo layout colunar, codificado em MessagePack
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.sisep.columnar+json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# Documentação OpenAPI dos tipos de conteúdo alternativos (MessagePack usa o mesmo layout colunar)
+_COLUMNAR_SCHEMA = ColumnarPowerSystemResult.model_json_schema()
+FORMAT_RESPONSES = {
+    200: {
+        "content": {
+            COLUMNAR_MEDIA_TYPE: {"schema": _COLUMNAR_SCHEMA},
+            MSGPACK_MEDIA_TYPES[0]: {"schema": _COLUMNAR_SCHEMA},
+        },
+        "description": "Resultado no formato por linhas (padrão), colunar JSON ou MessagePack",
+    },
+    406: {"description": "Formato de resposta não suportado"},
+}
+
+def negotiate_format(request: Request, format_param: Optional[str]) -> str:
+    """Escolhe o formato da resposta a partir do parâmetro `format` ou do cabeçalho Accept"""
+    if format_param:
+        fmt = format_param.lower()
+        if fmt not in (ROWS, COLUMNAR, MSGPACK):
+            raise HTTPException(status_code=406, detail=f"Formato de resposta não suportado: {format_param}")
+    else:
+        accept = request.headers.get("accept", "").lower()
+        if COLUMNAR_MEDIA_TYPE in accept:
+            fmt = COLUMNAR
+        elif any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES):
+            fmt = MSGPACK
+        else:
+            fmt = ROWS
+
+    if fmt == MSGPACK and msgpack is None:
+        raise HTTPException(status_code=406, detail="Formato MessagePack indisponível: instale o pacote msgpack")
+    return fmt
+
+def encode_columns(columns: Dict[str, Any], fmt: str) -> bytes:
+    """Serializa os resultados por coluna no formato colunar JSON ou MessagePack"""
+    payload = {"format": COLUMNAR, **columns}
+    if fmt == MSGPACK:
+        return msgpack.packb(payload, use_bin_type=True)
+    return dumps(payload)
+
+def media_type(fmt: str) -> str:
+    if fmt == MSGPACK:
+        return MSGPACK_MEDIA_TYPES[0]
+    return COLUMNAR_MEDIA_TYPE if fmt == COLUMNAR else "application/json"
+
+def encode_body(columns: Dict[str, Any], fmt: str) -> EncodedBody:
+    """Resposta pré calculada (serializada e comprimida) dos resultados por coluna"""
+    return EncodedBody(encode_columns(columns, fmt), media_type(fmt))
+
+def body_encoders() -> Dict[str, Callable[[Dict[str, Any]], EncodedBody]]:
+    """Formatos além do padrão pré calculados no catálogo (MessagePack só se instalado)"""
+    formats = [COLUMNAR] + ([MSGPACK] if msgpack is not None else [])
+    return {fmt: partial(encode_body, fmt=fmt) for fmt in formats}
+
+def render_columns(columns: Dict[str, Any], fmt: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Codifica os resultados por coluna no formato negociado, sem montar objetos por linha"""
+    headers = {"Vary": "Accept", **(headers or {})}
+    with metrics.stage("serialize"):
+        return Response(content=encode_columns(columns, fmt), media_type=media_type(fmt), headers=headers)
+
+def render_rows(result: BaseModel, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Serializa o resultado por linhas (PowerSystemResult) já montado, sem nova validação"""
+    headers = {"Vary": "Accept", **(headers or {})}
+    with metrics.stage("serialize"):
+        return Response(content=result.model_dump_json(), media_type="application/json", headers=headers)
+
+def render_selected_rows(columns: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> Response:
+    """Serializa resultados projetados (tabelas e campos selecionados) no formato por linhas"""
+    headers = {"Vary": "Accept", **(headers or {})}
+    with metrics.stage("serialize"):
+        return Response(content=dumps(columns_to_rows(columns)), media_type="application/json", headers=headers)
+
+def render_encoded(request: Request, body: EncodedBody) -> Response:
+    """Responde com um corpo pré calculado: 304 se a ETag do cliente confere, senão a versão comprimida aceita"""
+    headers = {"Vary": "Accept, Accept-Encoding", "Cache-Control": "no-cache"}
+    if body.matches(request.headers.get("if-none-match")):
+        # Mesma ETag que a resposta 200 teria para este Accept-Encoding
+        encoding = body.negotiate(request.headers.get("accept-encoding"))
+        return Response(status_code=304, headers={**headers, "ETag": body.etag(encoding)})
+
+    with metrics.stage("serialize"):
+        content, encoding = body.select(request.headers.get("accept-encoding"))
+    headers["ETag"] = body.etag(encoding)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=content, media_type=body.media_type, headers=headers)
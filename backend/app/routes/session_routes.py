@@ -0,0 +1,126 @@
+import asyncio
+from fastapi import APIRouter, File, HTTPException, Response, UploadFile
+from app.models.scenario_models import ScenarioDelta
+from app.models.session_models import SessionCreateRequest, SessionResult
+from app.services import metrics
+from app.services.session_store import SimulationSession, solve_session
+from app.services.simulation_executor import SimulationOverloadedError, SimulationTimeoutError
+from app.routes.simulation_routes import (
+    EXECUTOR_RESPONSES, UPLOAD_RESPONSES, matpower_service, read_upload, session_store, simulation_executor
+)
+
+router = APIRouter()
+
+SESSION_RESPONSES = {**EXECUTOR_RESPONSES, 404: {"description": "Sessão inexistente ou expirada"}}
+
+def _session_response(session: SimulationSession, status_code: int = 200) -> Response:
+    """Serializa o estado da sessão e o resultado da última simulação"""
+    result = matpower_service.result_from_columns(session.columns)
+    with metrics.stage("serialize"):
+        content = SessionResult(session=session_store.info(session), result=result).model_dump_json()
+    return Response(content=content, media_type="application/json", status_code=status_code)
+
+def _get_session(session_id: str) -> SimulationSession:
+    session = session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Sessão inexistente ou expirada: {session_id}")
+    return session
+
+async def _run(session: SimulationSession, delta: ScenarioDelta = None):
+    """Resolve a sessão, convertendo os erros do pool e da simulação em respostas HTTP"""
+    try:
+        await solve_session(simulation_executor, session, delta)
+        # Com backend compartilhado, outros workers passam a enxergar a nova revisão
+        await asyncio.to_thread(session_store.save, session)
+    except SimulationOverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SimulationTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def _create_session(source: str, filename: str = None, matpower: str = None, ppc: dict = None) -> Response:
+    try:
+        net = await simulation_executor.run("load_case_net", filename, matpower, ppc)
+    except SimulationOverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SimulationTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    session = session_store.create(source, net)
+    try:
+        await _run(session)
+    except HTTPException:
+        session_store.delete(session.session_id)
+        raise
+    return _session_response(session, status_code=201)
+
+@router.post("/sessions", response_model=SessionResult, status_code=201, responses=SESSION_RESPONSES)
+async def create_session(request: SessionCreateRequest):
+    """
+    Cria uma sessão de edição a partir de um modelo pré carregado ou de conteúdo MATPOWER.
+    
+    A rede fica em memória no servidor: as alterações seguintes são enviadas
+    com `PATCH /sessions/{session_id}`, sem gerar, enviar e converter o caso
+    novamente.
+    
+    Returns:
+        SessionResult: Identificador da sessão e resultado da simulação do caso
+    """
+    return await _create_session(request.filename or "upload", request.filename, request.matpower)
+
+@router.post("/sessions/upload", response_model=SessionResult, status_code=201,
+             responses={**SESSION_RESPONSES, **UPLOAD_RESPONSES})
+async def create_session_upload(file: UploadFile = File(..., description="Arquivo MATPOWER (.m)")):
+    """
+    Cria uma sessão de edição a partir de um arquivo MATPOWER enviado.
+    
+    Returns:
+        SessionResult: Identificador da sessão e resultado da simulação do caso
+    """
+    ppc, _ = await read_upload(file)
+    return await _create_session("upload", ppc=ppc)
+
+@router.get("/sessions/{session_id}", response_model=SessionResult, responses=SESSION_RESPONSES)
+async def get_session(session_id: str):
+    """
+    Retorna o estado da sessão e o resultado da última simulação.
+    """
+    session = _get_session(session_id)
+    async with session.lock:
+        return _session_response(session)
+
+@router.patch("/sessions/{session_id}", response_model=SessionResult, responses=SESSION_RESPONSES)
+async def update_session(session_id: str, delta: ScenarioDelta):
+    """
+    Aplica alterações na rede da sessão e a resolve novamente.
+    
+    As alterações são acumuladas: cada `PATCH` parte do estado deixado pelo
+    anterior (ex: `load_scaling` multiplica o escalonamento atual). Se a
+    alteração for inválida ou o fluxo não convergir, a rede permanece como
+    estava e a revisão não muda.
+    
+    Args:
+        delta (ScenarioDelta): Cargas, geradores e ramos alterados
+        
+    Returns:
+        SessionResult: Nova revisão da sessão e resultado da simulação
+    """
+    session = _get_session(session_id)
+    await _run(session, delta)
+    return _session_response(session)
+
+@router.delete("/sessions/{session_id}", status_code=204, responses={404: SESSION_RESPONSES[404]})
+async def delete_session(session_id: str):
+    """
+    Encerra a sessão, liberando a rede da memória.
+    """
+    if not session_store.delete(session_id):
+        raise HTTPException(status_code=404, detail=f"Sessão inexistente ou expirada: {session_id}")
+    return Response(status_code=204)
@@ -1,11 +1,157 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Path
-from typing import List
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import json
+import os
 from app.models.power_system_results import PowerSystemResult
+from app.models.catalog_models import CaseInfo, CompiledCase
+from app.models.contingency_models import ContingencyAnalysis
+from app.models.scenario_models import BatchSimulationRequest
 from app.services.matpower_service import MatpowerService
+from app.services.case_catalog import CaseCatalog
+from app.services.session_store import SessionStore
+from app.services.job_queue import JobQueue
+from app.services.upload_reader import (
+    UploadTooLargeError, read_matpower_upload, read_upload_bytes
+)
+from app.services.batch_service import run_batch
+from app.services import contingency_service, timeseries_service
+from app.services.contingency_service import run_contingency_analysis
+from app.services.simulation_executor import (
+    SimulationExecutor, SimulationOverloadedError, SimulationTimeoutError
+)
+from app.services.result_projection import build_selection, mark_reused, project_columns, selection_key
+from app.models.selection_models import ResultSelection
+from app.models.solver_models import SolverOptions
+from app.services.solver_backend import ALGORITHMS, BACKENDS, build_solver_options, solver_key
+from app.routes.result_formats import (
+    FORMAT_RESPONSES, ROWS, body_encoders, encode_body, negotiate_format, render_columns, render_encoded,
+    render_rows, render_selected_rows
+)
 
 router = APIRouter()
 matpower_service = MatpowerService()
 
+# Catálogo dos modelos pré carregados (preenchido na inicialização da aplicação),
+# com as respostas de cada formato já serializadas e comprimidas
+case_catalog = CaseCatalog(matpower_service, encoders=body_encoders())
+
+# Pool que executa as simulações fora do event loop
+simulation_executor = SimulationExecutor(matpower_service)
+
+# Redes das sessões de edição (API de sessões)
+session_store = SessionStore(backend=matpower_service.cache_backend)
+
+# Simulações em segundo plano (API de jobs)
+job_queue = JobQueue()
+
+# Respostas de sobrecarga/timeout do pool de simulações
+EXECUTOR_RESPONSES = {
+    503: {"description": "Fila de simulações cheia; tente novamente"},
+    504: {"description": "Simulação excedeu o tempo limite"},
+}
+
+# Respostas dos endpoints que recebem um arquivo MATPOWER
+UPLOAD_RESPONSES = {
+    400: {"description": "Arquivo MATPOWER inválido"},
+    413: {"description": "Arquivo maior que o limite (SISEP_UPLOAD_MAX_BYTES)"},
+}
+
+# Quantidade máxima de cenários por requisição de lote
+BATCH_MAX_SCENARIOS = int(os.getenv("SISEP_BATCH_MAX_SCENARIOS", "1000"))
+
+FORMAT_QUERY = Query(
+    None,
+    description="Formato da resposta: rows (padrão), columnar ou msgpack. "
+                "Também pode ser negociado pelo cabeçalho Accept "
+                "(application/vnd.sisep.columnar+json ou application/x-msgpack)",
+)
+
+# Projeção e filtros dos resultados
+TABLES_QUERY = Query(
+    None,
+    description="Tabelas retornadas, separadas por vírgula: buses, lines, loads, generators, ext_grid, totals",
+)
+FIELDS_QUERY = Query(
+    None,
+    description="Campos retornados no formato tabela.campo, separados por vírgula "
+                "(ex: buses.vm_pu,lines.loading_percent); os campos de identificação são sempre incluídos",
+)
+MIN_LOADING_QUERY = Query(None, ge=0, description="Apenas ramos com loading_percent acima do valor (%)")
+BAND_VM_MIN_QUERY = Query(None, gt=0, description="Apenas barras com vm_pu abaixo do valor (ou acima de vm_max)")
+BAND_VM_MAX_QUERY = Query(None, gt=0, description="Apenas barras com vm_pu acima do valor (ou abaixo de vm_min)")
+
+# Opções do fluxo de potência (sem elas, valem os padrões do servidor)
+ALGORITHM_QUERY = Query(None, description=f"Algoritmo do fluxo de potência: {', '.join(ALGORITHMS)}")
+TOLERANCE_QUERY = Query(None, gt=0, description="Tolerância de convergência (MVA)")
+MAX_ITERATION_QUERY = Query(None, ge=1, description="Máximo de iterações do fluxo de potência")
+NUMBA_QUERY = Query(None, description="Usa as funções compiladas com numba, se instalado")
+BACKEND_QUERY = Query(
+    None,
+    description=f"Implementação do solver: {', '.join(BACKENDS)} (auto escolhe pelo tamanho da rede)",
+)
+
+# Série temporal: máximo de passos por requisição e passos por bloco
+TIMESERIES_MAX_STEPS = int(os.getenv("SISEP_TIMESERIES_MAX_STEPS", "100000"))
+TIMESERIES_CHUNK_SIZE = int(os.getenv("SISEP_TIMESERIES_CHUNK_SIZE", "168"))
+
+# Parâmetros da análise N-1
+LOADING_LIMIT_QUERY = Query(contingency_service.LOADING_LIMIT, gt=0, description="Carregamento máximo admissível (%)")
+VM_MIN_QUERY = Query(contingency_service.VM_MIN, gt=0, description="Tensão mínima admissível (pu)")
+VM_MAX_QUERY = Query(contingency_service.VM_MAX, gt=0, description="Tensão máxima admissível (pu)")
+SCREENING_THRESHOLD_QUERY = Query(
+    contingency_service.SCREENING_THRESHOLD, ge=0,
+    description="Carregamento estimado na triagem DC (%) a partir do qual a contingência é simulada em AC "
+                "(0 simula todas)",
+)
+
+def _selection(tables: Optional[str], fields: Optional[str], min_loading: Optional[float],
+               vm_min: Optional[float], vm_max: Optional[float]) -> Optional[ResultSelection]:
+    """Valida os parâmetros de projeção da resposta"""
+    try:
+        return build_selection(tables, fields, min_loading, vm_min, vm_max)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _solver_options(algorithm: Optional[str], tolerance_mva: Optional[float], max_iteration: Optional[int],
+                    numba: Optional[bool], backend: Optional[str]) -> Optional[SolverOptions]:
+    """Valida as opções do solver pedidas na requisição"""
+    try:
+        return build_solver_options(algorithm, tolerance_mva, max_iteration, numba, backend)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _render_selection(columns: Dict[str, Any], fmt: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Codifica resultados projetados no formato negociado"""
+    if fmt != ROWS:
+        return render_columns(columns, fmt, headers=headers)
+    return render_selected_rows(columns, headers=headers)
+
+async def read_upload(file: UploadFile) -> Tuple[Dict[str, Any], str]:
+    """Lê o caso MATPOWER enviado em blocos, convertendo os erros em respostas HTTP"""
+    try:
+        return await read_matpower_upload(file)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _cache_headers(cache_hit: bool, shared: bool, key: str) -> Dict[str, str]:
+    """Cabeçalhos que informam se o resultado veio do cache ou de uma simulação concorrente"""
+    status = "HIT" if cache_hit else "COALESCED" if shared else "MISS"
+    return {"X-Cache": status, "X-Cache-Key": key}
+
+def _shared_result(result: Any, shared: bool) -> Any:
+    """Resultado de uma simulação iniciada por outra requisição: solver marcado como reaproveitado"""
+    if not shared:
+        return result
+    if isinstance(result, PowerSystemResult):
+        if result.solver is None:
+            return result
+        return result.model_copy(update={"solver": result.solver.model_copy(update={"cached": True})})
+    return mark_reused(result)
+
 @router.get("/matpower/files", response_model=List[str])
 async def list_matpower_files():
     """
@@ -14,6 +160,9 @@ async def list_matpower_files():
     Returns:
         List[str]: Lista de nomes dos arquivos .m disponíveis
     """
+    files = case_catalog.files()
+    if files:
+        return files
     try:
         return matpower_service.list_available_files()
     except ValueError as e:
@@ -23,47 +172,391 @@ async def list_matpower_files():
         # Outros erros inesperados
         raise HTTPException(status_code=500, detail=f"Erro interno do servidor: {str(e)}")
 
-@router.get("/matpower/{filename}", response_model=PowerSystemResult)
+@router.get("/cache/stats", response_model=Dict[str, Any])
+async def get_cache_stats():
+    """
+    Retorna as estatísticas dos caches do serviço de simulação.
+    
+    Os caches do nível superior são os do processo principal. No modo
+    process as simulações rodam nos processos do pool, cada um com seus
+    caches, informados em `workers` (estado da última chamada de cada um).
+    
+    Returns:
+        Dict[str, Any]: Tamanho, acertos, falhas e invalidações de cada cache
+    """
+    stats = {**matpower_service.cache_stats(), "catalog": case_catalog.stats(), "sessions": session_store.stats()}
+    if simulation_executor.mode == "process":
+        stats["workers"] = simulation_executor.service_stats()
+    return stats
+
+@router.get("/matpower/catalog", response_model=List[CaseInfo])
+async def get_case_catalog():
+    """
+    Lista os modelos pré carregados com o tamanho de cada rede.
+    
+    Returns:
+        List[CaseInfo]: Barras, ramos, geradores, cargas e iterações do caso base de cada modelo
+    """
+    if not case_catalog.loaded:
+        await asyncio.to_thread(case_catalog.refresh)
+    return case_catalog.cases()
+
+@router.post("/matpower/compile", response_model=List[CompiledCase])
+async def compile_matpower_cases(
+    filename: Optional[str] = Query(None, description="Modelo .m a compilar (padrão: todos os modelos .m)"),
+    force: bool = Query(False, description="Recompila mesmo que o caso compilado esteja atualizado"),
+):
+    """
+    Compila modelos MATPOWER (.m) em arrays NumPy (.npz sem compressão).
+    
+    Os casos compilados são carregados mapeando as matrizes em memória, sem
+    reler o texto; eles também são gerados e atualizados automaticamente
+    quando um modelo é carregado.
+    
+    Returns:
+        List[CompiledCase]: Caso compilado, matrizes e tamanho de cada modelo
+    """
+    def compile_all() -> List[CompiledCase]:
+        if filename is not None:
+            return [matpower_service.compile_case(filename, force)]
+        files = [f for f in matpower_service.list_available_files() if f.endswith('.m')]
+        return [matpower_service.compile_case(f, force) for f in files]
+
+    try:
+        return await asyncio.to_thread(compile_all)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/executor/stats", response_model=Dict[str, Any])
+async def get_executor_stats():
+    """
+    Retorna o estado do pool de simulações.
+    
+    Returns:
+        Dict[str, Any]: Modo, limites, simulações pendentes, recusadas e com timeout, agrupamento e jobs
+    """
+    return {**simulation_executor.stats(), "jobs": job_queue.stats()}
+
+@router.get("/matpower/{filename}", response_model=PowerSystemResult, responses={**FORMAT_RESPONSES, **EXECUTOR_RESPONSES})
 async def simulate_matpower_filename(
+    request: Request,
     filename: str = Path(
         ..., 
-        description="Nome do arquivo MATPOWER (ex: case4gs.m, case5.m, case6ww.m, case9.m, case14.m)",
+        description="Nome do arquivo MATPOWER ou do caso compilado (ex: case4gs.m, case5.m, case6ww.m, case9.m, case14.m, case14.npz)",
         examples={"default": {"value": "case4gs.m"}}
-    )
+    ),
+    format: Optional[str] = FORMAT_QUERY,
+    tables: Optional[str] = TABLES_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
+    min_loading: Optional[float] = MIN_LOADING_QUERY,
+    vm_min: Optional[float] = BAND_VM_MIN_QUERY,
+    vm_max: Optional[float] = BAND_VM_MAX_QUERY,
+    algorithm: Optional[str] = ALGORITHM_QUERY,
+    tolerance_mva: Optional[float] = TOLERANCE_QUERY,
+    max_iteration: Optional[int] = MAX_ITERATION_QUERY,
+    numba: Optional[bool] = NUMBA_QUERY,
+    backend: Optional[str] = BACKEND_QUERY,
 ):
     """
     Simula um sistema a partir de um arquivo MATPOWER pré carregado.
     
     Args:
         filename (str): Nome do arquivo MATPOWER a ser simulado
+        format (str): Formato opcional da resposta (rows, columnar ou msgpack)
+        tables, fields (str): Tabelas e campos retornados (apenas estes são extraídos da rede)
+        min_loading, vm_min, vm_max (float): Filtros de ramos carregados e de barras fora da faixa de tensão
+        algorithm, tolerance_mva, max_iteration, numba, backend: Opções do fluxo de potência
         
     Returns:
         PowerSystemResult: Resultados da simulação do fluxo de potência
     """
+    fmt = negotiate_format(request, format)
+    selection = _selection(tables, fields, min_loading, vm_min, vm_max)
+    solver = _solver_options(algorithm, tolerance_mva, max_iteration, numba, backend)
+
+    # Modelo já resolvido no catálogo (com as opções padrão): resposta direto da memória
+    entry = case_catalog.lookup(filename) if solver is None else None
+    if entry is not None:
+        if selection is not None:
+            return _render_selection(project_columns(entry.columns, selection), fmt)
+        # Resposta já serializada e comprimida, com ETag (304 se o cliente já a tem)
+        body = entry.bodies.get(fmt)
+        if body is None:
+            # Formato não pré calculado: a compressão roda fora do event loop
+            body = await asyncio.to_thread(entry.body, fmt, lambda: encode_body(entry.columns, fmt))
+        return render_encoded(request, body)
+
     try:
-        return matpower_service.simulate_from_filename(filename)
+        # Requisições simultâneas do mesmo modelo aguardam uma única simulação
+        flight_key = filename + solver_key(solver) + selection_key(selection)
+        if selection is not None:
+            columns, shared = await simulation_executor.run_coalesced(
+                flight_key, "simulate_columns_from_filename", filename, selection, solver
+            )
+            return _render_selection(_shared_result(columns, shared), fmt)
+        if fmt != ROWS:
+            columns, shared = await simulation_executor.run_coalesced(
+                flight_key, "simulate_columns_from_filename", filename, None, solver
+            )
+            return render_columns(_shared_result(columns, shared), fmt)
+        result, shared = await simulation_executor.run_coalesced(
+            flight_key, "simulate_from_filename", filename, solver
+        )
+        return render_rows(_shared_result(result, shared))
+    except SimulationOverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SimulationTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/simulate/matpower/upload", response_model=PowerSystemResult)
+@router.post("/simulate/matpower/upload", response_model=PowerSystemResult,
+             responses={**FORMAT_RESPONSES, **EXECUTOR_RESPONSES, **UPLOAD_RESPONSES})
 async def simulate_matpower_upload(
-    file: UploadFile = File(..., description="Arquivo MATPOWER (.m)")
+    request: Request,
+    file: UploadFile = File(..., description="Arquivo MATPOWER (.m)"),
+    format: Optional[str] = FORMAT_QUERY,
+    tables: Optional[str] = TABLES_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
+    min_loading: Optional[float] = MIN_LOADING_QUERY,
+    vm_min: Optional[float] = BAND_VM_MIN_QUERY,
+    vm_max: Optional[float] = BAND_VM_MAX_QUERY,
+    algorithm: Optional[str] = ALGORITHM_QUERY,
+    tolerance_mva: Optional[float] = TOLERANCE_QUERY,
+    max_iteration: Optional[int] = MAX_ITERATION_QUERY,
+    numba: Optional[bool] = NUMBA_QUERY,
+    backend: Optional[str] = BACKEND_QUERY,
 ):
     """
     Simula um sistema a partir de um arquivo MATPOWER enviado.
     
+    Arquivos com o mesmo conteúdo (ignorando comentários, linhas em branco e
+    espaços finais) reaproveitam o resultado em cache. O cabeçalho `X-Cache`
+    indica `HIT`, `MISS` ou `COALESCED` (resultado da simulação de um envio
+    simultâneo do mesmo conteúdo) e `X-Cache-Key` o hash do conteúdo.
+    
     Args:
         file (UploadFile): Arquivo MATPOWER a ser simulado
+        format (str): Formato opcional da resposta (rows, columnar ou msgpack)
+        tables, fields (str): Tabelas e campos retornados (apenas estes são extraídos da rede)
+        min_loading, vm_min, vm_max (float): Filtros de ramos carregados e de barras fora da faixa de tensão
+        algorithm, tolerance_mva, max_iteration, numba, backend: Opções do fluxo de potência
         
     Returns:
         PowerSystemResult: Resultados da simulação do fluxo de potência
     """
+    fmt = negotiate_format(request, format)
+    selection = _selection(tables, fields, min_loading, vm_min, vm_max)
+    solver = _solver_options(algorithm, tolerance_mva, max_iteration, numba, backend)
+    ppc, key = await read_upload(file)
+    try:
+        # Envios simultâneos do mesmo conteúdo aguardam uma única simulação
+        flight_key = key + solver_key(solver) + selection_key(selection)
+        if selection is not None:
+            (columns, cache_hit), shared = await simulation_executor.run_coalesced(
+                flight_key, "simulate_columns_from_ppc", ppc, key, selection, solver
+            )
+            return _render_selection(_shared_result(columns, shared), fmt,
+                                     headers=_cache_headers(cache_hit, shared, key))
+        if fmt != ROWS:
+            (columns, cache_hit), shared = await simulation_executor.run_coalesced(
+                flight_key, "simulate_columns_from_ppc", ppc, key, None, solver
+            )
+            return render_columns(_shared_result(columns, shared), fmt, headers=_cache_headers(cache_hit, shared, key))
+        (result, cache_hit), shared = await simulation_executor.run_coalesced(
+            flight_key, "simulate_from_ppc_cached", ppc, key, solver
+        )
+        return render_rows(_shared_result(result, shared), headers=_cache_headers(cache_hit, shared, key))
+    except SimulationOverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SimulationTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/simulate/batch", response_class=StreamingResponse, responses=EXECUTOR_RESPONSES)
+async def simulate_batch(request: BatchSimulationRequest):
+    """
+    Simula vários cenários sobre um mesmo caso base.
+    
+    O caso (arquivo pré carregado ou conteúdo MATPOWER) é lido uma única vez;
+    cada cenário é aplicado sobre uma cópia da rede e os cenários são
+    executados em paralelo no pool de simulações. Os resultados são enviados
+    em NDJSON (uma linha `ScenarioResult` por cenário) na ordem em que terminam.
+    
+    Args:
+        request (BatchSimulationRequest): Caso base e lista de cenários
+        
+    Returns:
+        StreamingResponse: Resultados por cenário em `application/x-ndjson`
+    """
+    if len(request.scenarios) > BATCH_MAX_SCENARIOS:
+        raise HTTPException(status_code=400, detail=f"Máximo de {BATCH_MAX_SCENARIOS} cenários por lote")
+    try:
+        net = await simulation_executor.run("load_case_net", request.filename, request.matpower)
+    except SimulationOverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SimulationTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def ndjson_lines():
+        async for scenario_result in run_batch(simulation_executor, net, request.scenarios):
+            yield scenario_result.model_dump_json() + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+async def _contingency_response(net_args: tuple, loading_limit: float, vm_min: float, vm_max: float,
+                                screening_threshold: float) -> ContingencyAnalysis:
+    """Carrega o caso e executa a análise N-1, convertendo erros em respostas HTTP"""
+    if vm_min >= vm_max:
+        raise HTTPException(status_code=400, detail="vm_min deve ser menor que vm_max")
     try:
-        content = await file.read()
-        return matpower_service.simulate_from_string(content.decode())
+        net = await simulation_executor.run("load_case_net", *net_args)
+        return await run_contingency_analysis(
+            simulation_executor, net, loading_limit, vm_min, vm_max, screening_threshold
+        )
+    except SimulationOverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SimulationTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/contingency/{filename}", response_model=ContingencyAnalysis, responses=EXECUTOR_RESPONSES)
+async def contingency_analysis_filename(
+    filename: str = Path(..., description="Nome do arquivo MATPOWER (ex: case9p.m)"),
+    loading_limit: float = LOADING_LIMIT_QUERY,
+    vm_min: float = VM_MIN_QUERY,
+    vm_max: float = VM_MAX_QUERY,
+    screening_threshold: float = SCREENING_THRESHOLD_QUERY,
+):
+    """
+    Análise de contingências N-1 de um modelo pré carregado.
+    
+    Todas as saídas simples de ramo e de gerador passam por uma triagem DC
+    (matrizes PTDF/LODF calculadas uma vez para o caso base); apenas as
+    críticas são simuladas com fluxo AC, em paralelo no pool de simulações.
+    
+    Args:
+        filename (str): Nome do arquivo MATPOWER
+        loading_limit (float): Carregamento máximo admissível (%)
+        vm_min (float): Tensão mínima admissível (pu)
+        vm_max (float): Tensão máxima admissível (pu)
+        screening_threshold (float): Carregamento estimado (%) que leva ao fluxo AC
+        
+    Returns:
+        ContingencyAnalysis: Contingências críticas ordenadas por severidade
+    """
+    return await _contingency_response((filename,), loading_limit, vm_min, vm_max, screening_threshold)
+
+@router.post("/contingency/upload", response_model=ContingencyAnalysis, responses={**EXECUTOR_RESPONSES, **UPLOAD_RESPONSES})
+async def contingency_analysis_upload(
+    file: UploadFile = File(..., description="Arquivo MATPOWER (.m)"),
+    loading_limit: float = LOADING_LIMIT_QUERY,
+    vm_min: float = VM_MIN_QUERY,
+    vm_max: float = VM_MAX_QUERY,
+    screening_threshold: float = SCREENING_THRESHOLD_QUERY,
+):
+    """
+    Análise de contingências N-1 de um arquivo MATPOWER enviado.
+    
+    Args:
+        file (UploadFile): Arquivo MATPOWER a ser analisado
+        
+    Returns:
+        ContingencyAnalysis: Contingências críticas ordenadas por severidade
+    """
+    ppc, _ = await read_upload(file)
+    return await _contingency_response((None, None, ppc), loading_limit, vm_min, vm_max, screening_threshold)
+
+@router.post("/simulate/timeseries", responses={
+    **EXECUTOR_RESPONSES,
+    **UPLOAD_RESPONSES,
+    200: {"content": {"application/x-ndjson": {}, "application/octet-stream": {}},
+          "description": "Resultados por bloco de passos (NDJSON) ou arquivo .npz"},
+})
+async def simulate_timeseries(
+    file: Optional[UploadFile] = File(None, description="Arquivo MATPOWER (.m) do caso"),
+    filename: Optional[str] = Form(None, description="Nome de um modelo pré carregado (alternativa a `file`)"),
+    load_profile: Optional[UploadFile] = File(None, description="Fatores das cargas por passo (CSV, .npy ou .npz)"),
+    gen_profile: Optional[UploadFile] = File(None, description="Fatores dos geradores por passo (CSV, .npy ou .npz)"),
+    format: str = Query("ndjson", pattern="^(ndjson|npz)$", description="ndjson (blocos em streaming) ou npz"),
+    chunk_size: int = Query(TIMESERIES_CHUNK_SIZE, ge=1, le=10000, description="Passos por bloco"),
+):
+    """
+    Fluxo de potência quase estático ao longo de perfis de carga e geração.
+    
+    Cada linha do perfil é um passo e cada coluna um fator aplicado ao
+    `scaling` de uma carga/gerador (ou uma única coluna para todos). A mesma
+    rede é reaproveitada entre os passos, partindo da solução anterior.
+    
+    Args:
+        file (UploadFile): Caso MATPOWER enviado (ou `filename` de um modelo pré carregado)
+        load_profile (UploadFile): Perfil das cargas
+        gen_profile (UploadFile): Perfil dos geradores
+        format (str): `ndjson` envia um bloco de passos por linha; `npz` devolve um arquivo NumPy
+        chunk_size (int): Passos simulados por bloco
+        
+    Returns:
+        StreamingResponse | Response: Resultados por passo
+    """
+    if (file is None) == (filename is None):
+        raise HTTPException(status_code=400, detail="Informe exatamente um entre 'file' e 'filename'")
+    ppc = (await read_upload(file))[0] if file is not None else None
+    try:
+        profiles = []
+        for profile in (load_profile, gen_profile):
+            # Perfis lidos em blocos, com o mesmo limite de tamanho dos casos enviados
+            profiles.append(
+                timeseries_service.read_profile(
+                    await read_upload_bytes(profile, label=f"Perfil {profile.filename or ''}".strip()),
+                    profile.filename,
+                )
+                if profile is not None else None
+            )
+        if file is not None:
+            net = await simulation_executor.run("load_case_net", None, None, ppc)
+        else:
+            net = await simulation_executor.run("load_case_net", filename)
+        steps = timeseries_service.validate_profiles(net, *profiles)
+        if steps > TIMESERIES_MAX_STEPS:
+            raise ValueError(f"Máximo de {TIMESERIES_MAX_STEPS} passos por série temporal")
+
+        if format == "npz":
+            results = await timeseries_service.collect_timeseries(simulation_executor, net, *profiles, chunk_size)
+            return Response(
+                timeseries_service.encode_npz(results),
+                media_type="application/octet-stream",
+                headers={"Content-Disposition": 'attachment; filename="timeseries.npz"'},
+            )
+    except SimulationOverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SimulationTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def ndjson_chunks():
+        try:
+            async for start, chunk in timeseries_service.stream_timeseries(simulation_executor, net, *profiles, chunk_size):
+                yield json.dumps(timeseries_service.chunk_to_json(start, chunk)) + "\n"
+        except Exception as e:
+            # Resposta já iniciada: o erro vai como última linha
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return StreamingResponse(ndjson_chunks(), media_type="application/x-ndjson")
@@ -0,0 +1,51 @@
+import asyncio
+from typing import AsyncIterator, List
+from app.models.scenario_models import ScenarioDelta, ScenarioResult
+from app.services.simulation_executor import SimulationExecutor
+
+async def _run_scenario(executor: SimulationExecutor, net, index: int, scenario: ScenarioDelta,
+                        wait: bool = False, method: str = "simulate_scenario", args: tuple = ()) -> ScenarioResult:
+    """Simula um cenário no pool, convertendo falhas em um resultado com status de erro"""
+    try:
+        result = await executor.run(method, net, scenario, *args, wait=wait)
+        return ScenarioResult(index=index, name=scenario.name, status="ok", result=result)
+    except Exception as e:
+        return ScenarioResult(index=index, name=scenario.name, status="error", detail=str(e))
+
+async def run_batch(executor: SimulationExecutor, net, scenarios: List[ScenarioDelta],
+                    wait: bool = False, method: str = "simulate_scenario",
+                    args: tuple = ()) -> AsyncIterator[ScenarioResult]:
+    """Executa os cenários em paralelo no pool e devolve cada resultado assim que termina
+
+    No máximo ``executor.max_workers`` cenários do lote ficam pendentes ao
+    mesmo tempo, para que um lote grande não ocupe toda a fila do pool. Com
+    ``wait`` (jobs), os cenários aguardam vaga no pool em vez de falhar.
+    ``method`` e ``args`` escolhem o método do serviço que simula cada
+    cenário (ex: ``simulate_outage`` com a solução do caso base).
+    """
+    queue = iter(enumerate(scenarios))
+    pending = set()
+
+    def start_next() -> bool:
+        item = next(queue, None)
+        if item is None:
+            return False
+        index, scenario = item
+        pending.add(asyncio.ensure_future(_run_scenario(executor, net, index, scenario, wait, method, args)))
+        return True
+
+    for _ in range(max(1, executor.max_workers)):
+        if not start_next():
+            break
+
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.discard(task)
+                start_next()
+                yield task.result()
+    finally:
+        # Cliente desconectado: cancela os cenários que ainda não começaram
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,302 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import numpy as np
+from app.services.cache_backends import CacheBackend, FileBackend
+
+
+class LRUCache:
+    """Cache em memória com política LRU e expiração (TTL) opcional"""
+
+    def __init__(self, max_size: int = 128, ttl: Optional[float] = None):
+        if max_size < 1:
+            raise ValueError("O tamanho máximo do cache deve ser pelo menos 1")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, validate: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+        """Retorna o valor associado à chave ou None (contabilizando acerto/falha)
+
+        ``validate`` permite descartar entradas que não são mais válidas
+        (ex: arquivo de origem alterado); nesse caso conta como falha.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, value = entry
+            expired = self.ttl is not None and time.monotonic() - stored_at > self.ttl
+            if expired or (validate is not None and not validate(value)):
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Armazena um valor, removendo a entrada menos usada se necessário"""
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """Remove uma entrada do cache, se existir"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove todas as entradas do cache"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna as estatísticas de uso do cache"""
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class NetworkCache:
+    """Cache de redes pandapower já convertidas, indexado pelo caminho do arquivo
+
+    Cada entrada guarda a assinatura do arquivo (mtime e tamanho); se o arquivo
+    for alterado a entrada é descartada. As redes são sempre devolvidas como
+    cópias profundas, pois ``runpp`` altera a rede recebida.
+
+    Com um ``backend`` compartilhado (e a chave de assinatura configurada), as
+    redes convertidas por um worker são gravadas e reaproveitadas pelos
+    demais, que só as desserializam. As entradas do backend expiram após
+    ``ttl`` segundos, e a entrada da versão anterior de um arquivo alterado é
+    removida ao gravar a nova.
+    """
+
+    def __init__(self, max_size: int = 16, backend: Optional[CacheBackend] = None, ttl: Optional[float] = None):
+        self._cache = LRUCache(max_size=max_size)
+        self.backend = backend if backend is not None and backend.stores_objects else None
+        self.ttl = ttl
+        # Última assinatura gravada no backend por arquivo
+        self._stored: Dict[str, Tuple[int, int]] = {}
+        self.invalidations = 0
+        self.backend_hits = 0
+
+    @staticmethod
+    def _backend_key(file_path: str, signature: Tuple[int, int]) -> str:
+        return f"net:{os.path.basename(file_path)}:{signature[0]}:{signature[1]}"
+
+    @staticmethod
+    def file_signature(file_path: str) -> Tuple[int, int]:
+        """Assinatura do arquivo usada para detectar alterações"""
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, file_path: str, signature: Tuple[int, int]):
+        """Retorna uma cópia da rede em cache ou None se ausente/desatualizada"""
+        def is_current(entry) -> bool:
+            if entry[0] == signature:
+                return True
+            # Arquivo alterado desde a conversão
+            self.invalidations += 1
+            return False
+
+        entry = self._cache.get(file_path, validate=is_current)
+        if entry is not None:
+            return copy.deepcopy(entry[1])
+        if self.backend is None:
+            return None
+
+        # A rede desserializada já é uma cópia própria
+        net = self.backend.get_object(self._backend_key(file_path, signature))
+        if net is None:
+            return None
+        self.backend_hits += 1
+        self._cache.put(file_path, (signature, copy.deepcopy(net)))
+        return net
+
+    def put(self, file_path: str, signature: Tuple[int, int], net):
+        """Armazena uma cópia da rede convertida (e a grava no backend compartilhado, se houver)"""
+        self._cache.put(file_path, (signature, copy.deepcopy(net)))
+        if self.backend is not None:
+            previous = self._stored.get(file_path)
+            if previous is not None and previous != signature:
+                self.backend.delete(self._backend_key(file_path, previous))
+            self.backend.set_object(self._backend_key(file_path, signature), net, self.ttl)
+            self._stored[file_path] = signature
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._cache.stats()
+        stats["invalidations"] = self.invalidations
+        stats["backend_hits"] = self.backend_hits
+        return stats
+
+
+def normalize_matpower_content(content: str) -> str:
+    """Normaliza o conteúdo MATPOWER para cálculo do hash
+
+    Remove quebras de linha Windows, espaços ao final das linhas, linhas em
+    branco e linhas de comentário, que não alteram o resultado da simulação.
+    """
+    normalized = []
+    for line in content.splitlines():
+        line = line.rstrip()
+        stripped = line.lstrip()
+        if not stripped or stripped.startswith('%'):
+            continue
+        normalized.append(line)
+    return '\n'.join(normalized)
+
+
+def content_hash(content: str) -> str:
+    """Hash SHA-256 do conteúdo MATPOWER normalizado"""
+    return hashlib.sha256(normalize_matpower_content(content).encode('utf-8')).hexdigest()
+
+
+class ContentHasher:
+    """Calcula o mesmo hash de ``content_hash`` linha a linha, sem manter o conteúdo em memória"""
+
+    def __init__(self):
+        self._sha = hashlib.sha256()
+        self._first = True
+
+    def update_line(self, line: str):
+        line = line.rstrip()
+        stripped = line.lstrip()
+        if not stripped or stripped.startswith('%'):
+            return
+        if not self._first:
+            self._sha.update(b'\n')
+        self._sha.update(line.encode('utf-8'))
+        self._first = False
+
+    def hexdigest(self) -> str:
+        return self._sha.hexdigest()
+
+
+class ResultCache:
+    """Cache de resultados de simulação indexado pelo hash do conteúdo
+
+    Os resultados são guardados no formato colunar (dicionário serializável
+    em JSON), em memória (LRU com TTL) e, opcionalmente, em um backend
+    compartilhado entre workers (ver ``cache_backends``). ``disk_dir`` é um
+    atalho para um ``FileBackend`` nesse diretório, que sobrevive a
+    reinicializações do servidor.
+    """
+
+    def __init__(self, max_size: int = 256, ttl: Optional[float] = 3600.0,
+                 disk_dir: Optional[str] = None, backend: Optional[CacheBackend] = None):
+        self._memory = LRUCache(max_size=max_size, ttl=ttl)
+        self.ttl = ttl
+        if backend is None and disk_dir:
+            backend = FileBackend(disk_dir)
+        self.backend = backend
+        self.backend_hits = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Retorna o resultado em cache (memória ou backend) ou None"""
+        result = self._memory.get(key)
+        if result is not None or self.backend is None:
+            return result
+
+        data = self.backend.get(f"result:{key}")
+        if data is None:
+            return None
+        try:
+            result = json.loads(data)
+        except ValueError:
+            # Entrada corrompida: trata como falha
+            return None
+
+        self.backend_hits += 1
+        self._memory.put(key, result)
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """Armazena o resultado em memória e, se configurado, no backend compartilhado"""
+        self._memory.put(key, result)
+        if self.backend is not None:
+            self.backend.set(f"result:{key}", json.dumps(result).encode('utf-8'), self.ttl)
+
+    def clear(self):
+        self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._memory.stats()
+        stats["ttl"] = self.ttl
+        stats["backend"] = self.backend.name if self.backend is not None else None
+        stats["backend_hits"] = self.backend_hits
+        return stats
+
+
+def topology_key(net) -> str:
+    """Hash da topologia da rede: barras, ramos (extremidades e estado) e barras de geração
+
+    Redes com a mesma chave têm o mesmo vetor de tensões e podem reaproveitar
+    a solução uma da outra; alterações de carga ou despacho não mudam a chave.
+    """
+    digest = hashlib.sha1()
+    parts = [net.bus.index.to_numpy(dtype=np.int64)]
+    for table, columns in (('line', ('from_bus', 'to_bus')), ('trafo', ('hv_bus', 'lv_bus')),
+                           ('gen', ('bus',)), ('ext_grid', ('bus',))):
+        df = net[table]
+        parts.extend(df[column].to_numpy(dtype=np.int64) for column in columns)
+        parts.append(df['in_service'].to_numpy(dtype=bool))
+    for part in parts:
+        digest.update(len(part).to_bytes(8, 'little'))
+        digest.update(np.ascontiguousarray(part).tobytes())
+    return digest.hexdigest()
+
+
+class WarmStartStore:
+    """Última solução convergida (módulo e ângulo das tensões) por topologia de rede
+
+    Usada como ponto de partida do próximo fluxo de potência da mesma
+    topologia (``init="results"``), reduzindo o número de iterações quando
+    apenas cargas ou geradores são alterados.
+    """
+
+    def __init__(self, max_size: int = 64):
+        self._cache = LRUCache(max_size=max_size)
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Retorna (vm_pu, va_degree) da última solução ou None"""
+        return self._cache.get(key)
+
+    def put(self, key: str, net):
+        """Armazena as tensões de uma rede já resolvida"""
+        self._cache.put(key, (
+            net.res_bus.vm_pu.to_numpy(dtype=float).copy(),
+            net.res_bus.va_degree.to_numpy(dtype=float).copy(),
+        ))
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
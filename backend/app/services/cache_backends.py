@@ -0,0 +1,357 @@
+import hashlib
+from abc import ABC, abstractmethod
+import hmac
+import logging
+import os
+import pickle
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import redis
+except ImportError:  # Dependência opcional: apenas o backend Redis fica indisponível
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Chave HMAC dos objetos (redes e sessões, em pickle) gravados em backends
+# compartilhados; sem ela esses objetos ficam apenas na memória de cada worker
+CACHE_SECRET = os.getenv("SISEP_CACHE_SECRET") or None
+
+
+class CacheBackend(ABC):
+    """Armazenamento chave -> bytes que pode ser compartilhado entre workers e containers
+
+    As subclasses implementam ``_get``, ``_set``, ``_delete`` e ``_clear``
+    (uma subclasse incompleta não pode ser instanciada). Falhas do
+    armazenamento são registradas e tratadas como ausência da entrada, para
+    não impedir a resposta. Resultados são gravados em JSON (``get``/``set``);
+    redes e sessões usam ``get_object``/``set_object``, em pickle.
+    Desserializar um pickle executa código, então em backends compartilhados
+    os objetos só são gravados com ``SISEP_CACHE_SECRET`` e cada um é
+    assinado (HMAC-SHA256) e conferido antes da leitura.
+    """
+
+    name = "base"
+    # Backend acessível por outros processos ou máquinas
+    shared = True
+
+    def __init__(self, secret: Optional[str] = None):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.rejected = 0
+        secret = secret if secret is not None else CACHE_SECRET
+        self._secret = secret.encode('utf-8') if secret else None
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            value = self._get(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Falha ao ler %s do cache %s: %s", key, self.name, e)
+            return None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        """Armazena o valor; ``ttl`` em segundos (None: sem expiração)"""
+        try:
+            self._set(key, value, ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Falha ao gravar %s no cache %s: %s", key, self.name, e)
+
+    def delete(self, key: str):
+        try:
+            self._delete(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Falha ao remover %s do cache %s: %s", key, self.name, e)
+
+    def clear(self):
+        try:
+            self._clear()
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Falha ao limpar o cache %s: %s", self.name, e)
+
+    @property
+    def stores_objects(self) -> bool:
+        """Se redes e sessões (pickle) podem ser gravadas: no próprio processo ou com assinatura"""
+        return not self.shared or self._secret is not None
+
+    def _sign(self, data: bytes) -> bytes:
+        return hmac.new(self._secret, data, hashlib.sha256).digest()
+
+    def get_object(self, key: str) -> Optional[Any]:
+        """Lê um objeto gravado com ``set_object``; assinatura inválida conta como ausência"""
+        if not self.stores_objects:
+            return None
+        data = self.get(key)
+        if data is None:
+            return None
+        if self._secret is not None:
+            size = hashlib.sha256().digest_size
+            signature, data = data[:size], data[size:]
+            if not hmac.compare_digest(signature, self._sign(data)):
+                self.rejected += 1
+                logger.warning("Assinatura inválida de %s no cache %s: entrada ignorada", key, self.name)
+                return None
+        return pickle.loads(data)
+
+    def set_object(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Grava um objeto em pickle (assinado quando há chave); ignorado se o backend não pode guardá-lo"""
+        if not self.stores_objects:
+            return
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self._secret is not None:
+            data = self._sign(data) + data
+        self.set(key, data, ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "hits": self.hits, "misses": self.misses, "errors": self.errors,
+                "objects": self.stores_objects, "signed": self._secret is not None, "rejected": self.rejected}
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[bytes]:
+        """Valor da chave ou None se ausente/expirado"""
+
+    @abstractmethod
+    def _set(self, key: str, value: bytes, ttl: Optional[float]):
+        """Grava o valor com a validade informada"""
+
+    @abstractmethod
+    def _delete(self, key: str):
+        """Remove a chave, se existir"""
+
+    @abstractmethod
+    def _clear(self):
+        """Remove todas as entradas do backend"""
+
+
+def _expires_at(ttl: Optional[float]) -> float:
+    """Instante de expiração (relógio de parede, comum a todos os processos); 0 nunca expira"""
+    return time.time() + ttl if ttl is not None else 0.0
+
+
+def _expired(expires_at: float) -> bool:
+    return expires_at > 0 and time.time() > expires_at
+
+
+class MemoryBackend(CacheBackend):
+    """Backend em memória do próprio processo (não compartilhado; útil em testes e com um worker)"""
+
+    name = "memory"
+    shared = False
+
+    def __init__(self, max_size: int = 1024, secret: Optional[str] = None):
+        super().__init__(secret)
+        self.max_size = max_size
+        self._data: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if _expired(entry[0]):
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def _set(self, key: str, value: bytes, ttl: Optional[float]):
+        with self._lock:
+            self._data[key] = (_expires_at(ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def _delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def _clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class FileBackend(CacheBackend):
+    """Um arquivo por entrada em um diretório local (compartilhado pelos workers da mesma máquina ou volume)
+
+    Cada arquivo começa com o instante de expiração (8 bytes) seguido do
+    valor; a gravação é atômica (arquivo temporário + rename).
+    """
+
+    name = "file"
+    HEADER = struct.Struct('<d')
+
+    def __init__(self, directory: str, secret: Optional[str] = None):
+        super().__init__(secret)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        # Chaves podem conter caracteres inválidos em nomes de arquivo
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.bin')
+
+    def _get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        if len(data) < self.HEADER.size:
+            return None
+        (expires_at,) = self.HEADER.unpack_from(data)
+        if _expired(expires_at):
+            self._delete(key)
+            return None
+        return data[self.HEADER.size:]
+
+    def _set(self, key: str, value: bytes, ttl: Optional[float]):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(self.HEADER.pack(_expires_at(ttl)))
+                f.write(value)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _delete(self, key: str):
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith('.bin'):
+                os.unlink(os.path.join(self.directory, name))
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "location": self.directory}
+
+
+class SQLiteBackend(CacheBackend):
+    """Tabela em um arquivo SQLite local (modo WAL, vários processos leem e gravam)"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, secret: Optional[str] = None):
+        super().__init__(secret)
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Conexão da thread atual (conexões SQLite não são compartilhadas entre threads)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def _get(self, key: str) -> Optional[bytes]:
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if _expired(row[1]):
+            self._delete(key)
+            return None
+        return bytes(row[0])
+
+    def _set(self, key: str, value: bytes, ttl: Optional[float]):
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, sqlite3.Binary(value), _expires_at(ttl)),
+            )
+
+    def _delete(self, key: str):
+        with self._connection() as connection:
+            connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def _clear(self):
+        with self._connection() as connection:
+            connection.execute("DELETE FROM cache")
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "location": self.path}
+
+
+class RedisBackend(CacheBackend):
+    """Servidor Redis (ou compatível) compartilhado entre máquinas; requer o pacote redis"""
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "sisep:", secret: Optional[str] = None):
+        super().__init__(secret)
+        if redis is None:
+            raise ValueError("Backend Redis indisponível: instale o pacote redis")
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def _get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self.prefix + key)
+
+    def _set(self, key: str, value: bytes, ttl: Optional[float]):
+        # O Redis expira as entradas sozinho (px em milissegundos)
+        self._client.set(self.prefix + key, value, px=int(ttl * 1000) if ttl is not None else None)
+
+    def _delete(self, key: str):
+        self._client.delete(self.prefix + key)
+
+    def _clear(self):
+        keys = list(self._client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self._client.delete(*keys)
+
+
+def create_backend(url: Optional[str]) -> Optional[CacheBackend]:
+    """Cria o backend a partir da configuração; None mantém o estado apenas no processo
+
+    Formatos aceitos: ``memory``, ``file:<diretório>``, ``sqlite:<arquivo>`` e
+    ``redis://host:porta/db`` (também ``rediss://`` e ``unix://``).
+    """
+    if not url:
+        return None
+    if url == 'memory':
+        return MemoryBackend()
+    scheme, _, location = url.partition(':')
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        backend = RedisBackend(url)
+    elif scheme == 'file' and location:
+        backend = FileBackend(location)
+    elif scheme == 'sqlite' and location:
+        backend = SQLiteBackend(location)
+    else:
+        raise ValueError(
+            f"Backend de cache inválido: {url}. Use memory, file:<diretório>, sqlite:<arquivo> ou redis://host:porta/db"
+        )
+    if not backend.stores_objects:
+        logger.warning("SISEP_CACHE_SECRET não definido: apenas resultados são compartilhados pelo cache %s; "
+                       "redes e sessões ficam na memória de cada worker", backend.name)
+    return backend
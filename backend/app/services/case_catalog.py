@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.models.catalog_models import CaseInfo
+from app.models.power_system_results import PowerSystemResult
+from app.services.cache import NetworkCache
+from app.services.compiled_case import CASE_EXTENSIONS
+from app.services.encoded_response import EncodedBody
+from app.services.result_projection import mark_reused
+
+logger = logging.getLogger(__name__)
+
+# Monta a resposta de um formato a partir dos resultados por coluna
+Encoder = Callable[[Dict[str, Any]], EncodedBody]
+
+
+class CatalogEntry:
+    """Modelo do catálogo: assinatura do arquivo, informações e resultados do caso base
+
+    ``bodies`` guarda as respostas já serializadas e comprimidas por formato,
+    calculadas junto com o caso (fora do event loop): a do formato por
+    linhas (padrão) e as dos demais formatos informados em ``encoders``.
+    """
+
+    def __init__(self, signature: Tuple[int, int], info: CaseInfo,
+                 columns: Optional[Dict[str, Any]] = None, result: Optional[PowerSystemResult] = None,
+                 encoders: Optional[Dict[str, Encoder]] = None):
+        self.signature = signature
+        self.info = info
+        self.columns = columns
+        self.result = result
+        self.bodies: Dict[str, EncodedBody] = {}
+        if result is not None:
+            self.bodies['rows'] = EncodedBody(result.model_dump_json().encode('utf-8'), "application/json")
+            for fmt, encode in (encoders or {}).items():
+                self.bodies[fmt] = encode(columns)
+
+    def body(self, fmt: str, build: Callable[[], EncodedBody]) -> EncodedBody:
+        """Resposta serializada do formato, montada com ``build`` na primeira vez"""
+        body = self.bodies.get(fmt)
+        if body is None:
+            body = self.bodies[fmt] = build()
+        return body
+
+
+class CaseCatalog:
+    """Catálogo em memória dos modelos pré carregados, já convertidos e resolvidos
+
+    ``refresh`` percorre o diretório de dados e simula apenas os arquivos
+    novos ou alterados (mtime/tamanho); ``watch`` repete a verificação
+    periodicamente. As consultas conferem a assinatura do arquivo, então um
+    modelo alterado nunca é servido desatualizado.
+    """
+
+    # Intervalo (s) entre as verificações do diretório de dados
+    REFRESH_INTERVAL = float(os.getenv("SISEP_CATALOG_REFRESH_INTERVAL", "5"))
+
+    def __init__(self, service, encoders: Optional[Dict[str, Encoder]] = None):
+        self.service = service
+        # Formatos de resposta (além do padrão) pré calculados para cada modelo
+        self.encoders = encoders or {}
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.loaded = False
+        self.hits = 0
+        self.refreshes = 0
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Modelos do diretório de dados (.m e casos compilados .npz) e suas assinaturas"""
+        signatures = {}
+        with os.scandir(self.service.data_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(CASE_EXTENSIONS) and entry.is_file():
+                    stat = entry.stat()
+                    signatures[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def _load(self, filename: str, signature: Tuple[int, int]) -> CatalogEntry:
+        """Converte e resolve o caso base de um modelo"""
+        try:
+            # As respostas do catálogo não simulam de novo: o solver sai marcado como reaproveitado
+            columns = mark_reused(self.service.simulate_columns_from_filename(filename))
+        except ValueError as e:
+            logger.warning("Modelo %s não incluído no catálogo: %s", filename, e)
+            return CatalogEntry(signature, CaseInfo(filename=filename, error=str(e)))
+
+        solver = columns.get('solver') or {}
+        info = CaseInfo(
+            filename=filename,
+            buses=len(columns['buses']['bus_id']),
+            branches=len(columns['lines']['from_bus']),
+            generators=len(columns['generators']['bus_id']) + (columns['ext_grid'] is not None),
+            loads=len(columns['loads']['bus_id']),
+            iterations=solver.get('iterations'),
+        )
+        return CatalogEntry(signature, info, columns, self.service.result_from_columns(columns), self.encoders)
+
+    def refresh(self) -> Dict[str, int]:
+        """Atualiza o catálogo com os arquivos novos, alterados e removidos"""
+        with self._refresh_lock:
+            signatures = self._scan()
+            with self._lock:
+                current = dict(self._entries)
+
+            changed = {name: sig for name, sig in signatures.items()
+                       if name not in current or current[name].signature != sig}
+            loaded = {name: self._load(name, sig) for name, sig in sorted(changed.items())}
+            removed = [name for name in current if name not in signatures]
+
+            with self._lock:
+                self._entries.update(loaded)
+                for name in removed:
+                    del self._entries[name]
+                self.loaded = True
+                self.refreshes += 1
+
+        summary = {
+            "added": sum(name not in current for name in loaded),
+            "updated": sum(name in current for name in loaded),
+            "removed": len(removed),
+        }
+        if loaded or removed:
+            logger.info("Catálogo de modelos atualizado: %s", summary)
+        return summary
+
+    async def watch(self, interval: Optional[float] = None):
+        """Verifica periodicamente o diretório de dados (até ser cancelado)"""
+        interval = self.REFRESH_INTERVAL if interval is None else interval
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception:
+                logger.exception("Falha ao atualizar o catálogo de modelos")
+
+    def files(self) -> List[str]:
+        """Nomes dos modelos disponíveis"""
+        with self._lock:
+            return sorted(self._entries)
+
+    def cases(self) -> List[CaseInfo]:
+        """Informações de todos os modelos do catálogo"""
+        with self._lock:
+            return [self._entries[name].info for name in sorted(self._entries)]
+
+    def lookup(self, filename: str) -> Optional[CatalogEntry]:
+        """Entrada resolvida do modelo, ou None se ausente, com erro ou desatualizada"""
+        with self._lock:
+            entry = self._entries.get(filename)
+        if entry is None or entry.columns is None:
+            return None
+        try:
+            if NetworkCache.file_signature(os.path.join(self.service.data_dir, filename)) != entry.signature:
+                return None
+        except OSError:
+            return None
+        self.hits += 1
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "loaded": self.loaded,
+                "size": len(self._entries),
+                "encoded_bytes": sum(body.size() for entry in self._entries.values()
+                                     for body in list(entry.bodies.values())),
+                "hits": self.hits,
+                "refreshes": self.refreshes,
+                "refresh_interval": self.REFRESH_INTERVAL,
+            }
@@ -0,0 +1,126 @@
+import json
+import os
+import struct
+import threading
+import zipfile
+from io import BytesIO
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Versão do formato compilado; arquivos de outra versão são recompilados
+FORMAT_VERSION = 1
+EXTENSION = '.npz'
+# Extensões dos modelos do diretório de dados: texto MATPOWER e caso compilado
+CASE_EXTENSIONS = ('.m', EXTENSION)
+META_MEMBER = 'meta.json'
+
+# Alinhamento dos dados de cada array dentro do arquivo (o cabeçalho .npy já é múltiplo de 64)
+ALIGNMENT = 64
+# Campo extra do zip usado apenas como preenchimento (o mesmo do zipalign)
+_PADDING_EXTRA_ID = 0xD935
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+
+
+def _aligned_extra(offset: int, name: str) -> bytes:
+    """Campo extra que alinha o início do membro gravado em ``offset``"""
+    start = offset + _LOCAL_HEADER.size + len(name.encode('utf-8')) + 4
+    padding = -start % ALIGNMENT
+    return struct.pack('<HH', _PADDING_EXTRA_ID, padding) + b'\0' * padding
+
+
+def _npy_bytes(array: np.ndarray) -> bytes:
+    buffer = BytesIO()
+    np.lib.format.write_array(buffer, np.ascontiguousarray(array), allow_pickle=False)
+    return buffer.getvalue()
+
+
+def write_compiled(path: str, ppc: Dict[str, Any], source: Optional[str] = None,
+                   source_signature: Optional[Tuple[int, int]] = None) -> int:
+    """Grava o ppc já preparado (índices 0-based) como .npz sem compressão; retorna o tamanho (bytes)
+
+    Cada matriz vira um membro ``<nome>.npy`` com os dados alinhados, o que
+    permite mapeá-la direto do arquivo; os escalares (baseMVA, version) e a
+    assinatura do arquivo de origem ficam no membro ``meta.json``. O arquivo
+    continua legível por ``np.load``. A gravação é atômica.
+    """
+    arrays = {name: value for name, value in ppc.items() if isinstance(value, np.ndarray)}
+    for name, value in arrays.items():
+        if value.dtype.hasobject:
+            raise ValueError(f"Matriz mpc.{name} não pode ser compilada (tipo {value.dtype})")
+    meta = {
+        'format': FORMAT_VERSION,
+        'source': source,
+        'source_signature': list(source_signature) if source_signature is not None else None,
+        'scalars': {name: value for name, value in ppc.items() if not isinstance(value, np.ndarray)},
+        'arrays': sorted(arrays),
+    }
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f, zipfile.ZipFile(f, 'w', compression=zipfile.ZIP_STORED) as zf:
+            zf.writestr(META_MEMBER, json.dumps(meta))
+            for name in meta['arrays']:
+                member = name + '.npy'
+                info = zipfile.ZipInfo(member, date_time=(1980, 1, 1, 0, 0, 0))
+                info.extra = _aligned_extra(f.tell(), member)
+                zf.writestr(info, _npy_bytes(arrays[name]))
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    return os.path.getsize(path)
+
+
+def read_meta(path: str) -> Dict[str, Any]:
+    """Cabeçalho de metadados do caso compilado"""
+    with zipfile.ZipFile(path) as zf:
+        meta = json.loads(zf.read(META_MEMBER))
+    if meta.get('format') != FORMAT_VERSION:
+        raise ValueError(f"Versão do caso compilado não suportada: {meta.get('format')}")
+    return meta
+
+
+def is_current(path: str, source_signature: Tuple[int, int]) -> bool:
+    """Se o caso compilado existe e foi gerado a partir da versão atual do arquivo de origem"""
+    try:
+        meta = read_meta(path)
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return False
+    return meta.get('source_signature') == list(source_signature)
+
+
+def load_compiled(path: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Abre o caso compilado mapeando as matrizes em memória (sem cópia); retorna o ppc e os metadados
+
+    Os arrays usam cópia na escrita (``mode='c'``): alterações feitas pelo
+    conversor ficam no processo e nunca chegam ao arquivo.
+    """
+    ppc: Dict[str, Any] = {}
+    with open(path, 'rb') as f, zipfile.ZipFile(f) as zf:
+        meta = json.loads(zf.read(META_MEMBER))
+        if meta.get('format') != FORMAT_VERSION:
+            raise ValueError(f"Versão do caso compilado não suportada: {meta.get('format')}")
+        for name in meta['arrays']:
+            info = zf.getinfo(name + '.npy')
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Matriz {name} comprimida no caso compilado; recompile o modelo")
+            # Os dados começam após o cabeçalho local do zip e o cabeçalho .npy
+            f.seek(info.header_offset)
+            local = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+            f.seek(local[-2] + local[-1], os.SEEK_CUR)
+            version = np.lib.format.read_magic(f)
+            read_header = (np.lib.format.read_array_header_1_0 if version == (1, 0)
+                           else np.lib.format.read_array_header_2_0)
+            shape, fortran_order, dtype = read_header(f)
+            if dtype.itemsize * int(np.prod(shape)) == 0:
+                ppc[name] = np.zeros(shape, dtype=dtype)
+                continue
+            array = np.memmap(f, dtype=dtype, mode='c', offset=f.tell(), shape=shape,
+                              order='F' if fortran_order else 'C')
+            ppc[name] = np.asarray(array)
+    ppc.update(meta['scalars'])
+    return ppc, meta
@@ -0,0 +1,201 @@
+import copy
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.models.contingency_models import ContingencyAnalysis, ContingencyResult
+from app.models.power_system_results import PowerSystemResult
+from app.models.scenario_models import BranchChange, GeneratorChange, ScenarioDelta
+from app.services.batch_service import run_batch
+from app.services.lazy_import import LazyModule
+from app.services.simulation_executor import SimulationExecutor
+
+# Índices e matrizes do pypower, importados apenas na primeira análise
+idx_brch = LazyModule("pandapower.pypower.idx_brch")
+idx_bus = LazyModule("pandapower.pypower.idx_bus")
+lodf_module = LazyModule("pandapower.pypower.makeLODF")
+ptdf_module = LazyModule("pandapower.pypower.makePTDF")
+
+# Limites padrão da análise N-1
+LOADING_LIMIT = 100.0         # Carregamento máximo admissível (%)
+VM_MIN, VM_MAX = 0.95, 1.05   # Faixa de tensão admissível (pu)
+SCREENING_THRESHOLD = 90.0    # Carregamento estimado (%) a partir do qual a contingência vai para o fluxo AC
+
+# Colunas da matriz de fluxos pós-contingência avaliadas por vez (limita a memória em casos grandes)
+SCREENING_BLOCK = 256
+
+# Tolerância para identificar ramos cuja saída separa a rede em ilhas (1 - PTDF_kk ≈ 0)
+ISLANDING_TOLERANCE = 1e-6
+
+
+def _branch_ratings(net) -> np.ndarray:
+    """Potência nominal (MVA) de cada ramo na ordem do ppc (linhas e depois transformadores)"""
+    lookup = net._pd2ppc_lookups['branch']
+    n_branch = max((end for _, end in lookup.values()), default=0)
+    ratings = np.full(n_branch, np.inf)
+    if 'line' in lookup:
+        start, end = lookup['line']
+        vn_kv = net.bus.vn_kv.loc[net.line.from_bus].to_numpy(dtype=float)
+        ratings[start:end] = (net.line.max_i_ka * net.line.df * net.line.parallel).to_numpy(dtype=float) * vn_kv * np.sqrt(3)
+    if 'trafo' in lookup:
+        start, end = lookup['trafo']
+        ratings[start:end] = (net.trafo.sn_mva * net.trafo.parallel).to_numpy(dtype=float)
+    return ratings
+
+
+def _estimated_loading(flows: np.ndarray, q_base: np.ndarray, ratings: np.ndarray) -> np.ndarray:
+    """Maior carregamento estimado (%) de cada coluna de fluxos ativos pós-contingência
+
+    A potência reativa de cada ramo é mantida igual à do caso base AC.
+    """
+    loading = 100.0 * np.hypot(flows, q_base[:, None]) / ratings[:, None]
+    return np.nan_to_num(loading, nan=0.0).max(axis=0, initial=0.0)
+
+
+def screen_contingencies(service, net, loading_limit: float = LOADING_LIMIT, vm_min: float = VM_MIN,
+                         vm_max: float = VM_MAX, screening_threshold: float = SCREENING_THRESHOLD
+                         ) -> Tuple[ContingencyAnalysis, Tuple[np.ndarray, np.ndarray]]:
+    """Resolve o caso base e faz a triagem DC de todas as saídas de ramo e de gerador
+
+    As matrizes PTDF e LODF são calculadas uma única vez a partir do caso
+    base e estimam, para todas as contingências de uma vez, os fluxos ativos
+    após cada saída. Apenas as contingências com carregamento estimado acima
+    de ``screening_threshold`` (ou que ilham parte da rede) são devolvidas
+    para a simulação AC.
+
+    Também devolve as tensões (vm_pu, va_degree) do caso base resolvido,
+    ponto de partida das simulações AC das contingências.
+    """
+    net = copy.deepcopy(net)
+    base_result = service._run_simulation(net)
+    base = ContingencyResult(outage_type="base", name="caso base")
+    summarize_result(base, base_result, loading_limit, vm_min, vm_max)
+
+    BR_STATUS, F_BUS, T_BUS, PF, QF = (idx_brch.BR_STATUS, idx_brch.F_BUS, idx_brch.T_BUS,
+                                       idx_brch.PF, idx_brch.QF)
+    ppc = net._ppc
+    bus, branch = ppc['bus'].real, ppc['branch'].real
+    ref = int(np.flatnonzero(bus[:, idx_bus.BUS_TYPE] == idx_bus.REF)[0])
+    ptdf = ptdf_module.makePTDF(ppc['baseMVA'], bus, branch, slack=ref, using_sparse_solver=True)
+
+    f_bus = branch[:, F_BUS].astype(int)
+    t_bus = branch[:, T_BUS].astype(int)
+    in_service = branch[:, BR_STATUS] > 0
+    branch_index = np.arange(len(branch))
+    # Fluxo no próprio ramo por unidade transferida entre suas barras; ≈ 1 indica ramo sem caminho paralelo
+    self_ptdf = ptdf[branch_index, f_bus] - ptdf[branch_index, t_bus]
+    islanding = in_service & (np.abs(1.0 - self_ptdf) < ISLANDING_TOLERANCE)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lodf = lodf_module.makeLODF(branch, ptdf)
+    lodf[:, islanding] = 0.0
+
+    p_base = branch[:, PF]
+    q_base = np.where(in_service, branch[:, QF], 0.0)
+    ratings = np.where(in_service, _branch_ratings(net), np.inf)
+
+    contingencies: List[ContingencyResult] = []
+    total = 0
+
+    # Saídas de ramo: f_l + LODF[l, k] * f_k para cada ramo k
+    dc_loading = np.zeros(len(branch))
+    for start in range(0, len(branch), SCREENING_BLOCK):
+        columns = branch_index[start:start + SCREENING_BLOCK]
+        flows = p_base[:, None] + lodf[:, columns] * p_base[columns]
+        flows[columns, np.arange(len(columns))] = 0.0
+        dc_loading[columns] = _estimated_loading(flows, q_base, ratings)
+
+    for k in np.flatnonzero(in_service):
+        total += 1
+        name = f"ramo {k} ({f_bus[k]}-{t_bus[k]})"
+        if islanding[k]:
+            contingencies.append(ContingencyResult(
+                outage_type="branch", element=int(k), name=name, status="islanding",
+                detail="A saída do ramo separa a rede em ilhas",
+            ))
+        elif dc_loading[k] >= screening_threshold:
+            contingencies.append(ContingencyResult(
+                outage_type="branch", element=int(k), name=name, dc_loading_percent=float(dc_loading[k]),
+            ))
+
+    # Saídas de gerador: a potência perdida é assumida pela barra de referência
+    gens = net.gen[net.gen.in_service]
+    if len(gens) > 0:
+        gen_p = net.res_gen.p_mw.loc[gens.index].groupby(gens.bus).sum()
+        gen_buses = gen_p.index.to_numpy(dtype=int)
+        ppc_buses = net._pd2ppc_lookups['bus'][gen_buses]
+        flows = p_base[:, None] - ptdf[:, ppc_buses] * gen_p.to_numpy(dtype=float)
+        for bus_id, loading in zip(gen_buses, _estimated_loading(flows, q_base, ratings)):
+            total += 1
+            if loading >= screening_threshold:
+                contingencies.append(ContingencyResult(
+                    outage_type="generator", element=int(bus_id), name=f"gerador da barra {bus_id}",
+                    dc_loading_percent=float(loading),
+                ))
+
+    analysis = ContingencyAnalysis(
+        loading_limit=loading_limit, vm_min=vm_min, vm_max=vm_max,
+        screening_threshold=screening_threshold, total=total, ac_solved=0,
+        base=base, contingencies=contingencies,
+    )
+    seed = (net.res_bus.vm_pu.to_numpy(dtype=float), net.res_bus.va_degree.to_numpy(dtype=float))
+    return analysis, seed
+
+
+def summarize_result(entry: ContingencyResult, result: PowerSystemResult, loading_limit: float,
+                     vm_min: float, vm_max: float):
+    """Preenche o resultado da contingência com os piores valores do fluxo AC"""
+    loading = np.array([line.loading_percent for line in result.lines], dtype=float)
+    in_service = np.array([line.in_service for line in result.lines], dtype=bool)
+    loading = np.where(in_service & np.isfinite(loading), loading, -np.inf)
+    if loading.size and np.isfinite(loading.max()):
+        worst = int(loading.argmax())
+        entry.max_loading_percent = float(loading[worst])
+        entry.max_loading_line = worst
+        entry.overloaded_lines = np.flatnonzero(loading > loading_limit).tolist()
+
+    vm = np.array([bus.vm_pu for bus in result.buses], dtype=float)
+    bus_ids = np.array([bus.bus_id for bus in result.buses], dtype=int)
+    energized = np.isfinite(vm)
+    if energized.any():
+        vm, bus_ids = vm[energized], bus_ids[energized]
+        entry.min_vm_pu, entry.min_vm_bus = float(vm.min()), int(bus_ids[vm.argmin()])
+        entry.max_vm_pu, entry.max_vm_bus = float(vm.max()), int(bus_ids[vm.argmax()])
+        entry.voltage_violations = bus_ids[(vm < vm_min) | (vm > vm_max)].tolist()
+
+
+def _outage_scenario(entry: ContingencyResult) -> ScenarioDelta:
+    """Cenário que retira de serviço o elemento da contingência"""
+    if entry.outage_type == "branch":
+        return ScenarioDelta(name=entry.name, branches=[BranchChange(index=entry.element, in_service=False)])
+    return ScenarioDelta(name=entry.name, generators=[GeneratorChange(bus_id=entry.element, in_service=False)])
+
+
+def _severity(entry: ContingencyResult):
+    """Chave de ordenação: sem solução e ilhamentos primeiro, depois maior carregamento e menor tensão"""
+    if entry.status != "ok":
+        return (0, 0.0, 0.0)
+    loading = entry.max_loading_percent if entry.max_loading_percent is not None else -np.inf
+    min_vm = entry.min_vm_pu if entry.min_vm_pu is not None else np.inf
+    return (1, -loading, min_vm)
+
+
+async def run_contingency_analysis(executor: SimulationExecutor, net, loading_limit: float = LOADING_LIMIT,
+                                   vm_min: float = VM_MIN, vm_max: float = VM_MAX,
+                                   screening_threshold: float = SCREENING_THRESHOLD) -> ContingencyAnalysis:
+    """Análise N-1: triagem DC e fluxo AC em paralelo apenas para as contingências críticas"""
+    analysis, seed = await executor.run(
+        "screen_contingencies", net, loading_limit, vm_min, vm_max, screening_threshold
+    )
+
+    # Cada saída parte da solução do caso base e não ocupa a partida a quente das requisições interativas
+    candidates = [entry for entry in analysis.contingencies if entry.status == "ok"]
+    scenarios = [_outage_scenario(entry) for entry in candidates]
+    async for scenario_result in run_batch(executor, net, scenarios, method="simulate_outage", args=(seed,)):
+        entry = candidates[scenario_result.index]
+        if scenario_result.status == "ok":
+            summarize_result(entry, scenario_result.result, loading_limit, vm_min, vm_max)
+        else:
+            entry.status = "error"
+            entry.detail = scenario_result.detail
+
+    analysis.ac_solved = len(candidates)
+    analysis.contingencies.sort(key=_severity)
+    return analysis
@@ -0,0 +1,114 @@
+import gzip
+import hashlib
+import json
+import math
+import os
+from typing import Any, Dict, Optional, Set, Tuple
+
+try:
+    import orjson
+except ImportError:  # Dependência opcional: sem ela é usado o módulo json da biblioteca padrão
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # Dependência opcional: apenas a codificação br fica indisponível
+    brotli = None
+
+# Codificações pré calculadas, em ordem de preferência
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+# Corpos pré calculados são comprimidos uma única vez, então usam o nível máximo
+GZIP_LEVEL = int(os.getenv("SISEP_PRECOMPRESS_GZIP_LEVEL", "9"))
+BROTLI_QUALITY = int(os.getenv("SISEP_PRECOMPRESS_BROTLI_QUALITY", "11"))
+
+
+def _nan_to_null(value: Any) -> Any:
+    """Troca NaN por None em listas e dicionários (JSON não representa NaN)"""
+    if isinstance(value, float):
+        return None if math.isnan(value) else value
+    if isinstance(value, dict):
+        return {key: _nan_to_null(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_nan_to_null(item) for item in value]
+    return value
+
+
+def dumps(content: Any) -> bytes:
+    """Serializa em JSON compacto (orjson, se instalado); NaN (ex: Q no fluxo DC) vira null"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    try:
+        return json.dumps(content, separators=(',', ':'), allow_nan=False).encode('utf-8')
+    except ValueError:
+        # Só quando há NaN o conteúdo é percorrido para trocá-los por null
+        return json.dumps(_nan_to_null(content), separators=(',', ':')).encode('utf-8')
+
+
+def compress(content: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> Set[str]:
+    """Codificações aceitas pelo cliente (cabeçalho Accept-Encoding, ignorando q=0)"""
+    accepted = set()
+    for item in (accept_encoding or '').lower().split(','):
+        name, _, params = item.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if name:
+            accepted.add(name.strip())
+    return accepted
+
+
+class EncodedBody:
+    """Corpo de resposta já serializado, com ETag forte e versões comprimidas pré calculadas
+
+    Cada codificação é uma representação própria, com ETag própria (sufixo
+    ``-gzip``/``-br``); versões comprimidas que não ficam menores são descartadas.
+    """
+
+    def __init__(self, content: bytes, media_type: str):
+        self.content = content
+        self.media_type = media_type
+        self._tag = hashlib.sha256(content).hexdigest()[:32]
+        self._variants: Dict[str, bytes] = {}
+        for encoding in ENCODINGS:
+            compressed = compress(content, encoding)
+            if len(compressed) < len(content):
+                self._variants[encoding] = compressed
+
+    def etag(self, encoding: Optional[str] = None) -> str:
+        return f'"{self._tag}-{encoding}"' if encoding else f'"{self._tag}"'
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Optional[str]:
+        """Codificação da versão que o cliente recebe (None: sem compressão)"""
+        accepted = accepted_encodings(accept_encoding)
+        for encoding in ENCODINGS:
+            if encoding in self._variants and (encoding in accepted or '*' in accepted):
+                return encoding
+        return None
+
+    def select(self, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """Versão do corpo para o Accept-Encoding do cliente e a codificação escolhida"""
+        encoding = self.negotiate(accept_encoding)
+        return (self._variants[encoding] if encoding else self.content), encoding
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Indica se o cabeçalho If-None-Match contém alguma ETag deste corpo (comparação fraca)"""
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+        if '*' in tags:
+            return True
+        return any(self.etag(encoding) in tags for encoding in (None, *self._variants))
+
+    def size(self) -> int:
+        return len(self.content) + sum(len(variant) for variant in self._variants.values())
@@ -0,0 +1,208 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+from app.models.job_models import JobInfo
+
+# Estados finais: o job não muda mais e expira após o TTL
+FINISHED = ('done', 'failed', 'cancelled')
+
+
+class JobQueueFullError(RuntimeError):
+    """Limite de jobs guardados atingido: a requisição deve ser recusada (HTTP 503)"""
+
+
+class Job:
+    """Simulação executada em segundo plano, com progresso e resultado consultáveis"""
+
+    def __init__(self, kind: str, source: str, work: Callable[["Job"], Awaitable[Any]]):
+        self.job_id = uuid.uuid4().hex
+        self.kind = kind
+        self.source = source
+        self.status = 'queued'
+        self.progress = 0.0
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.expires_at: Optional[float] = None
+        self.detail: Optional[str] = None
+        self.result: Any = None
+        self.work = work
+        self.task: Optional[asyncio.Task] = None
+        self.version = 0  # Incrementada a cada mudança de estado ou progresso
+        self._waiters: List[asyncio.Future] = []
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def set_progress(self, progress: float):
+        self.progress = min(max(progress, 0.0), 1.0)
+        self.notify()
+
+    def notify(self):
+        """Acorda quem aguarda mudanças do job (eventos SSE)"""
+        self.version += 1
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def wait_change(self, seen_version: int):
+        """Aguarda uma mudança posterior à versão já vista (retorna logo se ela já ocorreu)
+
+        Uma espera interrompida (tempo limite ou cancelamento) retira sua
+        future da lista, que assim não cresce em conexões longas.
+        """
+        if self.version != seen_version:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def info(self) -> JobInfo:
+        return JobInfo(
+            job_id=self.job_id, kind=self.kind, source=self.source, status=self.status,
+            progress=self.progress, created_at=self.created_at, started_at=self.started_at,
+            finished_at=self.finished_at, expires_at=self.expires_at, detail=self.detail,
+        )
+
+
+class JobQueue:
+    """Fila de jobs com número limitado de execuções simultâneas e expiração dos resultados
+
+    Os jobs rodam como tasks do event loop; cada um aguarda o pool de
+    simulações, então ``max_running`` limita quantas simulações de jobs
+    disputam o pool com as requisições interativas. Jobs concluídos ficam
+    disponíveis por ``ttl`` segundos.
+    """
+
+    # Configuração padrão (pode ser alterada por variáveis de ambiente)
+    MAX_RUNNING = int(os.getenv("SISEP_JOB_WORKERS", "2"))
+    MAX_JOBS = int(os.getenv("SISEP_JOB_MAX", "256"))         # Jobs guardados (na fila, rodando ou concluídos)
+    TTL = float(os.getenv("SISEP_JOB_TTL", "3600"))           # Segundos em que o resultado fica disponível
+    TIMEOUT = float(os.getenv("SISEP_JOB_TIMEOUT", "3600"))   # Tempo limite de cada simulação de um job
+
+    def __init__(self, max_running: Optional[int] = None, max_jobs: Optional[int] = None,
+                 ttl: Optional[float] = None):
+        self.max_running = max_running or self.MAX_RUNNING
+        self.max_jobs = max_jobs or self.MAX_JOBS
+        self.ttl = ttl if ttl is not None else self.TTL
+        self._jobs: Dict[str, Job] = {}
+        self._queued: Deque[Job] = deque()
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.expired = 0
+        self.rejected = 0
+
+    def submit(self, kind: str, source: str, work: Callable[[Job], Awaitable[Any]]) -> Job:
+        """Enfileira um job; ``work`` recebe o job (para informar o progresso) e retorna o resultado"""
+        self._purge()
+        if len(self._jobs) >= self.max_jobs:
+            self.rejected += 1
+            raise JobQueueFullError(f"Limite de {self.max_jobs} jobs atingido; tente novamente mais tarde")
+        job = Job(kind, source, work)
+        self._jobs[job.job_id] = job
+        self._queued.append(job)
+        self._start_next()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Retorna o job ou None se não existir ou tiver expirado"""
+        self._purge()
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancela um job na fila ou em execução; jobs já concluídos são removidos"""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        if job.finished:
+            del self._jobs[job_id]
+        elif job.status == 'queued':
+            self._queued.remove(job)
+            self._finish(job, 'cancelled')
+        elif job.task is not None:
+            # A simulação já enviada ao pool termina, mas seu resultado é descartado
+            job.task.cancel()
+        return job
+
+    def shutdown(self):
+        """Cancela os jobs pendentes (encerramento da aplicação)"""
+        for job in list(self._jobs.values()):
+            if not job.finished:
+                self.cancel(job.job_id)
+
+    def _start_next(self):
+        while self._queued and self.running < self.max_running:
+            job = self._queued.popleft()
+            self.running += 1
+            job.task = asyncio.get_running_loop().create_task(self._run(job))
+            job.task.add_done_callback(lambda _, job=job: self._task_done(job))
+
+    async def _run(self, job: Job):
+        job.status = 'running'
+        job.started_at = time.time()
+        job.notify()
+        try:
+            result = await job.work(job)
+        except Exception as e:
+            job.detail = str(e)
+            self._finish(job, 'failed')
+        else:
+            job.result = result
+            job.progress = 1.0
+            self._finish(job, 'done')
+
+    def _task_done(self, job: Job):
+        """Libera a vaga do job (mesmo se cancelado antes de começar) e inicia o próximo da fila"""
+        if not job.finished:
+            self._finish(job, 'cancelled')
+        self.running -= 1
+        self._start_next()
+
+    def _finish(self, job: Job, status: str):
+        job.status = status
+        job.finished_at = time.time()
+        job.expires_at = job.finished_at + self.ttl
+        job.work = None  # Libera o caso enviado (ppc) referenciado pela função do job
+        if status == 'done':
+            self.completed += 1
+        elif status == 'failed':
+            self.failed += 1
+        else:
+            self.cancelled += 1
+        job.notify()
+
+    def _purge(self):
+        """Remove os jobs concluídos cujo resultado expirou"""
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.expires_at is not None and job.expires_at < now]
+        for job_id in expired:
+            del self._jobs[job_id]
+        self.expired += len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        self._purge()
+        return {
+            "jobs": len(self._jobs),
+            "queued": len(self._queued),
+            "running": self.running,
+            "max_running": self.max_running,
+            "max_jobs": self.max_jobs,
+            "ttl": self.ttl,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "expired": self.expired,
+            "rejected": self.rejected,
+        }
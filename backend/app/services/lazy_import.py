@@ -0,0 +1,44 @@
+import importlib
+import time
+from typing import Tuple
+
+# Módulos pesados do solver, importados apenas quando usados (ou no aquecimento)
+SOLVER_MODULES: Tuple[str, ...] = (
+    "pandas",
+    "pandapower",
+    "pandapower.converter.pypower",
+    "pandapower.pypower.makePTDF",
+    "pandapower.pypower.makeLODF",
+)
+
+
+class LazyModule:
+    """Módulo importado apenas no primeiro acesso a um de seus atributos
+
+    Evita que importar a aplicação (testes, inicialização do container)
+    carregue pandapower, pandas e scipy antes da primeira simulação.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "carregado" if self._module is not None else "não carregado"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def import_solver_modules() -> float:
+    """Importa todos os módulos do solver e retorna o tempo gasto (s)"""
+    start = time.perf_counter()
+    for name in SOLVER_MODULES:
+        importlib.import_module(name)
+    return time.perf_counter() - start
@@ -0,0 +1,201 @@
+import re
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+
+# baseKV usado quando o caso informa baseKV = 0 (coluna 10 de mpc.bus)
+DEFAULT_BASE_KV = 230.0
+
+# Índices das colunas (0-based) usados na preparação do ppc
+BUS_I, BASE_KV = 0, 9
+F_BUS, T_BUS, TAP = 0, 1, 8
+GEN_BUS = 0
+
+# Atributos obrigatórios de um caso MATPOWER
+REQUIRED_MATRICES = ('bus', 'gen', 'branch')
+
+# Atributos em cell array ({...}) que são lidos como listas de nomes
+NAME_ATTRIBUTES = ('bus_name', 'branch_name', 'gen_name')
+
+_ASSIGNMENT = re.compile(r"^\s*mpc\.(?P<name>\w+)\s*=\s*(?P<value>.*)$")
+_TOKEN_SEPARATOR = re.compile(r"[\s,]+")
+
+
+def _strip_comment(line: str) -> str:
+    """Remove comentários (%) que não estejam dentro de strings entre aspas"""
+    if '%' not in line:
+        return line
+    in_quotes = False
+    for i, char in enumerate(line):
+        if char == "'":
+            in_quotes = not in_quotes
+        elif char == '%' and not in_quotes:
+            return line[:i]
+    return line
+
+
+def _scalar(value: str):
+    """Converte o valor de uma atribuição escalar (número ou string)"""
+    value = value.strip().rstrip(';').strip()
+    if value[:1] in ("'", '"'):
+        return value.strip("'\"")
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+class MatpowerParser:
+    """Leitor incremental de casos MATPOWER (.m) para o formato ppc do pandapower
+
+    O texto é processado linha a linha, sem arquivos temporários: as matrizes
+    (bus, gen, branch, gencost, ...) viram arrays NumPy e os valores
+    escalares (version, baseMVA) são convertidos diretamente. Os valores de
+    cada matriz são acumulados em um buffer contínuo de float64, que vira o
+    array final sem cópia.
+    """
+
+    def __init__(self):
+        self.ppc: Dict[str, Any] = {}
+        self._section: Optional[str] = None  # Matriz ou cell array em leitura
+        self._closing: str = ']'
+        self._rows: List[Any] = []           # Linhas de um cell array (nomes)
+        self._values = array('d')            # Valores da matriz em leitura, linha após linha
+        self._columns: Optional[int] = None
+        self._line_number = 0
+
+    def feed_lines(self, lines: Iterable[str]):
+        """Processa uma sequência de linhas do arquivo"""
+        for line in lines:
+            self.feed_line(line)
+
+    def feed_line(self, line: str):
+        """Processa uma linha do arquivo"""
+        self._line_number += 1
+        line = _strip_comment(line).strip()
+        if not line:
+            return
+
+        if self._section is not None:
+            self._parse_section_content(line)
+            return
+
+        match = _ASSIGNMENT.match(line)
+        if match is None:
+            # Cabeçalho da função e demais linhas sem dados do caso
+            return
+
+        name, value = match.group('name'), match.group('value').strip()
+        if value.startswith('['):
+            self._open_section(name, ']')
+            self._parse_section_content(value[1:])
+        elif value.startswith('{'):
+            self._open_section(name, '}')
+            self._parse_section_content(value[1:])
+        elif value:
+            try:
+                self.ppc[name] = _scalar(value)
+            except ValueError:
+                raise ValueError(f"Valor inválido para mpc.{name} na linha {self._line_number}: {value}")
+
+    def _open_section(self, name: str, closing: str):
+        self._section = name
+        self._closing = closing
+        self._rows = []
+        self._values = array('d')
+        self._columns = None
+
+    def _parse_section_content(self, content: str):
+        """Lê as linhas de uma matriz ou cell array até o fechamento (]; ou };)"""
+        closed = self._closing in content
+        if closed:
+            content = content[:content.index(self._closing)]
+
+        # Linhas da matriz são separadas por ';' ou por quebra de linha
+        for row in content.split(';'):
+            row = row.strip()
+            if not row:
+                continue
+            if self._closing == '}':
+                self._rows.append(row.strip("'\""))
+            else:
+                self._values.extend(self._parse_row(row))
+
+        if closed:
+            self._close_section()
+
+    def _parse_row(self, row: str) -> List[float]:
+        try:
+            values = [float(token) for token in _TOKEN_SEPARATOR.split(row) if token]
+        except ValueError:
+            raise ValueError(f"Valor não numérico em mpc.{self._section} na linha {self._line_number}: {row}")
+
+        if self._columns is None:
+            self._columns = len(values)
+        elif len(values) != self._columns:
+            raise ValueError(
+                f"Número de colunas inconsistente em mpc.{self._section} na linha {self._line_number}: "
+                f"esperado {self._columns}, encontrado {len(values)}"
+            )
+        return values
+
+    def _close_section(self):
+        name, rows = self._section, self._rows
+        if self._closing == '}':
+            if name in NAME_ATTRIBUTES:
+                self.ppc[name] = np.array(rows)
+        elif self._columns:
+            # O array usa o próprio buffer acumulado (sem cópia dos valores)
+            values = np.frombuffer(self._values, dtype=float)
+            self.ppc[name] = values.reshape(len(values) // self._columns, self._columns)
+        else:
+            self.ppc[name] = np.zeros((0, 0))
+        self._section = None
+        self._rows = []
+        self._values = array('d')
+        self._columns = None
+
+    def result(self, fix_basekv: bool = True) -> Dict[str, Any]:
+        """Valida o caso lido e retorna o ppc pronto para o from_ppc (índices 0-based)"""
+        if self._section is not None:
+            raise ValueError(f"Matriz mpc.{self._section} não foi fechada")
+
+        missing = [name for name in REQUIRED_MATRICES if name not in self.ppc or self.ppc[name].size == 0]
+        if missing:
+            raise ValueError(f"Caso MATPOWER sem os dados obrigatórios: {', '.join('mpc.' + m for m in missing)}")
+        if 'baseMVA' not in self.ppc:
+            raise ValueError("Caso MATPOWER sem mpc.baseMVA")
+        self.ppc.setdefault('version', '2')
+
+        return prepare_ppc(self.ppc, fix_basekv=fix_basekv)
+
+
+def prepare_ppc(ppc: Dict[str, Any], fix_basekv: bool = True) -> Dict[str, Any]:
+    """Ajusta o ppc lido do arquivo da mesma forma que o from_mpc do pandapower
+
+    - índices de barras passam a ser 0-based (Python);
+    - tap = 0 (linhas sem transformador) passa a ser 1;
+    - baseKV = 0 é corrigido para DEFAULT_BASE_KV.
+    """
+    bus, gen, branch = ppc['bus'], ppc['gen'], ppc['branch']
+    bus[:, BUS_I] -= 1
+    branch[:, [F_BUS, T_BUS]] -= 1
+    gen[:, GEN_BUS] -= 1
+    branch[branch[:, TAP] == 0, TAP] = 1
+
+    if fix_basekv:
+        fix_zero_basekv(bus)
+    return ppc
+
+
+def fix_zero_basekv(bus: np.ndarray) -> np.ndarray:
+    """Substitui baseKV = 0 por DEFAULT_BASE_KV na matriz de barras (no próprio array)"""
+    if bus.shape[1] > BASE_KV:
+        bus[bus[:, BASE_KV] == 0, BASE_KV] = DEFAULT_BASE_KV
+    return bus
+
+
+def parse_matpower(content: str, fix_basekv: bool = True) -> Dict[str, Any]:
+    """Converte o texto de um caso MATPOWER diretamente no dicionário ppc"""
+    parser = MatpowerParser()
+    parser.feed_lines(content.splitlines())
+    return parser.result(fix_basekv=fix_basekv)
+
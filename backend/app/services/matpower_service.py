@@ -1,12 +1,93 @@
-import pandapower as pp
-from pandapower.converter.matpower import from_mpc
-from app.models.power_system_results import PowerSystemResult
+from __future__ import annotations
+
+import copy
+import logging
+import time
+import warnings
+import numpy as np
+from app.models.power_system_results import (
+    BusResult, LineResult, LoadResult,
+    GeneratorResult, ExtGridResult, PowerSystemResult, SolverInfo
+)
+from app.models.catalog_models import CompiledCase
+from app.models.contingency_models import ContingencyAnalysis
+from app.models.scenario_models import ScenarioDelta
+from app.models.selection_models import ResultSelection
+from app.models.solver_models import SolverOptions
+from app.services.cache import NetworkCache, ResultCache, WarmStartStore, content_hash, topology_key
+from app.services.cache_backends import create_backend
+from app.services.matpower_parser import parse_matpower
+from app.services import compiled_case, contingency_service, metrics, timeseries_service
+from app.services.result_projection import (
+    TABLE_FIELDS, TOTALS, mark_reused, project_columns, required_fields, selected_tables, selection_key
+)
+from app.services.lazy_import import LazyModule, import_solver_modules
+from app.services.solver_backend import resolve_solver, run_power_flow, solver_key
 import os
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# pandapower e pandas só são importados na primeira simulação (ou no aquecimento)
+pd = LazyModule("pandas")
+pp = LazyModule("pandapower")
+pypower_converter = LazyModule("pandapower.converter.pypower")
+
+# Caso mínimo usado para aquecer o solver sem depender dos arquivos de data/
+WARM_UP_CASE = """function mpc = warmup
+mpc.version = '2';
+mpc.baseMVA = 100;
+mpc.bus = [
+	1	3	0	0	0	0	1	1	0	230	1	1.1	0.9;
+	2	1	50	10	0	0	1	1	0	230	1	1.1	0.9;
+	3	2	30	5	0	0	1	1	0	230	1	1.1	0.9;
+];
+mpc.gen = [
+	1	0	0	100	-100	1	100	1	200	0;
+	3	40	0	100	-100	1	100	1	100	0;
+];
+mpc.branch = [
+	1	2	0.01	0.05	0.02	0	0	0	0	0	1	-360	360;
+	2	3	0.01	0.05	0.02	0	0	0	0	0	1	-360	360;
+	1	3	0.01	0.05	0.02	0	0	0	0	0	1	-360	360;
+];
+"""
+
+def enable_debug_logging():
+    """Ativa os logs de debug do backend (logger "app"), com saída no console se não houver handler"""
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(logging.DEBUG)
+    if not app_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("DEBUG: %(name)s: %(message)s"))
+        app_logger.addHandler(handler)
 
 class MatpowerService:
-    # Constante para controlar prints de debug
-    DEBUG_ENABLED = False  # Altere para False para desabilitar prints de debug
+    # Logs de debug (também ativados por SISEP_DEBUG=1 ou pelo nível do logger "app")
+    DEBUG_ENABLED = os.getenv("SISEP_DEBUG", "0") == "1"
+
+    # Quantidade máxima de redes convertidas mantidas em memória
+    NET_CACHE_MAX_SIZE = int(os.getenv("SISEP_NET_CACHE_MAX_SIZE", "32"))
+    # Validade (s) das redes gravadas no backend compartilhado
+    NET_CACHE_TTL = float(os.getenv("SISEP_NET_CACHE_TTL", "86400"))
+
+    # Backend compartilhado entre workers para redes, resultados e sessões
+    # (memory, file:<diretório>, sqlite:<arquivo> ou redis://...); vazio: só em memória
+    CACHE_BACKEND = os.getenv("SISEP_CACHE_BACKEND") or None
+
+    # Cache de resultados dos arquivos enviados (tamanho, validade em segundos
+    # e diretório opcional para persistência em disco, sem backend compartilhado)
+    RESULT_CACHE_MAX_SIZE = int(os.getenv("SISEP_RESULT_CACHE_MAX_SIZE", "256"))
+    RESULT_CACHE_TTL = float(os.getenv("SISEP_RESULT_CACHE_TTL", "3600"))
+    RESULT_CACHE_DIR = os.getenv("SISEP_RESULT_CACHE_DIR") or None
+
+    # Modelos .m compilados em arrays .npz mapeados em memória (regenerados quando o .m muda)
+    COMPILED_CASES = os.getenv("SISEP_COMPILED_CASES", "1") != "0"
+    COMPILED_DIR = os.getenv("SISEP_COMPILED_DIR") or None
+
+    # Partida a quente: reaproveita a última solução da mesma topologia
+    WARM_START_ENABLED = os.getenv("SISEP_WARM_START", "1") != "0"
+    WARM_START_MAX_SIZE = int(os.getenv("SISEP_WARM_START_MAX_SIZE", "64"))
     
     def __init__(self):
         # Caminho para o diretório data no backend
@@ -15,392 +96,691 @@ class MatpowerService:
         # Garantir que o diretório existe
         if not os.path.exists(self.data_dir):
             raise ValueError(f"Diretório de dados não encontrado: {self.data_dir}")
-    
-    def _debug_print(self, message: str):
-        """Método auxiliar para prints de debug condicionais"""
+
         if self.DEBUG_ENABLED:
-            print(f"DEBUG: {message}")
+            enable_debug_logging()
+
+        # Solver aquecido: módulos importados e um fluxo de potência já executado
+        self.solver_warm = False
+
+        # Backend compartilhado (cada worker ou processo do pool abre a sua conexão)
+        self.cache_backend = create_backend(self.CACHE_BACKEND)
+
+        # Cache das redes convertidas a partir dos modelos pré carregados
+        self.net_cache = NetworkCache(max_size=self.NET_CACHE_MAX_SIZE, backend=self.cache_backend,
+                                      ttl=self.NET_CACHE_TTL)
+
+        # Cache dos resultados das simulações de arquivos enviados
+        self.result_cache = ResultCache(
+            max_size=self.RESULT_CACHE_MAX_SIZE,
+            ttl=self.RESULT_CACHE_TTL,
+            disk_dir=self.RESULT_CACHE_DIR,
+            backend=self.cache_backend,
+        )
+
+        # Tensões da última solução convergida de cada topologia
+        self.warm_start = WarmStartStore(max_size=self.WARM_START_MAX_SIZE)
     
+    def warm_up(self) -> float:
+        """Importa os módulos do solver e resolve um caso mínimo; retorna o tempo gasto (s)"""
+        start = time.perf_counter()
+        import_solver_modules()
+        self._run_simulation(self._net_from_string(WARM_UP_CASE))
+        elapsed = time.perf_counter() - start
+        logger.info("Solver aquecido em %.2f s", elapsed)
+        return elapsed
+
     def list_available_files(self) -> List[str]:
-        """Lista todos os arquivos MATPOWER disponíveis"""
+        """Lista todos os modelos disponíveis: arquivos MATPOWER (.m) e casos compilados (.npz)"""
         try:
             # Verificar se o diretório existe
             if not os.path.exists(self.data_dir):
                 raise ValueError(f"Diretório de dados não encontrado: {self.data_dir}")
                 
-            # Listar apenas arquivos .m
-            matpower_files = [f for f in os.listdir(self.data_dir) if f.endswith('.m')]
+            # Listar apenas arquivos .m e casos compilados .npz
+            matpower_files = [f for f in os.listdir(self.data_dir) if f.endswith(compiled_case.CASE_EXTENSIONS)]
             
             # Verificar se existem arquivos
             if not matpower_files:
-                raise ValueError("Nenhum arquivo MATPOWER (.m) encontrado no diretório de dados")
+                raise ValueError("Nenhum arquivo MATPOWER (.m ou .npz) encontrado no diretório de dados")
                 
-            return matpower_files
+            return sorted(matpower_files)
             
         except Exception as e:
             raise ValueError(f"Erro ao listar arquivos MATPOWER: {str(e)}")
 
-    def _fix_basekv_in_matpower_content(self, content: str) -> str:
-        """Corrige baseKV zerado diretamente no conteúdo do arquivo MATPOWER"""
-        import re
-        
-        lines = content.split('\n')
-        modified_lines = []
-        in_bus_section = False
-        
-        for line in lines:
-            # Detectar início da seção de barras
-            if 'mpc.bus' in line and '=' in line:
-                in_bus_section = True
-                modified_lines.append(line)
-                continue
-            
-            # Detectar fim da seção de barras (linha com ];)
-            if in_bus_section and '];' in line:
-                in_bus_section = False
-                modified_lines.append(line)
-                continue
-            
-            # Se estamos na seção de barras, processar a linha
-            if in_bus_section and line.strip() and not line.strip().startswith('%'):
-                # Remover tabs e espaços múltiplos, dividir por tabs ou espaços
-                parts = re.split(r'[\t\s]+', line.strip())
-                
-                # Verificar se temos dados de barra (começa com número)
-                if parts and parts[0].replace('.', '').replace('-', '').isdigit():
-                    # Verificar se temos pelo menos 10 colunas (baseKV é a coluna 10)
-                    if len(parts) >= 10:
-                        # Remover ponto-e-vírgula se existir
-                        if parts[-1].endswith(';'):
-                            parts[-1] = parts[-1][:-1]
-                            has_semicolon = True
-                        else:
-                            has_semicolon = False
-                        
-                        # Coluna 10 é índice 9 (0-based)
-                        basekv_value = parts[9]
-                        if basekv_value == '0' or basekv_value == '0.0':
-                            self._debug_print(f"Corrigindo baseKV=0 na barra {parts[0]} para 230 kV")
-                            parts[9] = '230'
-                        
-                        # Reconstruir a linha com tabs
-                        reconstructed = '\t' + '\t'.join(parts)
-                        if has_semicolon:
-                            reconstructed += ';'
-                        modified_lines.append(reconstructed)
-                        continue
-            
-            # Linha não modificada
-            modified_lines.append(line)
-        
-        return '\n'.join(modified_lines)
+    def cache_stats(self) -> Dict[str, Any]:
+        """Retorna as estatísticas dos caches do serviço"""
+        stats = {
+            "networks": self.net_cache.stats(),
+            "results": self.result_cache.stats(),
+            "warm_start": self.warm_start.stats(),
+        }
+        if self.cache_backend is not None:
+            stats["backend"] = self.cache_backend.stats()
+        return stats
 
-    def simulate_from_filename(self, filename: str) -> PowerSystemResult:
+    def simulate_from_filename(self, filename: str, solver: Optional[SolverOptions] = None) -> PowerSystemResult:
         """Simula um sistema a partir de um arquivo MATPOWER"""
-        import tempfile
-        
-        temp_file = None
+        return self.result_from_columns(self.simulate_columns_from_filename(filename, solver=solver))
+
+    def simulate_columns_from_filename(self, filename: str, selection: Optional[ResultSelection] = None,
+                                       solver: Optional[SolverOptions] = None) -> Dict[str, Any]:
+        """Simula um sistema a partir de um arquivo MATPOWER, retornando os resultados por coluna
+
+        Com ``selection``, apenas as tabelas e campos pedidos são extraídos da
+        rede; ``solver`` substitui as opções padrão do fluxo de potência.
+        """
+        metrics.annotate(case=filename)
         try:
-            if not filename.endswith('.m'):
-                raise ValueError(f"Modelo inválido: {filename}. Deve ter extensão .m")
+            net = self._load_net_from_file(self.case_path(filename), filename)
+            return self._run_simulation_columns(net, selection, solver)
+            
+        except Exception as e:
+            raise ValueError(f"Erro ao simular a partir do modelo {filename}: {str(e)}")
 
-            file_path = os.path.join(self.data_dir, filename)
-            if not os.path.exists(file_path):
-                raise ValueError(f"Modelo não encontrado: {filename}")
+    def case_path(self, filename: str) -> str:
+        """Valida o nome de um modelo pré carregado e retorna seu caminho"""
+        if not filename.endswith(compiled_case.CASE_EXTENSIONS):
+            raise ValueError(f"Modelo inválido: {filename}. Deve ter extensão .m ou .npz")
 
-            if not os.path.isfile(file_path):
-                raise ValueError(f"O caminho {filename} não é um modelo válido")
+        file_path = os.path.join(self.data_dir, filename)
+        if os.path.basename(filename) != filename or not os.path.exists(file_path):
+            raise ValueError(f"Modelo não encontrado: {filename}")
+
+        if not os.path.isfile(file_path):
+            raise ValueError(f"O caminho {filename} não é um modelo válido")
+        return file_path
+
+    def load_case_net(self, filename: Optional[str] = None, matpower_string: Optional[str] = None,
+                      ppc: Optional[Dict[str, Any]] = None) -> pp.pandapowerNet:
+        """Cria a rede de um modelo pré carregado, de uma string MATPOWER ou de um ppc já lido, sem simular"""
+        if filename is not None:
+            return self._load_net_from_file(self.case_path(filename), filename)
+        try:
+            if ppc is not None:
+                return self._net_from_ppc(ppc)
+            return self._net_from_string(matpower_string)
+        except Exception as e:
+            raise ValueError(f"Erro ao processar o arquivo MATPOWER: {str(e)}")
 
-            # Ler e corrigir o arquivo
+    def _load_net_from_file(self, file_path: str, filename: str) -> pp.pandapowerNet:
+        """Retorna uma cópia da rede do modelo, convertendo-o apenas se não estiver em cache"""
+        signature = NetworkCache.file_signature(file_path)
+        net = self.net_cache.get(file_path, signature)
+        if net is not None:
+            logger.debug("Rede do modelo %s obtida do cache", filename)
+            return net
+
+        net = self._net_from_ppc(self._load_ppc(file_path, filename))
+        self.net_cache.put(file_path, signature, net)
+        logger.debug("Rede do modelo %s convertida e armazenada em cache", filename)
+        return net
+
+    @property
+    def compiled_dir(self) -> str:
+        """Diretório dos modelos compilados (padrão: ``compiled`` dentro do diretório de dados)"""
+        return self.COMPILED_DIR or os.path.join(self.data_dir, 'compiled')
+
+    def compiled_path(self, filename: str) -> str:
+        """Caminho do caso compilado de um modelo .m"""
+        return os.path.join(self.compiled_dir, os.path.splitext(filename)[0] + compiled_case.EXTENSION)
+
+    def _load_ppc(self, file_path: str, filename: str) -> Dict[str, Any]:
+        """Matrizes do modelo: do caso compilado (mapeado em memória) ou lidas do texto
+
+        Um .m sem caso compilado, ou alterado depois da compilação, é lido do
+        texto e compilado novamente para as próximas cargas.
+        """
+        try:
+            if filename.endswith(compiled_case.EXTENSION):
+                with metrics.stage("read"):
+                    return compiled_case.load_compiled(file_path)[0]
+
+            signature = NetworkCache.file_signature(file_path)
+            compiled = self.compiled_path(filename)
+            if self.COMPILED_CASES and compiled_case.is_current(compiled, signature):
+                with metrics.stage("read"):
+                    return compiled_case.load_compiled(compiled)[0]
+
+            with metrics.stage("read"), open(file_path, 'r') as f:
+                content = f.read()
+        except Exception as e:
+            raise ValueError(f"Erro ao ler o modelo {filename}: {str(e)}")
+
+        with metrics.stage("parse"):
+            ppc = parse_matpower(content)
+        if self.COMPILED_CASES:
+            self._write_compiled(compiled, ppc, filename, signature)
+        return ppc
+
+    def _write_compiled(self, path: str, ppc: Dict[str, Any], filename: str, signature: Tuple[int, int]) -> Optional[int]:
+        """Grava o caso compilado; uma falha (ex: diretório sem permissão) só é registrada no log"""
+        try:
+            size = compiled_case.write_compiled(path, ppc, source=filename, source_signature=signature)
+        except (OSError, ValueError) as e:
+            logger.warning("Falha ao compilar o modelo %s: %s", filename, e)
+            return None
+        logger.debug("Modelo %s compilado em %s", filename, path)
+        return size
+
+    def compile_case(self, filename: str, force: bool = False) -> CompiledCase:
+        """Compila um modelo .m (se ausente, desatualizado ou com ``force``)"""
+        if not filename.endswith('.m'):
+            raise ValueError(f"Modelo inválido: {filename}. Apenas modelos .m são compilados")
+        file_path = self.case_path(filename)
+
+        signature = NetworkCache.file_signature(file_path)
+        compiled = self.compiled_path(filename)
+        regenerated = force or not compiled_case.is_current(compiled, signature)
+        if regenerated:
             try:
                 with open(file_path, 'r') as f:
-                    content = f.read()
-                
-                # Corrigir baseKV no conteúdo
-                fixed_content = self._fix_basekv_in_matpower_content(content)
-                
-                # Salvar em arquivo temporário
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.m', delete=False) as tmp:
-                    tmp.write(fixed_content)
-                    temp_file = tmp.name
-                
+                    ppc = parse_matpower(f.read())
+                compiled_case.write_compiled(compiled, ppc, source=filename, source_signature=signature)
             except Exception as e:
-                raise ValueError(f"Erro ao ler/processar o modelo {filename}: {str(e)}")
-            
-            # Converter do arquivo temporário corrigido
-            net = from_mpc(temp_file)
-            return self._run_simulation(net)
-            
-        except Exception as e:
-            raise ValueError(f"Erro ao simular a partir do modelo {filename}: {str(e)}")
-        finally:
-            # Limpar arquivo temporário
-            if temp_file and os.path.exists(temp_file):
-                try:
-                    os.unlink(temp_file)
-                except:
-                    pass
+                raise ValueError(f"Erro ao compilar o modelo {filename}: {str(e)}")
+
+        return CompiledCase(
+            filename=filename,
+            compiled=os.path.relpath(compiled, self.data_dir),
+            arrays=compiled_case.read_meta(compiled)['arrays'],
+            size_bytes=os.path.getsize(compiled),
+            regenerated=regenerated,
+        )
 
     def simulate_from_string(self, matpower_string: str) -> PowerSystemResult:
         """Simula um sistema a partir de uma string MATPOWER"""
-        import tempfile
-        import warnings
-        
+        return self.simulate_from_string_cached(matpower_string)[0]
+
+    def simulate_from_string_cached(self, matpower_string: str, key: Optional[str] = None) -> Tuple[PowerSystemResult, bool]:
+        """Simula a partir de uma string MATPOWER reaproveitando resultados anteriores
+
+        Args:
+            matpower_string (str): Conteúdo do arquivo MATPOWER
+            key (Optional[str]): Hash do conteúdo, se já calculado
+
+        Returns:
+            Tuple[PowerSystemResult, bool]: Resultado e se ele veio do cache
+        """
+        columns, cache_hit = self.simulate_columns_from_string(matpower_string, key)
+        return self.result_from_columns(columns), cache_hit
+
+    def simulate_from_ppc_cached(self, ppc: Dict[str, Any], key: str,
+                                 solver: Optional[SolverOptions] = None) -> Tuple[PowerSystemResult, bool]:
+        """Simula um caso já lido (ppc) reaproveitando resultados anteriores"""
+        columns, cache_hit = self.simulate_columns_from_ppc(ppc, key, solver=solver)
+        return self.result_from_columns(columns), cache_hit
+
+    def simulate_columns_from_ppc(self, ppc: Dict[str, Any], key: str, selection: Optional[ResultSelection] = None,
+                                  solver: Optional[SolverOptions] = None) -> Tuple[Dict[str, Any], bool]:
+        """Simula um caso lido em blocos do upload (ppc e hash do conteúdo), retornando os resultados por coluna"""
+        metrics.annotate(case="upload")
+        return self._simulate_cached(key, selection, lambda: self._net_from_ppc(ppc), solver)
+
+    def simulate_columns_from_string(self, matpower_string: str, key: Optional[str] = None,
+                                     selection: Optional[ResultSelection] = None,
+                                     solver: Optional[SolverOptions] = None) -> Tuple[Dict[str, Any], bool]:
+        """Simula a partir de uma string MATPOWER, retornando os resultados por coluna
+
+        O cache de resultados guarda o formato colunar, de onde os demais
+        formatos de resposta são montados. Resultados projetados (``selection``)
+        ficam em entradas próprias do cache; se o resultado completo já estiver
+        em cache, a projeção é feita sobre ele. Opções de solver da requisição
+        também fazem parte da chave.
+
+        Returns:
+            Tuple[Dict[str, Any], bool]: Resultados por coluna e se vieram do cache
+        """
+        metrics.annotate(case="upload")
+        if key is None:
+            key = content_hash(matpower_string)
+        return self._simulate_cached(key, selection, lambda: self._net_from_string(matpower_string), solver)
+
+    def _simulate_cached(self, key: str, selection: Optional[ResultSelection], build_net: Callable[[], Any],
+                         solver: Optional[SolverOptions] = None) -> Tuple[Dict[str, Any], bool]:
+        """Consulta o cache de resultados e, se necessário, monta a rede e a simula
+
+        Resultados do cache saem com ``solver.cached``: iterações e tempo são
+        os da simulação que os gerou.
+        """
+        key = key + solver_key(solver)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            logger.debug("Resultado obtido do cache: %s", key)
+            return mark_reused(project_columns(cached, selection)), True
+        if selection is not None:
+            cached = self.result_cache.get(key + selection_key(selection))
+            if cached is not None:
+                logger.debug("Resultado projetado obtido do cache: %s", key)
+                return mark_reused(cached), True
+
+        try:
+            columns = self._run_simulation_columns(build_net(), selection, solver)
+        except Exception as e:
+            logger.debug("Erro ao criar/simular rede: %s", e)
+            raise ValueError(f"Erro ao processar o arquivo MATPOWER: {str(e)}")
+        self.result_cache.put(key + selection_key(selection), columns)
+        return columns, False
+
+    def _net_from_string(self, matpower_string: str) -> pp.pandapowerNet:
+        """Cria a rede pandapower a partir de uma string MATPOWER, sem arquivos temporários"""
+        # Ler as matrizes do caso já com baseKV zerado corrigido
+        with metrics.stage("parse"):
+            ppc = parse_matpower(matpower_string)
+        return self._net_from_ppc(ppc)
+
+    def _net_from_ppc(self, ppc: Dict[str, Any]) -> pp.pandapowerNet:
+        """Cria a rede pandapower a partir das matrizes do caso (ppc)"""
         # Suprimir warnings específicos do pandas/pandapower
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore", category=FutureWarning, module="pandas")
             warnings.filterwarnings("ignore", category=FutureWarning, module="pandapower")
-            
-            # Corrigir baseKV no conteúdo antes de salvar
-            fixed_content = self._fix_basekv_in_matpower_content(matpower_string)
-            
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.m', delete=False) as tmp:
-                tmp.write(fixed_content)
-                tmp_path = tmp.name
-            
-            try:
-                self._debug_print(f"Criando rede a partir do arquivo: {tmp_path}")
-                net = from_mpc(tmp_path)
-                self._debug_print(f"Rede criada com sucesso. Buses: {len(net.bus)}")
-                return self._run_simulation(net)
-            except Exception as e:
-                self._debug_print(f"Erro ao criar/simular rede: {str(e)}")
-                raise ValueError(f"Erro ao processar o arquivo MATPOWER: {str(e)}")
-            finally:
-                os.unlink(tmp_path)
+
+            with metrics.stage("build_net"):
+                net = pypower_converter.from_ppc(ppc, f_hz=50)
+            logger.debug("Rede criada com sucesso. Buses: %d", len(net.bus))
+            return net
+
+    def simulate_scenario(self, net: pp.pandapowerNet, scenario: ScenarioDelta) -> PowerSystemResult:
+        """Simula um cenário sobre uma cópia da rede base (a rede recebida não é alterada)"""
+        metrics.annotate(case="cenario")
+        net = copy.deepcopy(net)
+        self._apply_scenario(net, scenario)
+        return self._run_simulation(net)
+
+    def simulate_outage(self, net: pp.pandapowerNet, scenario: ScenarioDelta,
+                        seed: Tuple[np.ndarray, np.ndarray]) -> PowerSystemResult:
+        """Simula a saída de um elemento partindo das tensões do caso base (``seed``)
+
+        A solução não é guardada na partida a quente: cada contingência tem
+        uma topologia própria e ocuparia as entradas das requisições interativas.
+        """
+        metrics.annotate(case="contingencia")
+        net = copy.deepcopy(net)
+        self._apply_scenario(net, scenario)
+        return self.result_from_columns(self._run_simulation_columns(net, seed=seed))
+
+    def simulate_session(self, net: pp.pandapowerNet) -> Dict[str, Any]:
+        """Simula a rede de uma sessão no próprio objeto (partindo da solução anterior da topologia)"""
+        metrics.annotate(case="sessao")
+        return self._run_simulation_columns(net)
+
+    def screen_contingencies(self, net: pp.pandapowerNet, loading_limit: float, vm_min: float, vm_max: float,
+                             screening_threshold: float) -> Tuple[ContingencyAnalysis, Tuple[np.ndarray, np.ndarray]]:
+        """Resolve o caso base e seleciona, por triagem DC, as contingências N-1 críticas (com as tensões do caso base)"""
+        try:
+            return contingency_service.screen_contingencies(
+                self, net, loading_limit, vm_min, vm_max, screening_threshold
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Erro na triagem de contingências: {str(e)}")
+
+    def simulate_timeseries(self, net: pp.pandapowerNet, load_profile: Optional[np.ndarray],
+                            gen_profile: Optional[np.ndarray]) -> Dict[str, np.ndarray]:
+        """Simula os passos de perfis de carga/geração na mesma rede, com resultados em arrays NumPy"""
+        try:
+            return timeseries_service.run_timeseries(self, net, load_profile, gen_profile)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Erro na simulação da série temporal: {str(e)}")
+
+    def _apply_scenario(self, net: pp.pandapowerNet, scenario: ScenarioDelta):
+        """Aplica as alterações de um cenário (cargas, geradores e ramos) na rede"""
+        if scenario.load_scaling is not None and len(net.load) > 0:
+            net.load['scaling'] = net.load['scaling'] * scenario.load_scaling
+        if scenario.gen_scaling is not None and len(net.gen) > 0:
+            net.gen['scaling'] = net.gen['scaling'] * scenario.gen_scaling
+
+        for change in scenario.loads:
+            if change.bus_id not in net.bus.index:
+                raise ValueError(f"Barra inexistente: {change.bus_id}")
+            loads = net.load.index[net.load.bus == change.bus_id]
+            if len(loads) == 0:
+                # Barra sem carga: cria uma nova carga com os valores informados
+                pp.create_load(net, bus=change.bus_id, p_mw=change.p_mw or 0.0, q_mvar=change.q_mvar or 0.0)
+                continue
+            # Várias cargas na mesma barra: o novo valor fica na primeira e as demais são zeradas
+            for column, value in (('p_mw', change.p_mw), ('q_mvar', change.q_mvar)):
+                if value is not None:
+                    net.load.loc[loads, column] = 0.0
+                    net.load.loc[loads[0], column] = value
+            if change.in_service is not None:
+                net.load.loc[loads, 'in_service'] = change.in_service
+
+        for change in scenario.generators:
+            gens = net.gen.index[net.gen.bus == change.bus_id]
+            ext_grids = net.ext_grid.index[net.ext_grid.bus == change.bus_id]
+            if len(gens) > 0:
+                if change.p_mw is not None:
+                    net.gen.loc[gens, 'p_mw'] = change.p_mw / len(gens)
+                if change.vm_pu is not None:
+                    net.gen.loc[gens, 'vm_pu'] = change.vm_pu
+                if change.in_service is not None:
+                    net.gen.loc[gens, 'in_service'] = change.in_service
+            elif len(ext_grids) > 0:
+                if change.p_mw is not None:
+                    raise ValueError(f"A potência ativa da barra slack ({change.bus_id}) é resultado do fluxo e não pode ser definida")
+                if change.vm_pu is not None:
+                    net.ext_grid.loc[ext_grids, 'vm_pu'] = change.vm_pu
+                if change.in_service is not None:
+                    net.ext_grid.loc[ext_grids, 'in_service'] = change.in_service
+            else:
+                raise ValueError(f"Nenhum gerador na barra {change.bus_id}")
+
+        # Ramos indexados como na lista `lines` do resultado: linhas e depois transformadores
+        n_line = len(net.line)
+        for change in scenario.branches:
+            if 0 <= change.index < n_line:
+                net.line.loc[net.line.index[change.index], 'in_service'] = change.in_service
+            elif n_line <= change.index < n_line + len(net.trafo):
+                net.trafo.loc[net.trafo.index[change.index - n_line], 'in_service'] = change.in_service
+            else:
+                raise ValueError(f"Ramo inexistente: {change.index}")
 
     def _run_simulation(self, net: pp.pandapowerNet) -> PowerSystemResult:
         """Executa a simulação e converte os resultados"""
-        import warnings
-        
+        return self.result_from_columns(self._run_simulation_columns(net))
+
+    def _run_simulation_columns(self, net: pp.pandapowerNet, selection: Optional[ResultSelection] = None,
+                                solver_options: Optional[SolverOptions] = None,
+                                seed: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Dict[str, Any]:
+        """Executa a simulação e extrai os resultados por coluna (apenas os selecionados, se houver seleção)"""
+        solver = self._solve(net, solver_options, seed)
+        with metrics.stage("extract"):
+            columns = self._extract_result_columns(net, selection)
+            columns['solver'] = solver
+            columns = project_columns(columns, selection)
+        metrics.annotate(
+            buses=len(net.bus), branches=len(net.line) + len(net.trafo),
+            gens=len(net.gen) + len(net.ext_grid), iterations=solver['iterations'],
+        )
+        return columns
+
+    def _solve(self, net: pp.pandapowerNet, options: Optional[SolverOptions] = None,
+               seed: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Dict[str, Any]:
+        """Executa o fluxo de potência na rede
+
+        As opções da requisição são completadas com os padrões do servidor
+        (ver ``solver_backend``). Se houver uma solução anterior da mesma
+        topologia, ela é usada como ponto de partida dos algoritmos AC; se a
+        partida a quente divergir, o fluxo é refeito com partida plana. Com
+        ``seed`` (tensões de outro caso, ex: o caso base de uma contingência),
+        a partida parte dela e a solução não é guardada.
+
+        Returns:
+            Dict[str, Any]: Iterações, partida a quente, algoritmo, backend, numba e tempo do solver
+        """
         try:
             # Suprimir warnings específicos do pandas/pandapower
             with warnings.catch_warnings():
                 warnings.filterwarnings("ignore", category=FutureWarning, module="pandas")
                 warnings.filterwarnings("ignore", category=FutureWarning, module="pandapower")
                 
-                self._debug_print("Iniciando simulação...")
-                pp.runpp(net)
-                self._debug_print("Simulação concluída com sucesso")
+                logger.debug("Iniciando simulação...")
+                solver = resolve_solver(options, len(net.bus))
+                # A solução DC não serve de partida para o fluxo AC
+                ac = solver.algorithm != 'dc'
+                if seed is not None:
+                    key = None
+                    warm_start = ac and self._seed_voltages(net, *seed)
+                else:
+                    key = topology_key(net) if self.WARM_START_ENABLED and ac else None
+                    warm_start = key is not None and self._seed_from_previous(net, key)
+                start = time.perf_counter()
+                with metrics.stage("solve"):
+                    if warm_start:
+                        try:
+                            backend = run_power_flow(net, solver, init="results")
+                        except pp.LoadflowNotConverged:
+                            logger.debug("Partida a quente divergiu; refazendo com partida plana")
+                            warm_start = False
+                    if not warm_start:
+                        backend = run_power_flow(net, solver)
+                elapsed = time.perf_counter() - start
+                if key is not None:
+                    self.warm_start.put(key, net)
+                self.solver_warm = True
+                logger.debug("Simulação concluída com sucesso")
                 
-                # Print adicional para debug imediato no console
-                self._debug_print("=== DEBUG NET VARIABLE ===")
-                self._debug_print(f"Bus count: {len(net.bus)}")
-                self._debug_print(f"Line count: {len(net.line) if hasattr(net, 'line') else 0}")
-                self._debug_print(f"Gen count: {len(net.gen) if hasattr(net, 'gen') else 0}")
-                if hasattr(net, 'res_bus'):
-                    self._debug_print(f"Bus results columns: {list(net.res_bus.columns)}")
-                    self._debug_print("Bus results sample:")
-                    self._debug_print(str(net.res_bus.head()))
-                self._debug_print("=========================")
+                # Resumo da rede: formatar res_bus só compensa com o debug ativo
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Rede simulada: %d barras, %d linhas, %d geradores; colunas de res_bus: %s\n%s",
+                        len(net.bus), len(net.line), len(net.gen),
+                        list(net.res_bus.columns), net.res_bus.head(),
+                    )
                 
         except Exception as e:
-            self._debug_print(f"Erro durante simulação: {str(e)}")
+            logger.debug("Erro durante simulação: %s", e)
             raise ValueError(f"Erro na simulação do sistema: {str(e)}")
-        
-        return self._convert_results(net)
+
+        return {
+            'iterations': int(net._ppc.get('iterations') or 0),
+            'warm_start': warm_start,
+            'algorithm': solver.algorithm,
+            'backend': backend,
+            'numba': solver.numba,
+            'time_ms': elapsed * 1e3,
+            'cached': False,
+        }
+
+    def _seed_from_previous(self, net: pp.pandapowerNet, key: str) -> bool:
+        """Preenche res_bus com a última solução da topologia, se existir"""
+        previous = self.warm_start.get(key)
+        return previous is not None and self._seed_voltages(net, *previous)
+
+    @staticmethod
+    def _seed_voltages(net: pp.pandapowerNet, vm_pu: np.ndarray, va_degree: np.ndarray) -> bool:
+        """Preenche res_bus com as tensões de partida (False se o número de barras não confere)"""
+        if len(vm_pu) != len(net.bus):
+            return False
+        net.res_bus = pd.DataFrame(
+            {'vm_pu': vm_pu, 'va_degree': va_degree, 'p_mw': np.nan, 'q_mvar': np.nan},
+            index=net.bus.index,
+        )
+        return True
+
+    # Campos de LineResult e as colunas correspondentes em res_line / res_trafo
+    LINE_RESULT_COLUMNS = [
+        ('p_from_mw', 'p_from_mw', 'p_hv_mw'),
+        ('q_from_mvar', 'q_from_mvar', 'q_hv_mvar'),
+        ('p_to_mw', 'p_to_mw', 'p_lv_mw'),
+        ('q_to_mvar', 'q_to_mvar', 'q_lv_mvar'),
+        ('pl_mw', 'pl_mw', 'pl_mw'),
+        ('ql_mvar', 'ql_mvar', 'ql_mvar'),
+        ('i_from_ka', 'i_from_ka', 'i_hv_ka'),
+        ('i_to_ka', 'i_to_ka', 'i_lv_ka'),
+        ('i_ka', 'i_ka', None),  # Transformadores: maior corrente entre AT e BT
+        ('vm_from_pu', 'vm_from_pu', 'vm_hv_pu'),
+        ('va_from_degree', 'va_from_degree', 'va_hv_degree'),
+        ('vm_to_pu', 'vm_to_pu', 'vm_lv_pu'),
+        ('va_to_degree', 'va_to_degree', 'va_lv_degree'),
+        ('loading_percent', 'loading_percent', 'loading_percent'),
+    ]
+
+    @staticmethod
+    def _column(df, column: str, size: int, default: float = 0.0, dtype=float) -> np.ndarray:
+        """Extrai uma coluna como array NumPy, ou um array com o valor padrão se ausente"""
+        if column in df.columns:
+            return df[column].to_numpy(dtype=dtype)[:size]
+        return np.full(size, default, dtype=dtype)
+
+    def _extract_result_columns(self, net: pp.pandapowerNet, selection: Optional[ResultSelection] = None) -> Dict[str, Any]:
+        """Extrai os resultados do pandapower coluna a coluna
+
+        Cada tabela (buses, lines, loads, generators) é um dicionário
+        campo -> lista de valores, na mesma ordem dos modelos de resultado.
+        Com ``selection``, tabelas e campos não pedidos (nem usados nos
+        filtros) não são extraídos.
+        """
+        column = self._column
+        tables = selected_tables(selection)
+        wanted = {table: required_fields(selection, table) for table in TABLE_FIELDS if table in tables}
+        columns: Dict[str, Any] = {}
+
+        # Barras (identificadas pela posição, como nos resultados originais)
+        if 'buses' in wanted:
+            n_bus = len(net.bus)
+            fields = wanted['buses']
+            columns['buses'] = {
+                field: (list(range(n_bus)) if field == 'bus_id' else column(net.res_bus, field, n_bus).tolist())
+                for field in TABLE_FIELDS['buses'] if field in fields
+            }
+
+        # Linhas e transformadores (convertidos como linhas: hv_bus -> from_bus, lv_bus -> to_bus)
+        if 'lines' in wanted:
+            fields = wanted['lines']
+            result_columns = [c for c in self.LINE_RESULT_COLUMNS if c[0] in fields]
+            n_line = len(net.line) if hasattr(net, 'line') else 0
+            n_trafo = len(net.trafo) if hasattr(net, 'trafo') else 0
+            line_parts = []
+            if n_line > 0:
+                part = {
+                    'from_bus': net.line.from_bus.to_numpy(dtype=int),
+                    'to_bus': net.line.to_bus.to_numpy(dtype=int),
+                }
+                for field, line_column, _ in result_columns:
+                    part[field] = column(net.res_line, line_column, n_line)
+                part['in_service'] = net.line.in_service.to_numpy(dtype=bool)
+                line_parts.append(part)
+
+            if n_trafo > 0:
+                part = {
+                    'from_bus': net.trafo.hv_bus.to_numpy(dtype=int),
+                    'to_bus': net.trafo.lv_bus.to_numpy(dtype=int),
+                }
+                for field, _, trafo_column in result_columns:
+                    if trafo_column is not None:
+                        part[field] = column(net.res_trafo, trafo_column, n_trafo)
+                if 'i_ka' in fields:
+                    part['i_ka'] = np.maximum(column(net.res_trafo, 'i_hv_ka', n_trafo),
+                                              column(net.res_trafo, 'i_lv_ka', n_trafo))
+                part['in_service'] = net.trafo.in_service.to_numpy(dtype=bool)
+                line_parts.append(part)
+
+            columns['lines'] = {
+                field: [value for part in line_parts for value in part[field].tolist()]
+                for field in TABLE_FIELDS['lines'] if field in fields
+            }
+
+        # Cargas
+        n_load = len(net.load) if hasattr(net, 'load') else 0
+        if 'loads' in wanted:
+            loads = {}
+            for field in TABLE_FIELDS['loads']:
+                if field not in wanted['loads']:
+                    continue
+                if n_load == 0:
+                    loads[field] = []
+                elif field == 'bus_id':
+                    loads[field] = net.load.bus.to_numpy(dtype=int).tolist()
+                elif field == 'scaling':
+                    loads[field] = column(net.load, 'scaling', n_load, default=1.0).tolist()
+                else:
+                    loads[field] = column(net.res_load, field, n_load).tolist()
+            columns['loads'] = loads
+
+        # Geradores
+        n_gen = len(net.gen) if hasattr(net, 'gen') else 0
+        if 'generators' in wanted:
+            generators = {}
+            for field in TABLE_FIELDS['generators']:
+                if field not in wanted['generators']:
+                    continue
+                if n_gen == 0:
+                    generators[field] = []
+                elif field == 'bus_id':
+                    generators[field] = net.gen.bus.to_numpy(dtype=int).tolist()
+                elif field == 'in_service':
+                    generators[field] = net.gen.in_service.to_numpy(dtype=bool).tolist()
+                elif field == 'vm_pu':
+                    generators[field] = column(net.gen, 'vm_pu', n_gen, default=1.0).tolist()
+                else:
+                    generators[field] = column(net.res_gen, field, n_gen).tolist()
+            columns['generators'] = generators
+
+        # Barra slack (apenas a primeira ext_grid)
+        n_ext_grid = len(net.ext_grid) if hasattr(net, 'ext_grid') else 0
+        if 'ext_grid' in wanted:
+            ext_grid = None
+            if n_ext_grid > 0:
+                ext_grid = {
+                    'bus_id': int(net.ext_grid.bus.iloc[0]),
+                    'p_mw': float(column(net.res_ext_grid, 'p_mw', 1)[0]),
+                    'q_mvar': float(column(net.res_ext_grid, 'q_mvar', 1)[0]),
+                }
+            columns['ext_grid'] = ext_grid
+
+        if TOTALS in tables:
+            # Capacidade total dos geradores (P_max, Q_min e Q_max), incluindo a ext_grid
+            gen_capacity_p = 0.0
+            gen_capacity_qmin = 0.0
+            gen_capacity_qmax = 0.0
+            for table, size in (('gen', n_gen), ('ext_grid', n_ext_grid)):
+                if size > 0:
+                    df = net[table]
+                    gen_capacity_p += float(column(df, 'max_p_mw', size).sum())
+                    gen_capacity_qmin += float(column(df, 'min_q_mvar', size).sum())
+                    gen_capacity_qmax += float(column(df, 'max_q_mvar', size).sum())
+
+            # Carga total ativa e reativa do sistema
+            load_system_p = float(net.load.p_mw.sum()) if n_load > 0 else 0.0
+            load_system_q = float(net.load.q_mvar.sum()) if n_load > 0 else 0.0
+
+            logger.debug("Capacidade total dos geradores: P=%s MW, Qmin=%s MVAr, Qmax=%s MVAr",
+                         gen_capacity_p, gen_capacity_qmin, gen_capacity_qmax)
+            logger.debug("Carga total do sistema: P=%s MW, Q=%s MVAr", load_system_p, load_system_q)
+
+            columns.update({
+                'genCapacityP': gen_capacity_p,
+                'genCapacityQmin': gen_capacity_qmin,
+                'genCapacityQmax': gen_capacity_qmax,
+                'loadSystemP': load_system_p,
+                'loadSystemQ': load_system_q,
+            })
+
+        return columns
+
+    @staticmethod
+    def _build_records(model, table: Dict[str, list]) -> list:
+        """Monta os modelos de uma tabela de uma vez, sem revalidar valores já convertidos"""
+        fields = list(table.keys())
+        return [model.model_construct(**dict(zip(fields, values))) for values in zip(*table.values())]
 
     def _convert_results(self, net: pp.pandapowerNet) -> PowerSystemResult:
         """Converte os resultados do pandapower para nosso formato"""
-        from app.models.power_system_results import (
-            BusResult, LineResult, LoadResult, 
-            GeneratorResult, ExtGridResult, PowerSystemResult
-        )
-        
-        self._debug_print("Iniciando conversão de resultados...")
-        self._debug_print(f"Colunas disponíveis em res_bus: {list(net.res_bus.columns)}")
-        
-        # Converter resultados das barras
-        buses = []
-        for i in range(len(net.bus)):
-            try:
-                bus_result = BusResult(
-                    bus_id=int(i),
-                    vm_pu=float(net.res_bus.vm_pu.iloc[i]),
-                    va_degree=float(net.res_bus.va_degree.iloc[i]) if 'va_degree' in net.res_bus.columns else 0.0,
-                    p_mw=float(net.res_bus.p_mw.iloc[i]) if 'p_mw' in net.res_bus.columns else 0.0,
-                    q_mvar=float(net.res_bus.q_mvar.iloc[i]) if 'q_mvar' in net.res_bus.columns else 0.0
-                )
-                buses.append(bus_result)
-            except Exception as e:
-                self._debug_print(f"Erro ao converter bus {i}: {str(e)}")
-                raise
-        
-        # Converter resultados das linhas
-        lines = []
-        if hasattr(net, 'line') and len(net.line) > 0:
-            self._debug_print(f"Colunas disponíveis em res_line: {list(net.res_line.columns)}")
-            self._debug_print("Iniciando conversão das linhas...")
-            for i in range(len(net.line)):
-                try:
-                    self._debug_print(f"Convertendo os dados da linha são: {net.res_line.iloc[i].to_dict()}")
-                    line_result = LineResult(
-                        from_bus=int(net.line.from_bus.iloc[i]),
-                        to_bus=int(net.line.to_bus.iloc[i]),
-                        p_from_mw=float(net.res_line.p_from_mw.iloc[i]) if 'p_from_mw' in net.res_line.columns else 0.0,
-                        q_from_mvar=float(net.res_line.q_from_mvar.iloc[i]) if 'q_from_mvar' in net.res_line.columns else 0.0,
-                        p_to_mw=float(net.res_line.p_to_mw.iloc[i]) if 'p_to_mw' in net.res_line.columns else 0.0,
-                        q_to_mvar=float(net.res_line.q_to_mvar.iloc[i]) if 'q_to_mvar' in net.res_line.columns else 0.0,
-                        pl_mw=float(net.res_line.pl_mw.iloc[i]) if 'pl_mw' in net.res_line.columns else 0.0,
-                        ql_mvar=float(net.res_line.ql_mvar.iloc[i]) if 'ql_mvar' in net.res_line.columns else 0.0,
-                        i_from_ka=float(net.res_line.i_from_ka.iloc[i]) if 'i_from_ka' in net.res_line.columns else 0.0,
-                        i_to_ka=float(net.res_line.i_to_ka.iloc[i]) if 'i_to_ka' in net.res_line.columns else 0.0,
-                        i_ka=float(net.res_line.i_ka.iloc[i]) if 'i_ka' in net.res_line.columns else 0.0,
-                        vm_from_pu=float(net.res_line.vm_from_pu.iloc[i]) if 'vm_from_pu' in net.res_line.columns else 0.0,
-                        va_from_degree=float(net.res_line.va_from_degree.iloc[i]) if 'va_from_degree' in net.res_line.columns else 0.0,
-                        vm_to_pu=float(net.res_line.vm_to_pu.iloc[i]) if 'vm_to_pu' in net.res_line.columns else 0.0,
-                        va_to_degree=float(net.res_line.va_to_degree.iloc[i]) if 'va_to_degree' in net.res_line.columns else 0.0,
-                        loading_percent=float(net.res_line.loading_percent.iloc[i]) if 'loading_percent' in net.res_line.columns else 0.0,
-                        in_service=bool(net.line.in_service.iloc[i])
-                    )
-                    lines.append(line_result)
-                except Exception as e:
-                    self._debug_print(f"Erro ao converter line {i}: {str(e)}")
-                    raise
-            self._debug_print("Conversão das linhas concluída.")
-        
-        # Converter resultados dos transformadores como linhas também
-        if hasattr(net, 'trafo') and len(net.trafo) > 0:
-            self._debug_print(f"Conversão de transformadores como linhas...")
-            self._debug_print(f"Número de transformadores: {len(net.trafo)}")
-            self._debug_print(f"Colunas disponíveis em res_trafo: {list(net.res_trafo.columns)}")
-            
-            for i in range(len(net.trafo)):
-                try:
-                    self._debug_print(f"Convertendo transformador {i}: {net.res_trafo.iloc[i].to_dict()}")
-                    trafo_result = LineResult(
-                        from_bus=int(net.trafo.hv_bus.iloc[i]),  # High voltage bus
-                        to_bus=int(net.trafo.lv_bus.iloc[i]),    # Low voltage bus
-                        p_from_mw=float(net.res_trafo.p_hv_mw.iloc[i]) if 'p_hv_mw' in net.res_trafo.columns else 0.0,
-                        q_from_mvar=float(net.res_trafo.q_hv_mvar.iloc[i]) if 'q_hv_mvar' in net.res_trafo.columns else 0.0,
-                        p_to_mw=float(net.res_trafo.p_lv_mw.iloc[i]) if 'p_lv_mw' in net.res_trafo.columns else 0.0,
-                        q_to_mvar=float(net.res_trafo.q_lv_mvar.iloc[i]) if 'q_lv_mvar' in net.res_trafo.columns else 0.0,
-                        pl_mw=float(net.res_trafo.pl_mw.iloc[i]) if 'pl_mw' in net.res_trafo.columns else 0.0,
-                        ql_mvar=float(net.res_trafo.ql_mvar.iloc[i]) if 'ql_mvar' in net.res_trafo.columns else 0.0,
-                        i_from_ka=float(net.res_trafo.i_hv_ka.iloc[i]) if 'i_hv_ka' in net.res_trafo.columns else 0.0,
-                        i_to_ka=float(net.res_trafo.i_lv_ka.iloc[i]) if 'i_lv_ka' in net.res_trafo.columns else 0.0,
-                        i_ka=max(
-                            float(net.res_trafo.i_hv_ka.iloc[i]) if 'i_hv_ka' in net.res_trafo.columns else 0.0,
-                            float(net.res_trafo.i_lv_ka.iloc[i]) if 'i_lv_ka' in net.res_trafo.columns else 0.0
-                        ),
-                        vm_from_pu=float(net.res_trafo.vm_hv_pu.iloc[i]) if 'vm_hv_pu' in net.res_trafo.columns else 0.0,
-                        va_from_degree=float(net.res_trafo.va_hv_degree.iloc[i]) if 'va_hv_degree' in net.res_trafo.columns else 0.0,
-                        vm_to_pu=float(net.res_trafo.vm_lv_pu.iloc[i]) if 'vm_lv_pu' in net.res_trafo.columns else 0.0,
-                        va_to_degree=float(net.res_trafo.va_lv_degree.iloc[i]) if 'va_lv_degree' in net.res_trafo.columns else 0.0,
-                        loading_percent=float(net.res_trafo.loading_percent.iloc[i]) if 'loading_percent' in net.res_trafo.columns else 0.0,
-                        in_service=bool(net.trafo.in_service.iloc[i])
-                    )
-                    lines.append(trafo_result)
-                    self._debug_print(f"Transformador {i} convertido: {net.trafo.hv_bus.iloc[i]} -> {net.trafo.lv_bus.iloc[i]}")
-                except Exception as e:
-                    self._debug_print(f"Erro ao converter trafo {i}: {str(e)}")
-                    if self.DEBUG_ENABLED:
-                        import traceback
-                        traceback.print_exc()
-                    raise
-            self._debug_print("Conversão dos transformadores concluída.")
-        
-        # Converter resultados das cargas
-        loads = []
-        if hasattr(net, 'load') and len(net.load) > 0:
-            self._debug_print(f"Colunas disponíveis em res_load: {list(net.res_load.columns)}")
-            for i in range(len(net.load)):
-                try:
-                    load_result = LoadResult(
-                        bus_id=int(net.load.bus.iloc[i]),
-                        p_mw=float(net.res_load.p_mw.iloc[i]) if 'p_mw' in net.res_load.columns else 0.0,
-                        q_mvar=float(net.res_load.q_mvar.iloc[i]) if 'q_mvar' in net.res_load.columns else 0.0,
-                        scaling=float(net.load.scaling.iloc[i]) if 'scaling' in net.load.columns else 1.0
-                    )
-                    loads.append(load_result)
-                except Exception as e:
-                    self._debug_print(f"Erro ao converter load {i}: {str(e)}")
-                    raise
-        
-        # Converter resultados dos geradores
-        generators = []
-        if hasattr(net, 'gen') and len(net.gen) > 0:
-            self._debug_print(f"Colunas disponíveis em res_gen: {list(net.res_gen.columns)}")
-            for i in range(len(net.gen)):
-                try:
-                    gen_result = GeneratorResult(
-                        bus_id=int(net.gen.bus.iloc[i]),
-                        p_mw=float(net.res_gen.p_mw.iloc[i]) if 'p_mw' in net.res_gen.columns else 0.0,
-                        q_mvar=float(net.res_gen.q_mvar.iloc[i]) if 'q_mvar' in net.res_gen.columns else 0.0,
-                        vm_pu=float(net.gen.vm_pu.iloc[i]) if 'vm_pu' in net.gen.columns else 1.0,
-                        in_service=bool(net.gen.in_service.iloc[i])
-                    )
-                    generators.append(gen_result)
-                except Exception as e:
-                    self._debug_print(f"Erro ao converter gen {i}: {str(e)}")
-                    raise
-        
-        # Converter resultado da barra slack
-        ext_grid = None
-        if hasattr(net, 'ext_grid') and len(net.ext_grid) > 0:
-            self._debug_print(f"Colunas disponíveis em res_ext_grid: {list(net.res_ext_grid.columns)}")
-            try:
-                ext_grid = ExtGridResult(
-                    bus_id=int(net.ext_grid.bus.iloc[0]),
-                    p_mw=float(net.res_ext_grid.p_mw.iloc[0]) if 'p_mw' in net.res_ext_grid.columns else 0.0,
-                    q_mvar=float(net.res_ext_grid.q_mvar.iloc[0]) if 'q_mvar' in net.res_ext_grid.columns else 0.0
-                )
-            except Exception as e:
-                self._debug_print(f"Erro ao converter ext_grid: {str(e)}")
-                raise
-        
-        self._debug_print("Conversão de resultados concluída com sucesso")
-        
-        # Calcular capacidade total dos geradores (P_max e Q_max)
-        gen_capacity_p = 0.0
-        gen_capacity_qmin = 0.0
-        gen_capacity_qmax = 0.0
-
-        if hasattr(net, 'gen') and len(net.gen) > 0:
-            self._debug_print(f"Colunas disponíveis em gen: {list(net.gen.columns)}")
-
-            # Usar métodos do pandas para somar diretamente (mais eficiente)
-            if 'max_p_mw' in net.gen.columns:
-                gen_capacity_p = float(net.gen.max_p_mw.sum())
-                self._debug_print(f"P_max total encontrado: {gen_capacity_p} MW")
-
-            if 'min_q_mvar' in net.gen.columns:
-                gen_capacity_qmin = float(net.gen.min_q_mvar.sum())
-                self._debug_print(f"Q_min total encontrado: {gen_capacity_qmin} MVAr")
-
-            if 'max_q_mvar' in net.gen.columns:
-                gen_capacity_qmax = float(net.gen.max_q_mvar.sum())
-                self._debug_print(f"Q_max total encontrado: {gen_capacity_qmax} MVAr")
-
-            self._debug_print(f"Capacidade total dos geradores: P={gen_capacity_p} MW, Qmin={gen_capacity_qmin} MVAr, Qmax={gen_capacity_qmax} MVAr")
-
-        # Incluir ext_grid na capacidade se existir
-        if hasattr(net, 'ext_grid') and len(net.ext_grid) > 0:
-            self._debug_print(f"Colunas disponíveis em ext_grid: {list(net.ext_grid.columns)}")
-            gen_capacity_p += net.ext_grid['max_p_mw'].sum() if 'max_p_mw' in net.ext_grid.columns else 0.0
-            gen_capacity_qmin += net.ext_grid['min_q_mvar'].sum() if 'min_q_mvar' in net.ext_grid.columns else 0.0
-            gen_capacity_qmax += net.ext_grid['max_q_mvar'].sum() if 'max_q_mvar' in net.ext_grid.columns else 0.0
-            self._debug_print(f"Adicionando capacidade da ext_grid: P={net.ext_grid['max_p_mw'].sum()} MW, Q={net.ext_grid['max_q_mvar'].sum()} MVAr")
-
-        # Calcular carga total ativa e reativa do sistema
-        load_system_p = 0.0
-        load_system_q = 0.0
-        if hasattr(net, 'load') and len(net.load) > 0:
-            load_system_p = float(net.load.p_mw.sum())
-            load_system_q = float(net.load.q_mvar.sum())
-
-        self._debug_print(f"Capacidade total dos geradores: P={gen_capacity_p} MW, Qmin={gen_capacity_qmin} MVAr, Qmax={gen_capacity_qmax} MVAr")
-        self._debug_print(f"Carga total do sistema: P={load_system_p} MW, Q={load_system_q} MVAr")
-        
-        return PowerSystemResult(
-            buses=buses,
-            lines=lines,
-            loads=loads,
-            generators=generators,
-            ext_grid=ext_grid,
-            genCapacityP=gen_capacity_p,
-            genCapacityQmin=gen_capacity_qmin,
-            genCapacityQmax=gen_capacity_qmax,
-            loadSystemP=load_system_p,
-            loadSystemQ=load_system_q
-        )
\ No newline at end of file
+        logger.debug("Iniciando conversão de resultados...")
+        # to_dict() percorre todas as linhas: só é chamado com o debug ativo
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Colunas disponíveis em res_bus: %s", list(net.res_bus.columns))
+            if len(net.line) > 0:
+                logger.debug("Dados das linhas: %s", net.res_line.to_dict('records'))
+            if len(net.trafo) > 0:
+                logger.debug("Dados dos transformadores: %s", net.res_trafo.to_dict('records'))
+
+        columns = self._extract_result_columns(net)
+        logger.debug("Conversão de resultados concluída com sucesso")
+        return self.result_from_columns(columns)
+
+    def result_from_columns(self, columns: Dict[str, Any]) -> PowerSystemResult:
+        """Monta o PowerSystemResult (formato por linhas) a partir dos resultados por coluna"""
+        ext_grid = columns['ext_grid']
+        solver = columns.get('solver')
+        with metrics.stage("convert"):
+            return PowerSystemResult(
+                buses=self._build_records(BusResult, columns['buses']),
+                lines=self._build_records(LineResult, columns['lines']),
+                loads=self._build_records(LoadResult, columns['loads']),
+                generators=self._build_records(GeneratorResult, columns['generators']),
+                ext_grid=ExtGridResult.model_construct(**ext_grid) if ext_grid is not None else None,
+                genCapacityP=columns['genCapacityP'],
+                genCapacityQmin=columns['genCapacityQmin'],
+                genCapacityQmax=columns['genCapacityQmax'],
+                loadSystemP=columns['loadSystemP'],
+                loadSystemQ=columns['loadSystemQ'],
+                solver=SolverInfo(**solver) if solver is not None else None
+            )
@@ -0,0 +1,189 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Limites dos histogramas de latência (segundos) e de iterações do solver
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+ITERATION_BUCKETS = (1, 2, 3, 4, 5, 7, 10, 15, 20, 30, 50)
+
+# Caso usado como rótulo quando a simulação não informa um
+UNKNOWN_CASE = "desconhecido"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class Histogram:
+    """Histograma no formato do Prometheus, com uma série por combinação de rótulos"""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        # Cada série guarda as contagens por faixa, a soma e o total
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted(self._series.items())
+        for label_values, series in items:
+            for bound, count in zip(self.buckets, series):
+                labels = _format_labels(self.labels, label_values, f'le="{bound:g}"')
+                lines.append(f"{self.name}_bucket{labels} {count:g}")
+            labels = _format_labels(self.labels, label_values, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {series[-1]:g}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {series[-2]:.6g}")
+            lines.append(f"{self.name}_count{labels} {series[-1]:g}")
+        return lines
+
+
+class Gauge:
+    """Valor instantâneo por combinação de rótulos"""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), kind: str = "gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.kind = kind  # "gauge" ou "counter"
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, *label_values: str):
+        with self._lock:
+            self._values[label_values] = float(value)
+
+    def inc(self, amount: float = 1.0, *label_values: str):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value:g}")
+        return lines
+
+
+class MetricsRegistry:
+    """Métricas de latência por etapa, do solver e das requisições HTTP"""
+
+    def __init__(self):
+        self.stage_duration = Histogram(
+            "sisep_stage_duration_seconds", "Duração de cada etapa da simulação", ("stage", "case"))
+        self.request_duration = Histogram(
+            "sisep_request_duration_seconds", "Duração das requisições HTTP", ("method", "route", "status"))
+        self.solver_iterations = Histogram(
+            "sisep_solver_iterations", "Iterações do fluxo de potência", ("case",), ITERATION_BUCKETS)
+        self.network_size = Gauge(
+            "sisep_network_elements", "Tamanho da última rede simulada de cada caso", ("case", "element"))
+        self.simulations = Gauge(
+            "sisep_simulations_total", "Simulações executadas no pool", ("method", "status"), kind="counter")
+        self.coalesced = Gauge(
+            "sisep_coalesced_requests_total", "Requisições atendidas por uma simulação idêntica em andamento",
+            ("operation",), kind="counter")
+
+    def record_call(self, method: str, timings: "Timings", status: str = "ok"):
+        """Registra as etapas e informações de uma chamada executada no pool"""
+        case = str(timings.info.get('case', UNKNOWN_CASE))
+        for stage, seconds in timings.spans.items():
+            self.stage_duration.observe(seconds, stage, case)
+        if 'iterations' in timings.info:
+            self.solver_iterations.observe(timings.info['iterations'], case)
+        for element in ('buses', 'branches', 'gens'):
+            if element in timings.info:
+                self.network_size.set(timings.info[element], case, element)
+        self.simulations.inc(1.0, method, status)
+
+    def render(self, extra: Sequence[Gauge] = ()) -> str:
+        metrics = (self.stage_duration, self.solver_iterations, self.network_size,
+                   self.simulations, self.coalesced, self.request_duration, *extra)
+        lines = [line for metric in metrics for line in metric.render()]
+        return '\n'.join(lines) + '\n'
+
+
+class Timings:
+    """Etapas cronometradas (nome -> segundos) e informações de uma simulação ou requisição"""
+
+    def __init__(self):
+        self.spans: Dict[str, float] = {}
+        self.info: Dict[str, Any] = {}
+
+    def add(self, stage: str, seconds: float):
+        self.spans[stage] = self.spans.get(stage, 0.0) + seconds
+
+    def merge(self, other: "Timings"):
+        for stage, seconds in other.spans.items():
+            self.add(stage, seconds)
+        self.info.update(other.info)
+
+
+registry = MetricsRegistry()
+
+# Coletor da simulação ou requisição em andamento (None fora de uma coleta)
+_current: ContextVar[Optional[Timings]] = ContextVar("sisep_timings", default=None)
+
+
+@contextmanager
+def collect() -> Iterator[Timings]:
+    """Inicia a coleta de etapas no contexto atual"""
+    timings = Timings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def current() -> Optional[Timings]:
+    return _current.get()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Cronometra uma etapa, acumulando no coletor atual (se houver)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _current.get()
+        if timings is not None:
+            timings.add(name, time.perf_counter() - start)
+
+
+def annotate(**info: Any):
+    """Associa informações (caso, tamanho da rede, iterações) à coleta atual"""
+    timings = _current.get()
+    if timings is not None:
+        timings.info.update(info)
+
+
+def server_timing_header(timings: Timings) -> str:
+    """Monta o cabeçalho Server-Timing (durações em milissegundos)"""
+    return ', '.join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in timings.spans.items())
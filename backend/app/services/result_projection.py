@@ -0,0 +1,161 @@
+from typing import Any, Dict, List, Optional, Set
+import numpy as np
+from app.models.power_system_results import (
+    BusResult, ExtGridResult, GeneratorResult, LineResult, LoadResult
+)
+from app.models.selection_models import ResultSelection
+
+# Campos de cada tabela de resultado
+TABLE_FIELDS: Dict[str, List[str]] = {
+    'buses': list(BusResult.model_fields),
+    'lines': list(LineResult.model_fields),
+    'loads': list(LoadResult.model_fields),
+    'generators': list(GeneratorResult.model_fields),
+    'ext_grid': list(ExtGridResult.model_fields),
+}
+
+# Totais do sistema, selecionados juntos pela tabela "totals"
+TOTALS = 'totals'
+TOTAL_FIELDS = ['genCapacityP', 'genCapacityQmin', 'genCapacityQmax', 'loadSystemP', 'loadSystemQ']
+
+# Campos que identificam cada linha da tabela, sempre incluídos
+KEY_FIELDS: Dict[str, List[str]] = {
+    'buses': ['bus_id'],
+    'lines': ['from_bus', 'to_bus'],
+    'loads': ['bus_id'],
+    'generators': ['bus_id'],
+    'ext_grid': ['bus_id'],
+}
+
+ALL_TABLES = list(TABLE_FIELDS) + [TOTALS]
+
+
+def _split(value: Optional[str]) -> Optional[List[str]]:
+    if value is None:
+        return None
+    items = [item.strip() for item in value.split(',') if item.strip()]
+    return items or None
+
+
+def build_selection(tables: Optional[str] = None, fields: Optional[str] = None,
+                    min_loading: Optional[float] = None, vm_min: Optional[float] = None,
+                    vm_max: Optional[float] = None) -> Optional[ResultSelection]:
+    """Valida os parâmetros de projeção (listas separadas por vírgula); None se nada foi pedido"""
+    table_list, field_list = _split(tables), _split(fields)
+    if table_list is None and field_list is None and min_loading is None and vm_min is None and vm_max is None:
+        return None
+
+    for table in table_list or []:
+        if table not in ALL_TABLES:
+            raise ValueError(f"Tabela inválida: {table}. Use {', '.join(ALL_TABLES)}")
+    for item in field_list or []:
+        table, _, field = item.partition('.')
+        if table not in TABLE_FIELDS or field not in TABLE_FIELDS[table]:
+            raise ValueError(f"Campo inválido: {item}. Use o formato tabela.campo (ex: buses.vm_pu)")
+        if table_list is not None and table not in table_list:
+            raise ValueError(f"O campo {item} pertence a uma tabela não selecionada")
+    if vm_min is not None and vm_max is not None and vm_min > vm_max:
+        raise ValueError("vm_min deve ser menor ou igual a vm_max")
+
+    return ResultSelection(tables=table_list, fields=field_list, min_loading=min_loading,
+                           vm_min=vm_min, vm_max=vm_max)
+
+
+def selected_tables(selection: Optional[ResultSelection]) -> List[str]:
+    """Tabelas retornadas; só com campos informados, as tabelas desses campos"""
+    if selection is None:
+        return ALL_TABLES
+    if selection.tables is not None:
+        return selection.tables
+    if selection.fields is not None:
+        return list(dict.fromkeys(item.partition('.')[0] for item in selection.fields))
+    return ALL_TABLES
+
+
+def output_fields(selection: Optional[ResultSelection], table: str) -> List[str]:
+    """Campos retornados da tabela, na ordem do modelo de resultado"""
+    requested = None
+    if selection is not None and selection.fields is not None:
+        requested = {field for t, _, field in (item.partition('.') for item in selection.fields) if t == table}
+    if not requested:
+        return TABLE_FIELDS[table]
+    return [field for field in TABLE_FIELDS[table] if field in KEY_FIELDS[table] or field in requested]
+
+
+def required_fields(selection: Optional[ResultSelection], table: str) -> Set[str]:
+    """Campos a extrair da rede: os retornados e os usados nos filtros"""
+    fields = set(output_fields(selection, table))
+    if selection is not None:
+        if table == 'lines' and selection.min_loading is not None:
+            fields.add('loading_percent')
+        if table == 'buses' and (selection.vm_min is not None or selection.vm_max is not None):
+            fields.add('vm_pu')
+    return fields
+
+
+def _row_mask(selection: ResultSelection, table: str, data: Dict[str, list]) -> Optional[np.ndarray]:
+    """Linhas que passam nos filtros da tabela (None: todas)"""
+    if table == 'lines' and selection.min_loading is not None:
+        return np.asarray(data['loading_percent'], dtype=float) > selection.min_loading
+    if table == 'buses' and (selection.vm_min is not None or selection.vm_max is not None):
+        vm = np.asarray(data['vm_pu'], dtype=float)
+        mask = np.zeros(len(vm), dtype=bool)
+        if selection.vm_min is not None:
+            mask |= vm < selection.vm_min
+        if selection.vm_max is not None:
+            mask |= vm > selection.vm_max
+        return mask
+    return None
+
+
+def project_columns(columns: Dict[str, Any], selection: Optional[ResultSelection]) -> Dict[str, Any]:
+    """Aplica tabelas, campos e filtros aos resultados por coluna (completos ou já reduzidos)"""
+    if selection is None:
+        return columns
+
+    tables = selected_tables(selection)
+    projected: Dict[str, Any] = {}
+    for table in TABLE_FIELDS:
+        if table not in tables:
+            continue
+        data = columns[table]
+        fields = output_fields(selection, table)
+        if table == 'ext_grid':
+            projected[table] = {field: data[field] for field in fields} if data is not None else None
+            continue
+        mask = _row_mask(selection, table, data)
+        if mask is None:
+            projected[table] = {field: data[field] for field in fields}
+        else:
+            rows = np.flatnonzero(mask).tolist()
+            projected[table] = {field: [data[field][i] for i in rows] for field in fields}
+    if TOTALS in tables:
+        projected.update({field: columns[field] for field in TOTAL_FIELDS})
+    if 'solver' in columns:
+        projected['solver'] = columns['solver']
+    return projected
+
+
+def mark_reused(columns: Dict[str, Any]) -> Dict[str, Any]:
+    """Cópia dos resultados com o solver marcado como reaproveitado (sem simulação nesta requisição)"""
+    solver = columns.get('solver')
+    if solver is None:
+        return columns
+    return {**columns, 'solver': {**solver, 'cached': True}}
+
+
+def columns_to_rows(columns: Dict[str, Any]) -> Dict[str, Any]:
+    """Resultados projetados no formato por linhas (lista de objetos por tabela)"""
+    rows: Dict[str, Any] = {}
+    for key, value in columns.items():
+        if key in TABLE_FIELDS and key != 'ext_grid':
+            fields = list(value)
+            rows[key] = [dict(zip(fields, values)) for values in zip(*value.values())]
+        else:
+            rows[key] = value
+    return rows
+
+
+def selection_key(selection: Optional[ResultSelection]) -> str:
+    """Sufixo da chave de cache dos resultados projetados"""
+    return '' if selection is None else ':' + selection.model_dump_json(exclude_none=True)
@@ -0,0 +1,157 @@
+import asyncio
+import os
+import time
+import uuid
+from typing import Any, Dict, Optional
+from app.models.scenario_models import ScenarioDelta
+from app.models.session_models import SessionInfo
+from app.services.cache import LRUCache
+from app.services.cache_backends import CacheBackend
+from app.services.simulation_executor import SimulationExecutor
+
+# Tabelas da rede alteradas pelos cenários (restauradas se a alteração falhar)
+EDITABLE_TABLES = ('load', 'gen', 'ext_grid', 'line', 'trafo')
+
+
+class SimulationSession:
+    """Rede de uma sessão de edição, mantida em memória entre as requisições"""
+
+    def __init__(self, session_id: str, source: str, net):
+        self.session_id = session_id
+        self.source = source
+        self.net = net
+        self.revision = 0
+        self.created_at = time.time()
+        self.accessed_at = self.created_at
+        self.columns: Optional[Dict[str, Any]] = None  # Resultado da última simulação
+        self.lock = asyncio.Lock()                      # Uma alteração/simulação por vez
+
+    def apply(self, service, delta: ScenarioDelta) -> Dict[str, Any]:
+        """Aplica as alterações na rede e retorna o estado anterior das tabelas alteradas"""
+        snapshot = {table: self.net[table].copy() for table in EDITABLE_TABLES}
+        try:
+            service._apply_scenario(self.net, delta)
+        except Exception:
+            self.restore(snapshot)
+            raise
+        return snapshot
+
+    def restore(self, snapshot: Dict[str, Any]):
+        for table, df in snapshot.items():
+            self.net[table] = df
+
+
+class SessionStore:
+    """Sessões em memória com política LRU e expiração por inatividade
+
+    Com um ``backend`` compartilhado (e a chave de assinatura configurada em
+    ``SISEP_CACHE_SECRET``), cada sessão resolvida é gravada (rede,
+    revisão e último resultado) e pode ser aberta por qualquer worker; a
+    revisão gravada à parte indica quando a cópia local ficou desatualizada.
+    Alterações simultâneas da mesma sessão em workers diferentes não são
+    serializadas: prevalece a última gravada.
+    """
+
+    # Configuração padrão (pode ser alterada por variáveis de ambiente)
+    MAX_SESSIONS = int(os.getenv("SISEP_SESSION_MAX", "64"))
+    TTL = float(os.getenv("SISEP_SESSION_TTL", "1800"))  # Segundos sem uso até a sessão expirar
+
+    def __init__(self, max_sessions: Optional[int] = None, ttl: Optional[float] = None,
+                 backend: Optional[CacheBackend] = None):
+        self.ttl = ttl if ttl is not None else self.TTL
+        self._sessions = LRUCache(max_size=max_sessions or self.MAX_SESSIONS, ttl=self.ttl)
+        # Sem poder gravar objetos no backend (sem chave de assinatura), as sessões ficam só neste worker
+        self.backend = backend if backend is not None and backend.stores_objects else None
+        self.backend_loads = 0
+
+    def create(self, source: str, net) -> SimulationSession:
+        session = SimulationSession(uuid.uuid4().hex, source, net)
+        self._sessions.put(session.session_id, session)
+        return session
+
+    def get(self, session_id: str) -> Optional[SimulationSession]:
+        """Retorna a sessão (renovando o prazo de expiração) ou None se não existir ou tiver expirado"""
+        session = self._sessions.get(session_id)
+        if self.backend is not None:
+            revision = self.backend.get(f"session-rev:{session_id}")
+            if revision is None:
+                # Removida ou expirada em outro worker
+                if session is not None:
+                    self._sessions.invalidate(session_id)
+                return None
+            if session is None or session.revision != int(revision):
+                session = self._load(session_id)
+                if session is None:
+                    return None
+        if session is not None:
+            session.accessed_at = time.time()
+            self._sessions.put(session_id, session)
+        return session
+
+    def _load(self, session_id: str) -> Optional[SimulationSession]:
+        """Lê do backend a sessão gravada por outro worker"""
+        state = self.backend.get_object(f"session:{session_id}")
+        if state is None:
+            return None
+        session = SimulationSession(session_id, state['source'], state['net'])
+        session.revision = state['revision']
+        session.created_at = state['created_at']
+        session.columns = state['columns']
+        self.backend_loads += 1
+        return session
+
+    def save(self, session: SimulationSession):
+        """Grava a sessão no backend compartilhado (sem backend não faz nada)"""
+        if self.backend is None:
+            return
+        state = {
+            'source': session.source, 'net': session.net, 'revision': session.revision,
+            'created_at': session.created_at, 'columns': session.columns,
+        }
+        self.backend.set_object(f"session:{session.session_id}", state, self.ttl)
+        self.backend.set(f"session-rev:{session.session_id}", str(session.revision).encode(), self.ttl)
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a sessão; retorna se ela existia (sem ler a rede gravada no backend)"""
+        if self.backend is not None:
+            # A revisão gravada indica se a sessão existe em algum worker
+            found = self.backend.get(f"session-rev:{session_id}") is not None
+            self.backend.delete(f"session-rev:{session_id}")
+            self.backend.delete(f"session:{session_id}")
+        else:
+            found = self._sessions.get(session_id) is not None
+        # Sessão criada mas ainda não gravada também é removida da memória
+        self._sessions.invalidate(session_id)
+        return found
+
+    def info(self, session: SimulationSession) -> SessionInfo:
+        return SessionInfo(
+            session_id=session.session_id, source=session.source, revision=session.revision,
+            created_at=session.created_at, expires_at=session.accessed_at + self.ttl,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._sessions.stats(), "ttl": self.ttl, "backend_loads": self.backend_loads}
+
+
+async def solve_session(executor: SimulationExecutor, session: SimulationSession,
+                        delta: Optional[ScenarioDelta] = None) -> Dict[str, Any]:
+    """Aplica as alterações (se houver) e resolve a rede da sessão
+
+    Se a alteração for inválida ou o fluxo não convergir, a rede volta ao
+    estado anterior e a revisão não muda.
+    """
+    async with session.lock:
+        snapshot = None
+        if delta is not None:
+            snapshot = await asyncio.to_thread(session.apply, executor.service, delta)
+        try:
+            columns = await executor.run("simulate_session", session.net)
+        except Exception:
+            if snapshot is not None:
+                session.restore(snapshot)
+            raise
+        session.columns = columns
+        if delta is not None:
+            session.revision += 1
+        return columns
@@ -0,0 +1,239 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from app.services import metrics
+from app.services.single_flight import SingleFlight
+
+class SimulationOverloadedError(RuntimeError):
+    """Fila de simulações cheia: a requisição deve ser recusada (HTTP 503)"""
+
+class SimulationTimeoutError(TimeoutError):
+    """Simulação excedeu o tempo limite da requisição (HTTP 504)"""
+
+# Instância do serviço em cada processo do pool (criada sob demanda)
+_worker_service = None
+
+def _timed_call(function: Callable, args: tuple, submitted: float) -> Tuple[Any, metrics.Timings]:
+    """Executa a função coletando suas etapas cronometradas e o tempo de espera na fila"""
+    with metrics.collect() as timings:
+        timings.add("queue", max(0.0, time.time() - submitted))
+        result = function(*args)
+    return result, timings
+
+def _service_snapshot(service) -> Dict[str, Any]:
+    """Aquecimento do solver e estatísticas dos caches de um serviço"""
+    return {"solver_warm": service.solver_warm, "caches": service.cache_stats()}
+
+def _call_in_worker(method: str, args: tuple, submitted: float) -> Tuple[Any, metrics.Timings, int, Dict[str, Any]]:
+    """Executa um método do MatpowerService dentro de um processo do pool
+
+    Além do resultado, devolve o pid e o estado do serviço do processo, que
+    só existe nele (o serviço do processo principal não simula).
+    """
+    global _worker_service
+    if _worker_service is None:
+        from app.services.matpower_service import MatpowerService
+        _worker_service = MatpowerService()
+    result, timings = _timed_call(getattr(_worker_service, method), args, submitted)
+    return result, timings, os.getpid(), _service_snapshot(_worker_service)
+
+class SimulationExecutor:
+    """Executa as simulações fora do event loop, em um pool de threads ou de processos
+
+    O número de simulações pendentes (em execução ou aguardando) é limitado
+    por ``max_pending``: acima disso a chamada falha imediatamente com
+    SimulationOverloadedError. Chamadas com ``wait=True`` (jobs em segundo
+    plano, já aceitos) aguardam uma vaga, com espera crescente, em vez de
+    falhar. Cada chamada aguarda no máximo ``timeout`` segundos antes de
+    falhar com SimulationTimeoutError.
+
+    O fluxo de potência do pandapower segura o GIL, então só o modo process
+    usa vários núcleos; no modo ``auto`` (padrão) ele é escolhido quando há
+    mais de um núcleo. O modo thread continua útil com um único núcleo ou
+    para compartilhar os caches do serviço (redes, partida a quente) entre
+    todas as simulações do processo.
+    """
+
+    # Configuração padrão (pode ser alterada por variáveis de ambiente)
+    MODE = os.getenv("SISEP_EXECUTOR_MODE", "auto")  # "auto", "thread" ou "process"
+    MAX_WORKERS = int(os.getenv("SISEP_EXECUTOR_WORKERS", "0")) or (os.cpu_count() or 1)
+    MAX_PENDING = int(os.getenv("SISEP_EXECUTOR_MAX_PENDING", "0")) or None
+    TIMEOUT = float(os.getenv("SISEP_SIMULATION_TIMEOUT", "60"))
+
+    # Espera (s) entre as tentativas das chamadas que aguardam vaga: dobra a cada tentativa até o máximo
+    WAIT_DELAY = 0.05
+    WAIT_MAX_DELAY = 1.0
+
+    def __init__(self, service, mode: Optional[str] = None, max_workers: Optional[int] = None,
+                 max_pending: Optional[int] = None, timeout: Optional[float] = None):
+        self.service = service
+        self.mode = mode or self.MODE
+        if self.mode == "auto":
+            self.mode = "process" if (os.cpu_count() or 1) > 1 else "thread"
+        self.max_workers = max_workers or self.MAX_WORKERS
+        # Por padrão, até 4 simulações aguardando por worker
+        self.max_pending = max_pending or self.MAX_PENDING or 4 * self.max_workers
+        self.timeout = timeout if timeout is not None else self.TIMEOUT
+
+        if self.mode not in ("thread", "process"):
+            raise ValueError(f"Modo de execução inválido: {self.mode}. Use 'auto', 'thread' ou 'process'")
+
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.deferred = 0
+        # Último estado conhecido do serviço de cada processo do pool (por pid)
+        self.workers: Dict[int, Dict[str, Any]] = {}
+        # Simulações idênticas concorrentes compartilham uma única execução
+        self.single_flight = SingleFlight()
+
+    def _get_pool(self) -> Executor:
+        # Pool criado apenas no primeiro uso
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sisep-sim")
+        return self._pool
+
+    def _release(self, _future):
+        with self._lock:
+            self.pending -= 1
+
+    async def _acquire(self, wait: bool):
+        """Reserva uma vaga no pool; sem ``wait``, falha se o limite de pendentes foi atingido"""
+        delay = self.WAIT_DELAY
+        while True:
+            with self._lock:
+                if self.pending < self.max_pending:
+                    self.pending += 1
+                    return
+                if not wait:
+                    self.rejected += 1
+                    raise SimulationOverloadedError(
+                        f"Servidor ocupado: {self.pending} simulações pendentes (limite {self.max_pending})"
+                    )
+                self.deferred += 1
+            await asyncio.sleep(delay)
+            delay = min(2 * delay, self.WAIT_MAX_DELAY)
+
+    async def run(self, method: str, *args, timeout: Optional[float] = None, wait: bool = False) -> Any:
+        """Executa ``MatpowerService.<method>(*args)`` no pool e aguarda o resultado
+
+        As etapas cronometradas da chamada são registradas nas métricas e
+        somadas às da requisição em andamento (cabeçalho Server-Timing).
+        """
+        await self._acquire(wait)
+
+        try:
+            if self.mode == "process":
+                future = self._get_pool().submit(_call_in_worker, method, args, time.time())
+            else:
+                future = self._get_pool().submit(_timed_call, getattr(self.service, method), args, time.time())
+        except Exception:
+            self._release(None)
+            raise
+        # A vaga só é liberada quando a simulação termina de fato (mesmo após timeout)
+        future.add_done_callback(self._release)
+
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            result, timings, *worker = await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            metrics.registry.simulations.inc(1.0, method, "timeout")
+            raise SimulationTimeoutError(f"Simulação excedeu o tempo limite de {timeout:g} s")
+        except Exception:
+            metrics.registry.simulations.inc(1.0, method, "error")
+            raise
+
+        if worker:
+            pid, snapshot = worker
+            self.workers[pid] = snapshot
+        metrics.registry.record_call(method, timings)
+        request_timings = metrics.current()
+        if request_timings is not None:
+            request_timings.merge(timings)
+        return result
+
+    async def run_coalesced(self, key: Hashable, method: str, *args, timeout: Optional[float] = None,
+                            wait: bool = False) -> Tuple[Any, bool]:
+        """Como ``run``, mas chamadas concorrentes do mesmo método e chave compartilham o resultado
+
+        A chave identifica o caso (nome do modelo ou hash do conteúdo enviado)
+        e as opções que alteram o resultado, como a seleção de tabelas. Retorna
+        o resultado e se ele veio da execução de outra chamada concorrente.
+
+        Só compartilham a execução chamadas com o mesmo tempo limite e a mesma
+        política de espera: um job (``wait``, tempo limite longo) nunca aguarda
+        a simulação de uma requisição interativa, nem o contrário. Com
+        ``wait``, a recusa de uma execução compartilhada também é repetida.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        delay = self.WAIT_DELAY
+        while True:
+            try:
+                return await self.single_flight.run(
+                    (method, key, timeout, wait), method, lambda: self.run(method, *args, timeout=timeout, wait=wait)
+                )
+            except SimulationOverloadedError:
+                if not wait:
+                    raise
+            await asyncio.sleep(delay)
+            delay = min(2 * delay, self.WAIT_MAX_DELAY)
+
+    async def warm_up(self) -> float:
+        """Aquece o solver nos workers e retorna o maior tempo gasto (s)
+
+        No modo process cada processo tem seu próprio serviço, então é
+        enviada uma chamada por worker; no modo thread o serviço é compartilhado.
+        """
+        calls = self.max_workers if self.mode == "process" else 1
+        elapsed = await asyncio.gather(*(self.run("warm_up") for _ in range(calls)))
+        return max(elapsed)
+
+    def service_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Aquecimento e caches dos serviços que simulam, por worker
+
+        No modo thread há um único serviço, o do processo principal
+        (``main``). No modo process, cada processo do pool tem o seu, e o
+        estado vem da última chamada atendida por ele (chave ``pid-<pid>``).
+        """
+        if self.mode == "thread":
+            return {"main": _service_snapshot(self.service)}
+        return {f"pid-{pid}": snapshot for pid, snapshot in sorted(self.workers.items())}
+
+    @property
+    def solver_warm(self) -> bool:
+        """Se o solver foi aquecido em todos os serviços que simulam (ao menos um)"""
+        services = self.service_stats().values()
+        return bool(services) and all(service["solver_warm"] for service in services)
+
+    def stats(self) -> dict:
+        """Retorna o estado atual do pool de simulações"""
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "timeout": self.timeout,
+            "pending": self.pending,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "deferred": self.deferred,
+            "coalescing": self.single_flight.stats(),
+        }
+
+    def shutdown(self):
+        """Encerra o pool, cancelando simulações que ainda não começaram"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
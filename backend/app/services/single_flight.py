@@ -0,0 +1,48 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+from app.services import metrics
+
+
+class SingleFlight:
+    """Agrupa chamadas concorrentes com a mesma chave em uma única execução
+
+    A primeira chamada de uma chave inicia a execução em uma task própria; as
+    que chegam enquanto ela está em andamento aguardam a mesma task e recebem
+    o mesmo resultado (ou a mesma exceção). O cancelamento de uma requisição
+    não interrompe a execução compartilhada com as demais.
+
+    ``run`` retorna o resultado e se ele foi recebido de uma execução iniciada
+    por outra chamada.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, operation: str, factory: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        task = self._in_flight.get(key)
+        shared = task is not None and not task.done()
+        if not shared:
+            task = asyncio.ensure_future(factory())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+            metrics.registry.coalesced.inc(1.0, operation)
+        return await asyncio.shield(task), shared
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Evita o aviso de exceção não lida quando todas as requisições foram canceladas
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._in_flight),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
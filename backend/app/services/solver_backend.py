@@ -0,0 +1,103 @@
+import importlib.util
+import os
+from functools import lru_cache
+from typing import Optional
+from app.models.solver_models import SolverOptions
+from app.services.lazy_import import LazyModule
+
+pp = LazyModule("pandapower")
+
+# Algoritmos aceitos: Newton-Raphson, Newton-Raphson com multiplicador de
+# Iwamoto, desacoplado rápido (versões BX e XB) e fluxo de potência DC
+ALGORITHMS = ('nr', 'iwamoto_nr', 'fdbx', 'fdxb', 'dc')
+BACKENDS = ('auto', 'pandapower', 'lightsim2grid')
+
+# O lightsim2grid só resolve o Newton-Raphson AC
+LIGHTSIM_ALGORITHMS = ('nr',)
+
+# Padrões do servidor, usados quando a requisição não informa a opção
+DEFAULT_ALGORITHM = os.getenv("SISEP_SOLVER_ALGORITHM", "nr")
+DEFAULT_TOLERANCE_MVA = float(os.getenv("SISEP_SOLVER_TOLERANCE_MVA", "1e-8"))
+DEFAULT_MAX_ITERATION = int(os.getenv("SISEP_SOLVER_MAX_ITERATION", "0")) or None
+DEFAULT_NUMBA = os.getenv("SISEP_SOLVER_NUMBA", "1") != "0"
+DEFAULT_BACKEND = os.getenv("SISEP_SOLVER_BACKEND", "auto")
+
+# No modo auto, redes a partir deste número de barras usam o lightsim2grid (se instalado)
+LIGHTSIM_MIN_BUSES = int(os.getenv("SISEP_LIGHTSIM_MIN_BUSES", "1000"))
+
+
+@lru_cache(maxsize=None)
+def module_available(name: str) -> bool:
+    """Indica se um pacote opcional está instalado, sem importá-lo"""
+    return importlib.util.find_spec(name) is not None
+
+
+def build_solver_options(algorithm: Optional[str] = None, tolerance_mva: Optional[float] = None,
+                         max_iteration: Optional[int] = None, numba: Optional[bool] = None,
+                         backend: Optional[str] = None) -> Optional[SolverOptions]:
+    """Valida as opções do solver pedidas na requisição; None se nada foi pedido"""
+    if algorithm is None and tolerance_mva is None and max_iteration is None and numba is None and backend is None:
+        return None
+
+    if algorithm is not None and algorithm not in ALGORITHMS:
+        raise ValueError(f"Algoritmo inválido: {algorithm}. Use {', '.join(ALGORITHMS)}")
+    if backend is not None and backend not in BACKENDS:
+        raise ValueError(f"Backend inválido: {backend}. Use {', '.join(BACKENDS)}")
+    if tolerance_mva is not None and tolerance_mva <= 0:
+        raise ValueError("tolerance_mva deve ser positivo")
+    if max_iteration is not None and max_iteration < 1:
+        raise ValueError("max_iteration deve ser pelo menos 1")
+    if backend == 'lightsim2grid':
+        if not module_available('lightsim2grid'):
+            raise ValueError("O backend lightsim2grid não está instalado no servidor")
+        if (algorithm or DEFAULT_ALGORITHM) not in LIGHTSIM_ALGORITHMS:
+            raise ValueError(f"O backend lightsim2grid aceita apenas o algoritmo {', '.join(LIGHTSIM_ALGORITHMS)}")
+
+    return SolverOptions(algorithm=algorithm, tolerance_mva=tolerance_mva, max_iteration=max_iteration,
+                         numba=numba, backend=backend)
+
+
+def resolve_solver(options: Optional[SolverOptions], n_bus: int) -> SolverOptions:
+    """Completa as opções com os padrões do servidor e escolhe o backend pelo tamanho da rede"""
+    options = options or SolverOptions()
+    algorithm = options.algorithm or DEFAULT_ALGORITHM
+    backend = options.backend or DEFAULT_BACKEND
+    if backend == 'auto':
+        use_lightsim = (algorithm in LIGHTSIM_ALGORITHMS and n_bus >= LIGHTSIM_MIN_BUSES
+                        and module_available('lightsim2grid'))
+        backend = 'lightsim2grid' if use_lightsim else 'pandapower'
+    elif backend == 'lightsim2grid' and not module_available('lightsim2grid'):
+        raise ValueError("O backend lightsim2grid não está instalado no servidor")
+
+    numba = DEFAULT_NUMBA if options.numba is None else options.numba
+    if algorithm == 'dc':
+        # O fluxo DC do pandapower usa o numba sempre que estiver instalado
+        numba = True
+    return SolverOptions(
+        algorithm=algorithm,
+        tolerance_mva=options.tolerance_mva or DEFAULT_TOLERANCE_MVA,
+        max_iteration=options.max_iteration or DEFAULT_MAX_ITERATION,
+        # Sem o numba instalado o pandapower usa a versão Python de qualquer forma
+        numba=numba and module_available('numba'),
+        backend=backend,
+    )
+
+
+def run_power_flow(net, solver: SolverOptions, init: str = "auto") -> str:
+    """Executa o fluxo de potência com as opções resolvidas; retorna o backend que de fato resolveu"""
+    if solver.algorithm == 'dc':
+        pp.rundcpp(net)
+        return 'pandapower'
+
+    pp.runpp(
+        net, algorithm=solver.algorithm, init=init, tolerance_mva=solver.tolerance_mva,
+        max_iteration=solver.max_iteration or "auto", numba=solver.numba,
+        lightsim2grid=solver.backend == 'lightsim2grid',
+    )
+    # O pandapower volta ao solver próprio quando a rede não é compatível com o lightsim2grid
+    return 'lightsim2grid' if net._options.get('lightsim2grid') else 'pandapower'
+
+
+def solver_key(options: Optional[SolverOptions]) -> str:
+    """Sufixo da chave de cache dos resultados com opções de solver da requisição"""
+    return '' if options is None else ':solver=' + options.model_dump_json(exclude_none=True)
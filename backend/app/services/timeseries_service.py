@@ -0,0 +1,208 @@
+import io
+import logging
+import warnings
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+import numpy as np
+from app.services.cache import topology_key
+from app.services.lazy_import import LazyModule
+from app.services.simulation_executor import SimulationExecutor
+
+logger = logging.getLogger(__name__)
+
+pp = LazyModule("pandapower")
+
+# Reaproveitamento das estruturas internas do pandapower entre passos: a
+# topologia e os transformadores não mudam (Ybus mantida), apenas as
+# injeções das cargas (bus_pq) e dos geradores (gen)
+RECYCLE = {"trafo": False, "bus_pq": True, "gen": True}
+
+# Valores por passo gravados em arrays pré alocados (nome -> tabela de origem)
+STEP_FIELDS = ('converged', 'iterations', 'ext_grid_p_mw', 'ext_grid_q_mvar', 'load_p_mw', 'load_q_mvar')
+BUS_FIELDS = ('bus_vm_pu', 'bus_va_degree')
+BRANCH_FIELDS = ('line_loading_percent', 'line_p_from_mw')
+GEN_FIELDS = ('gen_p_mw', 'gen_q_mvar')
+
+
+def read_profile(content: bytes, filename: Optional[str] = None) -> np.ndarray:
+    """Lê um perfil (CSV, .npy ou .npz) como matriz passos x elementos
+
+    No CSV, cada linha é um passo e cada coluna um elemento (ou uma única
+    coluna aplicada a todos); uma linha de cabeçalho é ignorada. No .npz é
+    usado o primeiro array do arquivo.
+    """
+    name = (filename or '').lower()
+    try:
+        if name.endswith('.npy') or content.startswith(b'\x93NUMPY'):
+            profile = np.load(io.BytesIO(content), allow_pickle=False)
+        elif name.endswith('.npz') or content.startswith(b'PK'):
+            with np.load(io.BytesIO(content), allow_pickle=False) as archive:
+                if not archive.files:
+                    raise ValueError("arquivo .npz vazio")
+                profile = archive[archive.files[0]]
+        else:
+            text = content.decode()
+            try:
+                profile = np.loadtxt(io.StringIO(text), delimiter=',', ndmin=2)
+            except ValueError:
+                profile = np.loadtxt(io.StringIO(text), delimiter=',', ndmin=2, skiprows=1)
+    except (ValueError, OSError, UnicodeDecodeError) as e:
+        raise ValueError(f"Perfil inválido ({filename or 'sem nome'}): {str(e)}")
+
+    profile = np.asarray(profile, dtype=float)
+    if profile.ndim == 1:
+        profile = profile[:, None]
+    if profile.ndim != 2 or profile.shape[0] == 0:
+        raise ValueError(f"Perfil inválido ({filename or 'sem nome'}): esperado passos x elementos")
+    return profile
+
+
+def validate_profiles(net, load_profile: Optional[np.ndarray],
+                      gen_profile: Optional[np.ndarray]) -> int:
+    """Confere as dimensões dos perfis em relação à rede e retorna o número de passos"""
+    if load_profile is None and gen_profile is None:
+        raise ValueError("Informe ao menos um perfil (cargas ou geradores)")
+
+    steps = None
+    for label, profile, n_elements in (('cargas', load_profile, len(net.load)),
+                                       ('geradores', gen_profile, len(net.gen))):
+        if profile is None:
+            continue
+        if profile.shape[1] not in (1, n_elements):
+            raise ValueError(
+                f"Perfil de {label} com {profile.shape[1]} colunas; esperado 1 ou {n_elements}"
+            )
+        if not np.isfinite(profile).all() or (profile < 0).any():
+            raise ValueError(f"Perfil de {label} deve conter apenas fatores finitos e não negativos")
+        if steps is not None and profile.shape[0] != steps:
+            raise ValueError("Os perfis de cargas e geradores devem ter o mesmo número de passos")
+        steps = profile.shape[0]
+    return steps
+
+
+def _allocate(steps: int, n_bus: int, n_branch: int, n_gen: int) -> Dict[str, np.ndarray]:
+    """Arrays de resultado pré alocados (NaN indica passo sem solução)"""
+    arrays = {field: np.full(steps, np.nan) for field in STEP_FIELDS}
+    arrays['converged'] = np.zeros(steps, dtype=bool)
+    arrays['iterations'] = np.zeros(steps, dtype=np.int32)
+    arrays.update({field: np.full((steps, n_bus), np.nan) for field in BUS_FIELDS})
+    arrays.update({field: np.full((steps, n_branch), np.nan) for field in BRANCH_FIELDS})
+    arrays.update({field: np.full((steps, n_gen), np.nan) for field in GEN_FIELDS})
+    return arrays
+
+
+def _branch_column(net, line_column: str, trafo_column: str) -> np.ndarray:
+    """Coluna de resultado dos ramos na ordem da lista `lines` (linhas e depois transformadores)"""
+    return np.concatenate([
+        net.res_line[line_column].to_numpy(dtype=float) if len(net.line) else np.empty(0),
+        net.res_trafo[trafo_column].to_numpy(dtype=float) if len(net.trafo) else np.empty(0),
+    ])
+
+
+def run_timeseries(service, net, load_profile: Optional[np.ndarray],
+                   gen_profile: Optional[np.ndarray]) -> Dict[str, np.ndarray]:
+    """Executa o fluxo de potência quase estático para cada passo dos perfis
+
+    A mesma rede é reaproveitada em todos os passos: cada passo apenas
+    multiplica o ``scaling`` original de cargas e geradores pelo fator do
+    perfil, parte da solução do passo anterior e reutiliza a Ybus. Os
+    resultados são gravados diretamente nos arrays, sem montar modelos.
+    """
+    steps = validate_profiles(net, load_profile, gen_profile)
+    n_branch = len(net.line) + len(net.trafo)
+    results = _allocate(steps, len(net.bus), n_branch, len(net.gen))
+
+    base_load_scaling = net.load['scaling'].to_numpy(dtype=float).copy()
+    base_gen_scaling = net.gen['scaling'].to_numpy(dtype=float).copy()
+    key = topology_key(net)
+    warm = service._seed_from_previous(net, key)
+
+    try:
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", category=FutureWarning, module="pandas")
+            warnings.filterwarnings("ignore", category=FutureWarning, module="pandapower")
+
+            for step in range(steps):
+                if load_profile is not None and len(net.load):
+                    net.load['scaling'] = base_load_scaling * load_profile[step]
+                if gen_profile is not None and len(net.gen):
+                    net.gen['scaling'] = base_gen_scaling * gen_profile[step]
+
+                try:
+                    pp.runpp(net, init="results" if warm else "auto", recycle=RECYCLE)
+                except pp.LoadflowNotConverged:
+                    # Passo sem solução: fica como NaN e o próximo parte do perfil plano
+                    logger.debug("Passo %d da série temporal não convergiu", step)
+                    warm = False
+                    continue
+                warm = True
+
+                results['converged'][step] = True
+                results['iterations'][step] = net._ppc.get('iterations') or 0
+                results['bus_vm_pu'][step] = net.res_bus.vm_pu.to_numpy(dtype=float)
+                results['bus_va_degree'][step] = net.res_bus.va_degree.to_numpy(dtype=float)
+                if n_branch:
+                    results['line_loading_percent'][step] = _branch_column(net, 'loading_percent', 'loading_percent')
+                    results['line_p_from_mw'][step] = _branch_column(net, 'p_from_mw', 'p_hv_mw')
+                if len(net.gen):
+                    results['gen_p_mw'][step] = net.res_gen.p_mw.to_numpy(dtype=float)
+                    results['gen_q_mvar'][step] = net.res_gen.q_mvar.to_numpy(dtype=float)
+                if len(net.ext_grid):
+                    results['ext_grid_p_mw'][step] = net.res_ext_grid.p_mw.iloc[0]
+                    results['ext_grid_q_mvar'][step] = net.res_ext_grid.q_mvar.iloc[0]
+                results['load_p_mw'][step] = net.res_load.p_mw.sum() if len(net.load) else 0.0
+                results['load_q_mvar'][step] = net.res_load.q_mvar.sum() if len(net.load) else 0.0
+    finally:
+        # A rede volta ao escalonamento original para o próximo bloco de passos
+        net.load['scaling'] = base_load_scaling
+        net.gen['scaling'] = base_gen_scaling
+
+    if warm:
+        service.warm_start.put(key, net)
+    return results
+
+
+async def stream_timeseries(executor: SimulationExecutor, net, load_profile: Optional[np.ndarray],
+                            gen_profile: Optional[np.ndarray], chunk_size: int) -> AsyncIterator[Tuple[int, Dict[str, np.ndarray]]]:
+    """Executa a série temporal em blocos de passos no pool, devolvendo cada bloco ao terminar"""
+    steps = validate_profiles(net, load_profile, gen_profile)
+    for start in range(0, steps, chunk_size):
+        end = min(start + chunk_size, steps)
+        chunk = await executor.run(
+            "simulate_timeseries", net,
+            load_profile[start:end] if load_profile is not None else None,
+            gen_profile[start:end] if gen_profile is not None else None,
+        )
+        yield start, chunk
+
+
+def chunk_to_json(start: int, chunk: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """Converte um bloco de resultados em dicionário serializável (NaN vira null)"""
+    data: Dict[str, Any] = {'start': start, 'steps': int(len(chunk['converged']))}
+    for field, values in chunk.items():
+        if values.dtype.kind == 'f' and np.isnan(values).any():
+            values = np.where(np.isnan(values), None, values)
+        data[field] = values.tolist()
+    return data
+
+
+async def collect_timeseries(executor: SimulationExecutor, net, load_profile: Optional[np.ndarray],
+                             gen_profile: Optional[np.ndarray], chunk_size: int) -> Dict[str, np.ndarray]:
+    """Executa a série temporal inteira, copiando cada bloco em arrays do tamanho total"""
+    steps = validate_profiles(net, load_profile, gen_profile)
+    results: Dict[str, np.ndarray] = {}
+    async for start, chunk in stream_timeseries(executor, net, load_profile, gen_profile, chunk_size):
+        if not results:
+            results = {
+                field: np.empty((steps,) + values.shape[1:], dtype=values.dtype)
+                for field, values in chunk.items()
+            }
+        for field, values in chunk.items():
+            results[field][start:start + len(values)] = values
+    return results
+
+
+def encode_npz(results: Dict[str, np.ndarray]) -> bytes:
+    """Serializa os resultados da série temporal em um arquivo .npz compactado"""
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **results)
+    return buffer.getvalue()
@@ -0,0 +1,102 @@
+import asyncio
+import codecs
+import os
+from typing import Any, Dict, Optional, Tuple
+from app.services import metrics
+from app.services.cache import ContentHasher
+from app.services.matpower_parser import MatpowerParser
+
+# Tamanho máximo de um arquivo MATPOWER enviado (bytes)
+MAX_UPLOAD_BYTES = int(os.getenv("SISEP_UPLOAD_MAX_BYTES", str(50 * 1024 * 1024)))
+
+# Tamanho dos blocos lidos dos arquivos enviados
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Arquivo enviado maior que o limite configurado (HTTP 413)"""
+
+
+class MatpowerUploadReader:
+    """Lê um caso MATPOWER enviado bloco a bloco
+
+    Cada bloco é decodificado e suas linhas completas seguem direto para o
+    parser e para o hash do conteúdo; apenas a última linha incompleta fica
+    guardada. Erros de formato interrompem a leitura no bloco em que aparecem.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else MAX_UPLOAD_BYTES
+        self.size = 0
+        self.parser = MatpowerParser()
+        self.hasher = ContentHasher()
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._pending = ''
+
+    def feed(self, chunk: bytes):
+        """Processa um bloco de bytes do arquivo"""
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadTooLargeError(f"Arquivo MATPOWER excede o limite de {self.max_bytes} bytes")
+        try:
+            text = self._pending + self._decoder.decode(chunk)
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Arquivo MATPOWER inválido (não é UTF-8): {str(e)}")
+        lines = text.split('\n')
+        self._pending = lines.pop()
+        try:
+            for line in lines:
+                self._feed_line(line)
+        except ValueError as e:
+            raise ValueError(f"Erro ao processar o arquivo MATPOWER: {str(e)}")
+
+    def _feed_line(self, line: str):
+        self.hasher.update_line(line)
+        self.parser.feed_line(line)
+
+    def result(self) -> Tuple[Dict[str, Any], str]:
+        """Processa a última linha e retorna o ppc e o hash do conteúdo"""
+        try:
+            tail = self._pending + self._decoder.decode(b'', final=True)
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Arquivo MATPOWER inválido (não é UTF-8): {str(e)}")
+        self._pending = ''
+        try:
+            if tail:
+                self._feed_line(tail)
+            ppc = self.parser.result()
+        except ValueError as e:
+            raise ValueError(f"Erro ao processar o arquivo MATPOWER: {str(e)}")
+        return ppc, self.hasher.hexdigest()
+
+
+async def read_matpower_upload(file, max_bytes: Optional[int] = None,
+                               chunk_size: int = UPLOAD_CHUNK_SIZE) -> Tuple[Dict[str, Any], str]:
+    """Lê e interpreta um UploadFile em blocos, fora do event loop; retorna o ppc e o hash"""
+    reader = MatpowerUploadReader(max_bytes)
+    if getattr(file, 'size', None) is not None and file.size > reader.max_bytes:
+        raise UploadTooLargeError(f"Arquivo MATPOWER excede o limite de {reader.max_bytes} bytes")
+    with metrics.stage("parse"):
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            await asyncio.to_thread(reader.feed, chunk)
+        return await asyncio.to_thread(reader.result)
+
+
+async def read_upload_bytes(file, max_bytes: Optional[int] = None, chunk_size: int = UPLOAD_CHUNK_SIZE,
+                            label: str = "Arquivo") -> bytes:
+    """Lê um UploadFile inteiro em blocos, interrompendo a leitura acima do limite de tamanho"""
+    max_bytes = max_bytes if max_bytes is not None else MAX_UPLOAD_BYTES
+    if getattr(file, 'size', None) is not None and file.size > max_bytes:
+        raise UploadTooLargeError(f"{label} excede o limite de {max_bytes} bytes")
+    content = bytearray()
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        content += chunk
+        if len(content) > max_bytes:
+            raise UploadTooLargeError(f"{label} excede o limite de {max_bytes} bytes")
+    return bytes(content)
@@ -0,0 +1,170 @@
+"""Compara a conversão de resultados vetorizada com o laço linha a linha original.
+
+Uso (a partir do diretório backend):
+
+    python -m benchmarks.bench_convert_results [--repeat 5] [--buses 2000]
+"""
+import argparse
+import os
+import time
+import warnings
+
+import pandapower as pp
+
+from app.models.power_system_results import (
+    BusResult, LineResult, LoadResult,
+    GeneratorResult, ExtGridResult, PowerSystemResult
+)
+from app.services.matpower_service import MatpowerService
+from benchmarks.synthetic_case import generate_matpower_case
+
+
+def legacy_convert_results(net: pp.pandapowerNet) -> PowerSystemResult:
+    """Cópia da conversão original (linha a linha com .iloc), sem os prints de debug"""
+    buses = []
+    for i in range(len(net.bus)):
+        buses.append(BusResult(
+            bus_id=int(i),
+            vm_pu=float(net.res_bus.vm_pu.iloc[i]),
+            va_degree=float(net.res_bus.va_degree.iloc[i]) if 'va_degree' in net.res_bus.columns else 0.0,
+            p_mw=float(net.res_bus.p_mw.iloc[i]) if 'p_mw' in net.res_bus.columns else 0.0,
+            q_mvar=float(net.res_bus.q_mvar.iloc[i]) if 'q_mvar' in net.res_bus.columns else 0.0
+        ))
+
+    lines = []
+    for i in range(len(net.line)):
+        net.res_line.iloc[i].to_dict()  # avaliado pelo f-string de debug original
+        lines.append(LineResult(
+            from_bus=int(net.line.from_bus.iloc[i]),
+            to_bus=int(net.line.to_bus.iloc[i]),
+            p_from_mw=float(net.res_line.p_from_mw.iloc[i]) if 'p_from_mw' in net.res_line.columns else 0.0,
+            q_from_mvar=float(net.res_line.q_from_mvar.iloc[i]) if 'q_from_mvar' in net.res_line.columns else 0.0,
+            p_to_mw=float(net.res_line.p_to_mw.iloc[i]) if 'p_to_mw' in net.res_line.columns else 0.0,
+            q_to_mvar=float(net.res_line.q_to_mvar.iloc[i]) if 'q_to_mvar' in net.res_line.columns else 0.0,
+            pl_mw=float(net.res_line.pl_mw.iloc[i]) if 'pl_mw' in net.res_line.columns else 0.0,
+            ql_mvar=float(net.res_line.ql_mvar.iloc[i]) if 'ql_mvar' in net.res_line.columns else 0.0,
+            i_from_ka=float(net.res_line.i_from_ka.iloc[i]) if 'i_from_ka' in net.res_line.columns else 0.0,
+            i_to_ka=float(net.res_line.i_to_ka.iloc[i]) if 'i_to_ka' in net.res_line.columns else 0.0,
+            i_ka=float(net.res_line.i_ka.iloc[i]) if 'i_ka' in net.res_line.columns else 0.0,
+            vm_from_pu=float(net.res_line.vm_from_pu.iloc[i]) if 'vm_from_pu' in net.res_line.columns else 0.0,
+            va_from_degree=float(net.res_line.va_from_degree.iloc[i]) if 'va_from_degree' in net.res_line.columns else 0.0,
+            vm_to_pu=float(net.res_line.vm_to_pu.iloc[i]) if 'vm_to_pu' in net.res_line.columns else 0.0,
+            va_to_degree=float(net.res_line.va_to_degree.iloc[i]) if 'va_to_degree' in net.res_line.columns else 0.0,
+            loading_percent=float(net.res_line.loading_percent.iloc[i]) if 'loading_percent' in net.res_line.columns else 0.0,
+            in_service=bool(net.line.in_service.iloc[i])
+        ))
+
+    for i in range(len(net.trafo)):
+        net.res_trafo.iloc[i].to_dict()  # avaliado pelo f-string de debug original
+        lines.append(LineResult(
+            from_bus=int(net.trafo.hv_bus.iloc[i]),
+            to_bus=int(net.trafo.lv_bus.iloc[i]),
+            p_from_mw=float(net.res_trafo.p_hv_mw.iloc[i]) if 'p_hv_mw' in net.res_trafo.columns else 0.0,
+            q_from_mvar=float(net.res_trafo.q_hv_mvar.iloc[i]) if 'q_hv_mvar' in net.res_trafo.columns else 0.0,
+            p_to_mw=float(net.res_trafo.p_lv_mw.iloc[i]) if 'p_lv_mw' in net.res_trafo.columns else 0.0,
+            q_to_mvar=float(net.res_trafo.q_lv_mvar.iloc[i]) if 'q_lv_mvar' in net.res_trafo.columns else 0.0,
+            pl_mw=float(net.res_trafo.pl_mw.iloc[i]) if 'pl_mw' in net.res_trafo.columns else 0.0,
+            ql_mvar=float(net.res_trafo.ql_mvar.iloc[i]) if 'ql_mvar' in net.res_trafo.columns else 0.0,
+            i_from_ka=float(net.res_trafo.i_hv_ka.iloc[i]) if 'i_hv_ka' in net.res_trafo.columns else 0.0,
+            i_to_ka=float(net.res_trafo.i_lv_ka.iloc[i]) if 'i_lv_ka' in net.res_trafo.columns else 0.0,
+            i_ka=max(
+                float(net.res_trafo.i_hv_ka.iloc[i]) if 'i_hv_ka' in net.res_trafo.columns else 0.0,
+                float(net.res_trafo.i_lv_ka.iloc[i]) if 'i_lv_ka' in net.res_trafo.columns else 0.0
+            ),
+            vm_from_pu=float(net.res_trafo.vm_hv_pu.iloc[i]) if 'vm_hv_pu' in net.res_trafo.columns else 0.0,
+            va_from_degree=float(net.res_trafo.va_hv_degree.iloc[i]) if 'va_hv_degree' in net.res_trafo.columns else 0.0,
+            vm_to_pu=float(net.res_trafo.vm_lv_pu.iloc[i]) if 'vm_lv_pu' in net.res_trafo.columns else 0.0,
+            va_to_degree=float(net.res_trafo.va_lv_degree.iloc[i]) if 'va_lv_degree' in net.res_trafo.columns else 0.0,
+            loading_percent=float(net.res_trafo.loading_percent.iloc[i]) if 'loading_percent' in net.res_trafo.columns else 0.0,
+            in_service=bool(net.trafo.in_service.iloc[i])
+        ))
+
+    loads = []
+    for i in range(len(net.load)):
+        loads.append(LoadResult(
+            bus_id=int(net.load.bus.iloc[i]),
+            p_mw=float(net.res_load.p_mw.iloc[i]) if 'p_mw' in net.res_load.columns else 0.0,
+            q_mvar=float(net.res_load.q_mvar.iloc[i]) if 'q_mvar' in net.res_load.columns else 0.0,
+            scaling=float(net.load.scaling.iloc[i]) if 'scaling' in net.load.columns else 1.0
+        ))
+
+    generators = []
+    for i in range(len(net.gen)):
+        generators.append(GeneratorResult(
+            bus_id=int(net.gen.bus.iloc[i]),
+            p_mw=float(net.res_gen.p_mw.iloc[i]) if 'p_mw' in net.res_gen.columns else 0.0,
+            q_mvar=float(net.res_gen.q_mvar.iloc[i]) if 'q_mvar' in net.res_gen.columns else 0.0,
+            vm_pu=float(net.gen.vm_pu.iloc[i]) if 'vm_pu' in net.gen.columns else 1.0,
+            in_service=bool(net.gen.in_service.iloc[i])
+        ))
+
+    ext_grid = None
+    if len(net.ext_grid) > 0:
+        ext_grid = ExtGridResult(
+            bus_id=int(net.ext_grid.bus.iloc[0]),
+            p_mw=float(net.res_ext_grid.p_mw.iloc[0]) if 'p_mw' in net.res_ext_grid.columns else 0.0,
+            q_mvar=float(net.res_ext_grid.q_mvar.iloc[0]) if 'q_mvar' in net.res_ext_grid.columns else 0.0
+        )
+
+    gen_capacity_p = float(net.gen.max_p_mw.sum()) if 'max_p_mw' in net.gen.columns else 0.0
+    gen_capacity_qmin = float(net.gen.min_q_mvar.sum()) if 'min_q_mvar' in net.gen.columns else 0.0
+    gen_capacity_qmax = float(net.gen.max_q_mvar.sum()) if 'max_q_mvar' in net.gen.columns else 0.0
+    if len(net.ext_grid) > 0:
+        gen_capacity_p += net.ext_grid['max_p_mw'].sum() if 'max_p_mw' in net.ext_grid.columns else 0.0
+        gen_capacity_qmin += net.ext_grid['min_q_mvar'].sum() if 'min_q_mvar' in net.ext_grid.columns else 0.0
+        gen_capacity_qmax += net.ext_grid['max_q_mvar'].sum() if 'max_q_mvar' in net.ext_grid.columns else 0.0
+
+    return PowerSystemResult(
+        buses=buses,
+        lines=lines,
+        loads=loads,
+        generators=generators,
+        ext_grid=ext_grid,
+        genCapacityP=gen_capacity_p,
+        genCapacityQmin=gen_capacity_qmin,
+        genCapacityQmax=gen_capacity_qmax,
+        loadSystemP=float(net.load.p_mw.sum()) if len(net.load) > 0 else 0.0,
+        loadSystemQ=float(net.load.q_mvar.sum()) if len(net.load) > 0 else 0.0
+    )
+
+
+def _best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _solved_net(service: MatpowerService, content: str) -> pp.pandapowerNet:
+    net = service._net_from_string(content)
+    pp.runpp(net)
+    return net
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--buses", type=int, nargs="+", default=[2000])
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    service = MatpowerService()
+
+    with open(os.path.join(service.data_dir, "case14p.m")) as f:
+        cases = [("case14p.m", f.read())]
+    cases += [(f"sintético {n} barras", generate_matpower_case(n)) for n in args.buses]
+
+    print(f"{'caso':<24}{'original (ms)':>16}{'vetorizado (ms)':>18}{'ganho':>10}")
+    for name, content in cases:
+        net = _solved_net(service, content)
+        assert legacy_convert_results(net) == service._convert_results(net)
+
+        legacy = _best_of(lambda: legacy_convert_results(net), args.repeat)
+        vectorized = _best_of(lambda: service._convert_results(net), args.repeat)
+        print(f"{name:<24}{legacy * 1e3:>16.2f}{vectorized * 1e3:>18.2f}{legacy / vectorized:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Mede o custo dos logs de debug com o debug desativado.
+
+Compara os prints de debug originais (f-strings com ``to_dict()`` por linha,
+avaliadas mesmo com DEBUG_ENABLED = False) com o logging preguiçoso atual,
+e a conversão de resultados com o logger "app" no nível padrão e com todo o
+logging desligado (``logging.disable``), que deve custar o mesmo.
+
+Uso (a partir do diretório backend):
+
+    python -m benchmarks.bench_debug_logging [--repeat 5] [--buses 2000]
+"""
+import argparse
+import logging
+import time
+import warnings
+
+import pandapower as pp
+
+from app.services.matpower_service import MatpowerService, logger
+from benchmarks.synthetic_case import generate_matpower_case
+
+
+def legacy_debug_statements(net: pp.pandapowerNet, debug_enabled: bool = False):
+    """Mensagens de debug originais: formatadas antes de verificar DEBUG_ENABLED"""
+    def debug_print(message: str):
+        if debug_enabled:
+            print(f"DEBUG: {message}")
+
+    debug_print(f"Colunas disponíveis em res_bus: {list(net.res_bus.columns)}")
+    debug_print(str(net.res_bus.head()))
+    for i in range(len(net.line)):
+        debug_print(f"Linha {i}: {net.res_line.iloc[i].to_dict()}")
+    for i in range(len(net.trafo)):
+        debug_print(f"Transformador {i}: {net.res_trafo.iloc[i].to_dict()}")
+
+
+def lazy_debug_statements(net: pp.pandapowerNet):
+    """Mesmas mensagens com o logging atual: argumentos só avaliados com o debug ativo"""
+    logger.debug("Colunas disponíveis em res_bus: %s", net.res_bus.columns)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s", net.res_bus.head())
+        logger.debug("Dados das linhas: %s", net.res_line.to_dict('records'))
+        logger.debug("Dados dos transformadores: %s", net.res_trafo.to_dict('records'))
+
+
+def _best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--buses", type=int, nargs="+", default=[2000])
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    service = MatpowerService()
+    if logger.isEnabledFor(logging.DEBUG):
+        parser.error("desative o debug (SISEP_DEBUG) para medir o caminho sem debug")
+
+    print(f"{'caso':<24}{'prints (ms)':>14}{'logging (ms)':>15}"
+          f"{'conversão (ms)':>17}{'sem logging (ms)':>19}")
+    for n_buses in args.buses:
+        net = service._net_from_string(generate_matpower_case(n_buses))
+        pp.runpp(net)
+
+        legacy = _best_of(lambda: legacy_debug_statements(net), args.repeat)
+        lazy = _best_of(lambda: lazy_debug_statements(net), args.repeat)
+        convert = _best_of(lambda: service._convert_results(net), args.repeat)
+        logging.disable(logging.CRITICAL)
+        try:
+            convert_disabled = _best_of(lambda: service._convert_results(net), args.repeat)
+        finally:
+            logging.disable(logging.NOTSET)
+
+        print(f"{f'sintético {n_buses} barras':<24}{legacy * 1e3:>14.2f}{lazy * 1e3:>15.4f}"
+              f"{convert * 1e3:>17.2f}{convert_disabled * 1e3:>19.2f}")
+
+
+if __name__ == "__main__":
+    main()
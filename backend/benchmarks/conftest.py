@@ -0,0 +1,126 @@
+"""Infraestrutura da suíte de benchmarks (pytest).
+
+Cada medição é registrada pelo fixture ``bench`` com o melhor tempo de
+``--bench-repeat`` execuções e comparada com o baseline JSON: a medição
+falha se ficar mais lenta que ``--bench-max-slowdown`` vezes o valor de
+referência (diferenças de tempo abaixo de ``--bench-min-delta`` são
+consideradas ruído). Com ``--bench-save`` os valores medidos passam a ser o baseline.
+"""
+import json
+import os
+import platform
+import statistics
+import time
+from typing import Callable, Dict
+
+import pytest
+
+# Pool de simulações em threads, qualquer que seja o número de núcleos: as medições
+# limpam os caches do serviço do processo principal, e o baseline vem deste modo
+os.environ["SISEP_EXECUTOR_MODE"] = "thread"
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("sisep-bench", "benchmarks do SISEP")
+    group.addoption("--bench-baseline", default=os.getenv("SISEP_BENCH_BASELINE", DEFAULT_BASELINE),
+                    help="arquivo JSON com os valores de referência")
+    group.addoption("--bench-save", action="store_true",
+                    help="grava os valores medidos como novo baseline")
+    group.addoption("--bench-max-slowdown", type=float,
+                    default=float(os.getenv("SISEP_BENCH_MAX_SLOWDOWN", "1.5")),
+                    help="razão máxima admitida entre o valor medido e o baseline")
+    group.addoption("--bench-min-delta", type=float,
+                    default=float(os.getenv("SISEP_BENCH_MIN_DELTA", "0.001")),
+                    help="diferença mínima (s) para considerar uma piora de tempo")
+    group.addoption("--bench-repeat", type=int, default=int(os.getenv("SISEP_BENCH_REPEAT", "5")),
+                    help="execuções por medição (vale a melhor)")
+
+
+class BenchRecorder:
+    """Guarda as medições da sessão e as compara com o baseline"""
+
+    def __init__(self, config):
+        self.path = config.getoption("--bench-baseline")
+        self.save = config.getoption("--bench-save")
+        self.max_slowdown = config.getoption("--bench-max-slowdown")
+        self.min_delta = config.getoption("--bench-min-delta")
+        self.repeat = max(1, config.getoption("--bench-repeat"))
+        self.results: Dict[str, Dict[str, object]] = {}
+        self.baseline: Dict[str, Dict[str, object]] = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.baseline = json.load(f).get("results", {})
+
+    def record(self, name: str, value: float, unit: str = "s", higher_is_better: bool = False, **extra):
+        """Registra uma medição; falha se piorou além do limite em relação ao baseline"""
+        self.results[name] = {"value": value, "unit": unit, "higher_is_better": higher_is_better, **extra}
+        reference = self.baseline.get(name)
+        if self.save or reference is None or not reference.get("value"):
+            return
+        ratio = reference["value"] / value if higher_is_better else value / reference["value"]
+        if unit == "s" and value - reference["value"] < self.min_delta:
+            return
+        if ratio > self.max_slowdown:
+            pytest.fail(
+                f"{name}: {value:.6g} {unit} contra {reference['value']:.6g} {unit} no baseline "
+                f"({ratio:.2f}x pior; limite {self.max_slowdown:g}x)",
+                pytrace=False,
+            )
+
+    def time(self, name: str, func: Callable[[], object], repeat: int = None, **extra) -> float:
+        """Executa ``func`` várias vezes e registra o melhor tempo (s)"""
+        timings = []
+        for _ in range(repeat or self.repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        self.record(name, best, median=statistics.median(timings), **extra)
+        return best
+
+    def write(self):
+        import pandapower
+        document = {
+            "machine": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "processor": platform.processor() or platform.machine(),
+                "cpu_count": os.cpu_count(),
+                "pandapower": pandapower.__version__,
+            },
+            "results": dict(sorted({**self.baseline, **self.results}.items())),
+        }
+        with open(self.path, "w") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+
+
+@pytest.fixture(scope="session")
+def bench(request) -> BenchRecorder:
+    recorder = BenchRecorder(request.config)
+    request.config._sisep_bench = recorder
+    return recorder
+
+
+def pytest_sessionfinish(session):
+    recorder = getattr(session.config, "_sisep_bench", None)
+    if recorder is not None and recorder.save and recorder.results:
+        recorder.write()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    recorder = getattr(config, "_sisep_bench", None)
+    if recorder is None or not recorder.results:
+        return
+    terminalreporter.section("benchmarks SISEP")
+    terminalreporter.write_line(f"{'medição':<48}{'valor':>14}{'baseline':>14}{'razão':>8}")
+    for name, result in recorder.results.items():
+        reference = recorder.baseline.get(name, {}).get("value")
+        value = result["value"]
+        ratio = f"{value / reference:.2f}" if reference else "-"
+        baseline = f"{reference:.6g}" if reference else "-"
+        terminalreporter.write_line(f"{name:<48}{value:>14.6g}{baseline:>14}{ratio:>8} {result['unit']}")
+    if recorder.save:
+        terminalreporter.write_line(f"baseline gravado em {recorder.path}")
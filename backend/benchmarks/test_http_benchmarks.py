@@ -0,0 +1,140 @@
+"""Latência e vazão de ponta a ponta pela API.
+
+Mede requisições isoladas pelo TestClient e a aplicação servida pelo
+uvicorn sob carga concorrente (``SISEP_BENCH_CONCURRENCY`` clientes
+enviando ``SISEP_BENCH_REQUESTS`` requisições no total): o modelo do
+catálogo (corpo pré calculado) e envios sempre diferentes, que passam
+pelo pipeline completo de simulação.
+"""
+import asyncio
+import itertools
+import os
+import socket
+import statistics
+import threading
+import time
+
+import httpx
+import pytest
+import uvicorn
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routes.simulation_routes import matpower_service, simulation_executor
+from benchmarks.synthetic_case import generate_matpower_case
+
+CONCURRENCY = int(os.getenv("SISEP_BENCH_CONCURRENCY", "16"))
+REQUESTS = int(os.getenv("SISEP_BENCH_REQUESTS", "200"))
+
+# Caso servido em todas as medições de carga
+CASE = "case14p.m"
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 120
+        while client.get("/health/ready").status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        yield client
+
+
+def test_testclient_latency(bench, client):
+    def get_case():
+        assert client.get(f"/sisep/matpower/{CASE}").status_code == 200
+
+    content = generate_matpower_case(1000)
+
+    def upload_uncached():
+        # Sem o cache de resultados: mede parse, rede, solver e serialização
+        matpower_service.result_cache.clear()
+        response = client.post("/sisep/simulate/matpower/upload",
+                               files={"file": ("synthetic1000.m", content.encode(), "text/plain")})
+        assert response.status_code == 200
+
+    bench.time(f"http_get[{CASE}]", get_case)
+    bench.time("http_upload[synthetic1000]", upload_uncached)
+
+
+class _Server(uvicorn.Server):
+    """Servidor uvicorn em uma thread, em uma porta livre"""
+
+    def install_signal_handlers(self):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    server = _Server(uvicorn.Config(app, log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/health/ready").status_code == 200:
+                break
+        except httpx.TransportError:
+            pass
+        time.sleep(0.05)
+    yield url
+    server.should_exit = True
+    thread.join(timeout=10)
+    sock.close()
+
+
+def _unique_uploads():
+    """Envios do CASE com baseMVA diferente a cada requisição: nenhum é atendido pelo cache de resultados"""
+    with open(os.path.join(DATA_DIR, CASE)) as f:
+        content = f.read()
+    counter = itertools.count()
+
+    def send(http: httpx.AsyncClient):
+        variant = content.replace("mpc.baseMVA = 100;", f"mpc.baseMVA = {100 + next(counter) * 1e-6:.6f};")
+        return http.post("/sisep/simulate/matpower/upload", files={"file": (CASE, variant.encode(), "text/plain")})
+    return send
+
+
+async def _load(url: str, send, concurrency: int):
+    """Dispara as requisições (``send(http)``) com ``concurrency`` clientes e retorna as latências e o tempo total"""
+    latencies = []
+    queue = asyncio.Queue()
+    for _ in range(REQUESTS):
+        queue.put_nowait(send)
+
+    async def worker(http: httpx.AsyncClient):
+        while not queue.empty():
+            request = queue.get_nowait()
+            start = time.perf_counter()
+            response = await request(http)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as http:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(http) for _ in range(concurrency)))
+        return latencies, time.perf_counter() - start
+
+
+# As simulações passam pelo pool, que recusa (503) o que excede max_pending: os
+# envios sem cache usam no máximo esse número de clientes, saturando o pool sem recusas
+@pytest.mark.parametrize("send, label, concurrency", [
+    (lambda http: http.get(f"/sisep/matpower/{CASE}"), CASE, CONCURRENCY),
+    (lambda http: http.get(f"/sisep/matpower/{CASE}?format=columnar"), f"{CASE}-columnar", CONCURRENCY),
+    (_unique_uploads(), f"{CASE}-upload-uncached", min(CONCURRENCY, simulation_executor.max_pending)),
+])
+def test_uvicorn_concurrent_load(bench, server_url, send, label, concurrency):
+    latencies, elapsed = asyncio.run(_load(server_url, send, concurrency))
+    latencies.sort()
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+
+    bench.record(f"uvicorn_p50[{label}]", statistics.median(latencies), concurrency=concurrency)
+    bench.record(f"uvicorn_p95[{label}]", p95, concurrency=concurrency)
+    bench.record(f"uvicorn_throughput[{label}]", len(latencies) / elapsed, unit="req/s",
+                 higher_is_better=True, concurrency=concurrency)
@@ -0,0 +1,58 @@
+"""Tempo de cada etapa da simulação para os modelos de data/ e casos sintéticos.
+
+Etapas: leitura das matrizes (parse ou, do caso compilado, load_compiled),
+correção do baseKV, montagem da rede
+(from_ppc), fluxo de potência (runpp, partida plana) e conversão dos
+resultados (_convert_results).
+"""
+import os
+import warnings
+
+import pytest
+
+from app.services import compiled_case
+from app.services.matpower_parser import fix_zero_basekv, parse_matpower
+from app.services.matpower_service import MatpowerService, pp, pypower_converter
+from benchmarks.synthetic_case import generate_matpower_case
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+# Tamanhos dos casos sintéticos (barras), ex: SISEP_BENCH_SYNTHETIC_BUSES=1000,5000
+SYNTHETIC_BUSES = [int(n) for n in os.getenv("SISEP_BENCH_SYNTHETIC_BUSES", "1000,3000").split(",") if n]
+
+
+def _cases():
+    cases = []
+    for filename in sorted(os.listdir(DATA_DIR)):
+        if filename.endswith(".m"):
+            with open(os.path.join(DATA_DIR, filename)) as f:
+                cases.append(pytest.param(filename, f.read(), id=filename))
+    for n_buses in SYNTHETIC_BUSES:
+        cases.append(pytest.param(f"synthetic{n_buses}", generate_matpower_case(n_buses), id=f"synthetic{n_buses}"))
+    return cases
+
+
+@pytest.fixture(scope="module")
+def service():
+    return MatpowerService()
+
+
+@pytest.mark.parametrize("case, content", _cases())
+def test_pipeline_stages(bench, service, case, content, tmp_path):
+    warnings.simplefilter("ignore", FutureWarning)
+
+    bench.time(f"parse[{case}]", lambda: parse_matpower(content, fix_basekv=False))
+    bus = parse_matpower(content, fix_basekv=False)['bus']
+    bench.time(f"basekv_fix[{case}]", lambda: fix_zero_basekv(bus.copy()))
+
+    ppc = parse_matpower(content)
+    compiled = str(tmp_path / f"{case}.npz")
+    compiled_case.write_compiled(compiled, ppc)
+    bench.time(f"load_compiled[{case}]", lambda: compiled_case.load_compiled(compiled))
+    bench.time(f"build_net[{case}]", lambda: pypower_converter.from_ppc(ppc, f_hz=50))
+
+    net = service._net_from_string(content)
+    bench.time(f"runpp[{case}]", lambda: pp.runpp(net, init="flat"))
+    bench.time(f"convert[{case}]", lambda: service._convert_results(net))
+
+    assert net.converged
@@ -0,0 +1,5 @@
+import os
+
+# Os testes das rotas alteram o serviço do processo principal; com mais de um
+# núcleo o modo auto usaria processos, então o pool da aplicação fica em threads
+os.environ.setdefault("SISEP_EXECUTOR_MODE", "thread")
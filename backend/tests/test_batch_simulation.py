@@ -0,0 +1,38 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+def test_batch_streams_one_result_per_scenario():
+    base = client.get("/sisep/matpower/case4p.m").json()
+    response = client.post("/sisep/simulate/batch", json={
+        "filename": "case4p.m",
+        "scenarios": [
+            {"name": "base"},
+            {"name": "carga +20%", "load_scaling": 1.2},
+            {"name": "linha 2 desligada", "branches": [{"index": 2, "in_service": False}]},
+            {"name": "barra inexistente", "loads": [{"bus_id": 99, "p_mw": 10}]},
+        ],
+    })
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    results = {item["name"]: item for item in map(json.loads, response.text.splitlines())}
+    assert len(results) == 4
+
+    base_vm = [bus["vm_pu"] for bus in results["base"]["result"]["buses"]]
+    assert base_vm == pytest.approx([bus["vm_pu"] for bus in base["buses"]])
+    scaled = results["carga +20%"]["result"]
+    assert all(load["scaling"] == 1.2 for load in scaled["loads"])
+    assert sum(l["p_mw"] for l in scaled["loads"]) > sum(l["p_mw"] for l in base["loads"])
+    outage = results["linha 2 desligada"]["result"]
+    assert outage["lines"][2]["in_service"] is False
+    assert outage["lines"][2]["p_from_mw"] == 0.0
+    assert results["barra inexistente"]["status"] == "error"
+    assert "99" in results["barra inexistente"]["detail"]
+
+def test_batch_requires_a_single_case_source():
+    response = client.post("/sisep/simulate/batch", json={"scenarios": [{}]})
+    assert response.status_code == 422
@@ -0,0 +1,119 @@
+import copy
+import os
+import shutil
+import pandas as pd
+import pytest
+from app.services.cache import LRUCache, ResultCache, content_hash, topology_key
+from app.models.scenario_models import ScenarioDelta
+from app.services.matpower_service import MatpowerService
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "../data")
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "a" passa a ser o mais recente
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+
+def test_network_cache_invalidated_when_file_changes(tmp_path):
+    shutil.copy(os.path.join(DATA_DIR, "case3p.m"), tmp_path / "case3p.m")
+    service = MatpowerService()
+    service.data_dir = str(tmp_path)
+    assert service.compiled_dir == str(tmp_path / "compiled")
+
+    first = service.simulate_from_filename("case3p.m")
+    second = service.simulate_from_filename("case3p.m")
+    # A segunda simulação parte da solução da primeira (mesma topologia)
+    assert second.solver.warm_start
+    assert [b.vm_pu for b in second.buses] == pytest.approx([b.vm_pu for b in first.buses])
+    assert service.net_cache.stats()["hits"] == 1
+
+    # Alterar a carga da barra 3 (e o tamanho do arquivo) força nova conversão
+    content = (tmp_path / "case3p.m").read_text()
+    (tmp_path / "case3p.m").write_text(content.replace("3 1 40 30", "3 1 45.5 30"))
+
+    changed = service.simulate_from_filename("case3p.m")
+    stats = service.net_cache.stats()
+    assert stats["invalidations"] == 1
+    assert stats["misses"] == 2
+    assert changed.loadSystemP == first.loadSystemP + 5.5
+
+def test_result_cache_ignores_formatting_and_survives_restart(tmp_path):
+    with open(os.path.join(DATA_DIR, "case3p.m")) as f:
+        content = f.read()
+    # Mesmo caso com comentários extras e quebras de linha Windows
+    variant = "% cenário reaberto\r\n" + content.replace("\n", "   \r\n")
+
+    service = MatpowerService()
+    service.result_cache = ResultCache(max_size=4, disk_dir=str(tmp_path))
+    first, first_hit = service.simulate_columns_from_string(content)
+    second, second_hit = service.simulate_columns_from_string(variant)
+    assert (first_hit, second_hit) == (False, True)
+    # O resultado do cache é o mesmo, com o solver marcado como reaproveitado
+    assert second["solver"]["cached"] and not first["solver"]["cached"]
+    assert first == {**second, "solver": {**second["solver"], "cached": False}}
+
+    # Nova instância (ex: reinício do servidor) lê o resultado do disco
+    restarted = ResultCache(max_size=4, disk_dir=str(tmp_path))
+    assert restarted.get(content_hash(content)) == first
+    assert restarted.stats()["backend_hits"] == 1
+
+def test_upload_reports_cache_status_in_headers():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    client = TestClient(app)
+    with open(os.path.join(DATA_DIR, "case4p.m"), "rb") as f:
+        content = f.read()
+
+    statuses = []
+    for _ in range(2):
+        response = client.post("/sisep/simulate/matpower/upload",
+                               files={"file": ("case4p.m", content, "text/plain")})
+        assert response.status_code == 200
+        statuses.append(response.headers["X-Cache"])
+    assert statuses == ["MISS", "HIT"]
+    assert response.headers["X-Cache-Key"] == content_hash(content.decode())
+
+def test_warm_start_reuses_previous_solution_of_same_topology():
+    service = MatpowerService()
+    net = service.load_case_net("case14p.m")
+
+    cold = service.simulate_scenario(net, ScenarioDelta())
+    warm = service.simulate_scenario(net, ScenarioDelta(load_scaling=1.02))
+    assert cold.solver.warm_start is False
+    assert warm.solver.warm_start is True
+    assert warm.solver.iterations <= cold.solver.iterations
+
+    # Mesmo cenário com partida plana: mesma solução
+    service.warm_start.clear()
+    flat = service.simulate_scenario(net, ScenarioDelta(load_scaling=1.02))
+    assert flat.solver.warm_start is False
+    assert [b.vm_pu for b in warm.buses] == pytest.approx([b.vm_pu for b in flat.buses], abs=1e-8)
+
+    # Desligar um ramo muda a topologia: não há solução anterior para reaproveitar
+    outage = service.simulate_scenario(net, ScenarioDelta(branches=[{"index": 0, "in_service": False}]))
+    assert outage.solver.warm_start is False
+
+def test_warm_start_falls_back_to_flat_start_when_diverging():
+    service = MatpowerService()
+    net = service.load_case_net("case14p.m")
+    expected = service.simulate_scenario(net, ScenarioDelta())
+
+    # Solução anterior inválida: a partida a quente diverge e o fluxo é refeito
+    bad = copy.deepcopy(net)
+    bad.res_bus = pd.DataFrame({"vm_pu": 0.05, "va_degree": 170.0}, index=net.bus.index)
+    service.warm_start.put(topology_key(net), bad)
+
+    result = service.simulate_scenario(net, ScenarioDelta())
+    assert result.solver.warm_start is False
+    assert [b.vm_pu for b in result.buses] == pytest.approx([b.vm_pu for b in expected.buses])
@@ -0,0 +1,114 @@
+import pytest
+from app.services import cache_backends
+from app.services.cache_backends import CacheBackend, FileBackend, MemoryBackend, SQLiteBackend, create_backend, redis
+from app.services.cache import NetworkCache
+from app.services.matpower_service import MatpowerService
+from app.services.session_store import SessionStore
+
+@pytest.fixture(params=["memory", "file", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend()
+    if request.param == "file":
+        return FileBackend(str(tmp_path / "cache"))
+    return SQLiteBackend(str(tmp_path / "cache.db"))
+
+def test_backend_stores_expires_and_deletes(backend):
+    backend.set("result:a", b"\x00valor")
+    backend.set("result:b", b"antigo", ttl=-1)
+    assert backend.get("result:a") == b"\x00valor"
+    assert backend.get("result:b") is None
+    backend.delete("result:a")
+    assert backend.get("result:a") is None
+    assert backend.stats()["hits"] == 1
+
+def test_incomplete_backend_cannot_be_created_and_clear_errors_are_counted(tmp_path):
+    class GetOnly(CacheBackend):
+        def _get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
+
+    backend = FileBackend(str(tmp_path / "cache"))
+    backend.directory = str(tmp_path / "removido")
+    backend.clear()
+    assert backend.stats()["errors"] == 1
+
+def test_create_backend_parses_configuration(tmp_path):
+    assert create_backend(None) is None
+    assert isinstance(create_backend("memory"), MemoryBackend)
+    assert isinstance(create_backend(f"file:{tmp_path}"), FileBackend)
+    assert isinstance(create_backend(f"sqlite:{tmp_path / 'c.db'}"), SQLiteBackend)
+    with pytest.raises(ValueError):
+        create_backend("mongodb://localhost")
+    if redis is None:
+        with pytest.raises(ValueError):
+            create_backend("redis://localhost:6379/0")
+
+def test_workers_share_results_and_networks(tmp_path, monkeypatch):
+    # Dois serviços (como dois workers) com o mesmo arquivo SQLite
+    monkeypatch.setattr(MatpowerService, "CACHE_BACKEND", f"sqlite:{tmp_path / 'shared.db'}")
+    monkeypatch.setattr(cache_backends, "CACHE_SECRET", "segredo")
+    first, second = MatpowerService(), MatpowerService()
+
+    with open(first.case_path("case9p.m")) as f:
+        content = f.read()
+    columns, cache_hit = first.simulate_columns_from_string(content)
+    shared, cache_hit = second.simulate_columns_from_string(content)
+    assert cache_hit and shared["buses"] == columns["buses"] and shared["solver"]["cached"]
+    assert second.result_cache.stats()["backend_hits"] == 1
+
+    first.load_case_net("case9p.m")
+    net = second.load_case_net("case9p.m")
+    assert len(net.bus) == 9
+    assert second.net_cache.stats()["backend_hits"] == 1
+
+def test_sessions_follow_revisions_across_workers():
+    backend = MemoryBackend()
+    service = MatpowerService()
+    first, second = SessionStore(backend=backend), SessionStore(backend=backend)
+
+    session = first.create("case9p.m", service.load_case_net("case9p.m"))
+    first.save(session)
+
+    other = second.get(session.session_id)
+    assert other is not session and other.revision == 0
+    other.revision += 1
+    second.save(other)
+    assert first.get(session.session_id).revision == 1
+
+    # Remover (em um worker que não tem a sessão) não desserializa a rede gravada
+    third = SessionStore(backend=backend)
+    assert third.delete(session.session_id)
+    assert third.backend_loads == 0 and not third.delete(session.session_id)
+    assert first.get(session.session_id) is None
+
+def test_objects_in_shared_backends_require_a_valid_signature(tmp_path):
+    unsigned = SQLiteBackend(str(tmp_path / "cache.db"))
+    assert not unsigned.stores_objects
+    unsigned.set_object("net:a", {"bus": 1})
+    assert unsigned.get("net:a") is None and unsigned.get_object("net:a") is None
+
+    signed = SQLiteBackend(str(tmp_path / "cache.db"), secret="segredo")
+    signed.set_object("net:a", {"bus": 1})
+    assert signed.get_object("net:a") == {"bus": 1}
+
+    # Conteúdo gravado por quem não tem a chave não é desserializado
+    other = SQLiteBackend(str(tmp_path / "cache.db"), secret="outro")
+    other.set_object("net:a", {"bus": 2})
+    assert signed.get_object("net:a") is None and signed.stats()["rejected"] == 1
+    signed.set("net:b", b"\x00" * 32 + b"cos\nsystem\n(S'true'\ntR.")
+    assert signed.get_object("net:b") is None and signed.stats()["rejected"] == 2
+
+def test_network_entries_of_changed_files_are_removed_and_expire():
+    backend = MemoryBackend()
+    cache = NetworkCache(backend=backend, ttl=60)
+    cache.put("/data/case9p.m", (1, 100), {"versão": 1})
+    cache.put("/data/case9p.m", (2, 110), {"versão": 2})
+    assert backend.get_object("net:case9p.m:1:100") is None
+    assert backend.get_object("net:case9p.m:2:110") == {"versão": 2}
+
+    expiring = NetworkCache(backend=backend, ttl=-1)
+    expiring.put("/data/case3p.m", (1, 50), {"versão": 1})
+    assert backend.get_object("net:case3p.m:1:50") is None
@@ -0,0 +1,59 @@
+import os
+import shutil
+import time
+from fastapi.testclient import TestClient
+from app.main import app
+from app.routes.simulation_routes import case_catalog
+from app.services.case_catalog import CaseCatalog
+from app.services.matpower_service import MatpowerService
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "../data")
+
+def test_catalog_tracks_added_changed_and_removed_files(tmp_path):
+    for name in ("case3p.m", "case9p.m"):
+        shutil.copy(os.path.join(DATA_DIR, name), tmp_path / name)
+    service = MatpowerService()
+    service.data_dir = str(tmp_path)
+    assert service.compiled_dir == str(tmp_path / "compiled")
+    catalog = CaseCatalog(service)
+
+    assert catalog.refresh() == {"added": 2, "updated": 0, "removed": 0}
+    info = {case.filename: case for case in catalog.cases()}
+    assert (info["case9p.m"].buses, info["case9p.m"].branches, info["case9p.m"].generators) == (9, 9, 3)
+    assert catalog.lookup("case3p.m").result.loadSystemP == info_load(catalog, "case3p.m")
+    assert catalog.refresh() == {"added": 0, "updated": 0, "removed": 0}
+
+    # Arquivo alterado não é servido desatualizado, mesmo antes da nova verificação
+    content = (tmp_path / "case3p.m").read_text()
+    (tmp_path / "case3p.m").write_text(content.replace("3 1 40 30", "3 1 45.5 30"))
+    assert catalog.lookup("case3p.m") is None
+    os.remove(tmp_path / "case9p.m")
+    assert catalog.refresh() == {"added": 0, "updated": 1, "removed": 1}
+    assert catalog.files() == ["case3p.m"]
+    assert catalog.lookup("case3p.m").result.loadSystemP == info_load(catalog, "case3p.m")
+
+def info_load(catalog, filename):
+    return sum(catalog.lookup(filename).columns["loads"]["p_mw"])
+
+def test_startup_preloads_catalog_and_serves_from_memory():
+    with TestClient(app) as client:
+        # O catálogo é carregado em segundo plano; /health/ready indica o fim
+        deadline = time.monotonic() + 120
+        while client.get("/health/ready").status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert case_catalog.loaded
+        files = client.get("/sisep/matpower/files").json()
+        assert files == sorted(f for f in os.listdir(DATA_DIR) if f.endswith(".m"))
+
+        catalog = {case["filename"]: case for case in client.get("/sisep/matpower/catalog").json()}
+        assert catalog["case14p.m"]["buses"] == 14
+        # As respostas dos formatos são montadas no carregamento, não na primeira requisição
+        assert {"rows", "columnar"} <= set(case_catalog.lookup("case14p.m").bodies)
+
+        hits = case_catalog.hits
+        response = client.get("/sisep/matpower/case14p.m")
+        assert response.status_code == 200
+        assert len(response.json()["buses"]) == 14
+        response = client.get("/sisep/matpower/case14p.m", params={"format": "columnar"})
+        assert response.json()["format"] == "columnar"
+        assert case_catalog.hits == hits + 2
@@ -0,0 +1,74 @@
+import os
+import shutil
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services import compiled_case
+from app.services.matpower_parser import parse_matpower
+from app.services.matpower_service import MatpowerService
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "../data")
+
+client = TestClient(app)
+
+def _service(data_dir):
+    service = MatpowerService()
+    # Os casos compilados ficam em data_dir/compiled
+    service.data_dir = str(data_dir)
+    return service
+
+def test_compiled_case_is_memory_mapped_without_copy(tmp_path):
+    with open(os.path.join(DATA_DIR, "case14p.m")) as f:
+        ppc = parse_matpower(f.read())
+    path = str(tmp_path / "case14p.npz")
+    compiled_case.write_compiled(path, ppc, source="case14p.m", source_signature=(1, 2))
+
+    loaded, meta = compiled_case.load_compiled(path)
+    assert meta["source"] == "case14p.m" and loaded["baseMVA"] == ppc["baseMVA"]
+    for name in ("bus", "gen", "branch"):
+        assert np.array_equal(loaded[name], ppc[name])
+        assert isinstance(loaded[name].base, np.memmap)
+        assert loaded[name].ctypes.data % compiled_case.ALIGNMENT == 0
+    # Cópia na escrita: o arquivo não é alterado
+    loaded["bus"][0, 0] = 99
+    assert compiled_case.load_compiled(path)[0]["bus"][0, 0] == ppc["bus"][0, 0]
+    # Continua legível pelo np.load
+    assert np.array_equal(np.load(path)["branch"], ppc["branch"])
+    assert compiled_case.is_current(path, (1, 2)) and not compiled_case.is_current(path, (1, 3))
+
+def test_compiled_case_is_regenerated_when_source_changes(tmp_path):
+    shutil.copy(os.path.join(DATA_DIR, "case9p.m"), tmp_path / "case9p.m")
+    text = _service(tmp_path).simulate_columns_from_filename("case9p.m")
+    compiled = tmp_path / "compiled" / "case9p.npz"
+    assert compiled.exists()
+
+    # Um novo serviço (sem rede em cache) carrega o caso compilado
+    from_compiled = _service(tmp_path).simulate_columns_from_filename("case9p.m")
+    assert from_compiled["buses"]["vm_pu"] == pytest.approx(text["buses"]["vm_pu"])
+    assert from_compiled["lines"]["loading_percent"] == pytest.approx(text["lines"]["loading_percent"])
+
+    source = tmp_path / "case9p.m"
+    source.write_text(source.read_text().replace("mpc.baseMVA = 100;", "mpc.baseMVA = 100;\n"))
+    signature = compiled_case.read_meta(str(compiled))["source_signature"]
+    _service(tmp_path).load_case_net("case9p.m")
+    assert compiled_case.read_meta(str(compiled))["source_signature"] != signature
+
+    # Um .npz no diretório de dados é servido como modelo
+    shutil.copy(compiled, tmp_path / "case9c.npz")
+    service = _service(tmp_path)
+    assert service.list_available_files() == ["case9c.npz", "case9p.m"]
+    assert service.simulate_columns_from_filename("case9c.npz")["buses"]["vm_pu"] == pytest.approx(text["buses"]["vm_pu"])
+
+def test_compile_endpoint():
+    response = client.post("/sisep/matpower/compile", params={"filename": "case3p.m", "force": True})
+    assert response.status_code == 200
+    [case] = response.json()
+    assert case["regenerated"] and case["compiled"] == os.path.join("compiled", "case3p.npz")
+    assert {"bus", "gen", "branch"} <= set(case["arrays"])
+
+    response = client.post("/sisep/matpower/compile", params={"filename": "case3p.m"})
+    assert response.json()[0]["regenerated"] is False
+
+    response = client.post("/sisep/matpower/compile", params={"filename": "case3p.npz"})
+    assert response.status_code == 400
@@ -0,0 +1,67 @@
+import os
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.scenario_models import ScenarioDelta
+from app.services.matpower_service import MatpowerService
+
+client = TestClient(app)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "../data")
+
+def test_contingency_screening_selects_critical_outages():
+    response = client.get("/sisep/contingency/case9p.m")
+    assert response.status_code == 200
+    analysis = response.json()
+
+    # 9 ramos + 2 geradores (fora a barra slack)
+    assert analysis["total"] == 11
+    assert analysis["ac_solved"] < analysis["total"]
+    assert analysis["base"]["overloaded_lines"] == []
+    statuses = [c["status"] for c in analysis["contingencies"]]
+    assert statuses.count("islanding") == 3
+    for contingency in analysis["contingencies"]:
+        if contingency["status"] == "ok":
+            assert contingency["dc_loading_percent"] >= analysis["screening_threshold"]
+            assert contingency["max_loading_percent"] is not None
+
+def test_contingency_ranked_by_loading_and_matches_ac_outage():
+    response = client.get("/sisep/contingency/case9p.m", params={"screening_threshold": 0})
+    analysis = response.json()
+    solved = [c for c in analysis["contingencies"] if c["status"] == "ok"]
+    assert analysis["ac_solved"] == len(solved) == 8
+
+    loadings = [c["max_loading_percent"] for c in solved]
+    assert loadings == sorted(loadings, reverse=True)
+
+    # O resultado da contingência é o mesmo de simular a saída do ramo
+    worst = solved[0]
+    assert worst["outage_type"] == "branch"
+    batch = client.post("/sisep/simulate/batch", json={
+        "filename": "case9p.m",
+        "scenarios": [{"branches": [{"index": worst["element"], "in_service": False}]}],
+    })
+    result = batch.json()["result"]
+    expected = max(line["loading_percent"] for line in result["lines"])
+    assert expected == pytest.approx(worst["max_loading_percent"])
+    assert 8 in worst["voltage_violations"]
+
+def test_contingency_upload_and_invalid_limits():
+    with open(os.path.join(DATA_DIR, "case4p.m"), "rb") as f:
+        response = client.post("/sisep/contingency/upload", files={"file": ("case4p.m", f, "text/plain")})
+    assert response.status_code == 200
+    assert response.json()["total"] > 0
+
+    response = client.get("/sisep/contingency/case9p.m", params={"vm_min": 1.1, "vm_max": 1.0})
+    assert response.status_code == 400
+
+def test_outages_start_from_base_case_without_filling_warm_start():
+    service = MatpowerService()
+    net = service.load_case_net("case9p.m")
+    analysis, seed = service.screen_contingencies(net, 100.0, 0.9, 1.1, 0)
+    before = service.warm_start.stats()["size"]
+
+    branch = next(c for c in analysis.contingencies if c.status == "ok" and c.outage_type == "branch")
+    result = service.simulate_outage(net, ScenarioDelta(branches=[{"index": branch.element, "in_service": False}]), seed)
+    assert result.solver.warm_start
+    assert service.warm_start.stats()["size"] == before
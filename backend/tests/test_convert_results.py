@@ -0,0 +1,50 @@
+import logging
+import os
+import pytest
+import pandapower as pp
+import pandas as pd
+from app.services.matpower_service import MatpowerService
+from benchmarks.bench_convert_results import legacy_convert_results
+from benchmarks.synthetic_case import generate_matpower_case
+
+service = MatpowerService()
+CASES = sorted(f for f in os.listdir(service.data_dir) if f.endswith(".m"))
+
+def _solved_net(content):
+    net = service._net_from_string(content)
+    pp.runpp(net)
+    return net
+
+@pytest.mark.parametrize("filename", CASES)
+def test_vectorized_conversion_matches_row_by_row(filename):
+    with open(os.path.join(service.data_dir, filename)) as f:
+        net = _solved_net(f.read())
+
+    assert service._convert_results(net) == legacy_convert_results(net)
+
+def test_vectorized_conversion_on_synthetic_case_with_trafos():
+    net = _solved_net(generate_matpower_case(120, trafo_every=10))
+    assert len(net.trafo) > 0
+
+    result = service._convert_results(net)
+    assert result == legacy_convert_results(net)
+    assert len(result.lines) == len(net.line) + len(net.trafo)
+
+def test_debug_details_only_formatted_when_debug_enabled(monkeypatch, caplog):
+    with open(os.path.join(service.data_dir, "case14p.m")) as f:
+        net = _solved_net(f.read())
+
+    calls = []
+    original_to_dict = pd.DataFrame.to_dict
+    def counting_to_dict(self, *args, **kwargs):
+        calls.append(1)
+        return original_to_dict(self, *args, **kwargs)
+    monkeypatch.setattr(pd.DataFrame, "to_dict", counting_to_dict)
+
+    service._convert_results(net)
+    assert calls == []
+
+    with caplog.at_level(logging.DEBUG, logger="app"):
+        service._convert_results(net)
+    assert len(calls) == 2  # linhas e transformadores
+    assert any("Dados das linhas" in message for message in caplog.messages)
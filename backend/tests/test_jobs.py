@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+import time
+from fastapi.testclient import TestClient
+from app.main import app
+from app.routes.simulation_routes import BATCH_MAX_SCENARIOS
+from app.services.job_queue import JobQueue
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+
+def wait_for_job(client, job_id, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        body = client.get(f"/sisep/jobs/{job_id}").json()
+        if body["job"]["status"] not in ("queued", "running"):
+            return body
+        time.sleep(0.05)
+    raise AssertionError("job não terminou")
+
+def test_simulation_and_batch_jobs_complete():
+    # O contexto mantém o event loop em que os jobs rodam entre as requisições
+    with TestClient(app) as client:
+        response = client.post("/sisep/jobs", json={"filename": "case9p.m", "solver": {"algorithm": "fdbx"}})
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert response.headers["Location"] == f"/sisep/jobs/{job_id}"
+        body = wait_for_job(client, job_id)
+        assert body["job"]["status"] == "done" and body["job"]["progress"] == 1.0
+        assert len(body["result"]["buses"]) == 9
+        assert body["result"]["solver"]["algorithm"] == "fdbx"
+
+        with open(os.path.join(DATA_DIR, "case5p.m"), "rb") as f:
+            job_id = client.post("/sisep/jobs/upload", files={"file": ("case5p.m", f)}).json()["job_id"]
+        assert len(wait_for_job(client, job_id)["result"]["buses"]) == 5
+
+        scenarios = [{"name": f"carga {factor}", "load_scaling": factor} for factor in (0.8, 1.0, 1.2)]
+        job_id = client.post("/sisep/jobs/batch", json={"filename": "case9p.m", "scenarios": scenarios}).json()["job_id"]
+        body = wait_for_job(client, job_id)
+        assert [scenario["index"] for scenario in body["scenarios"]] == [0, 1, 2]
+
+        # O stream de eventos de um job concluído envia o resultado e termina
+        events = client.get(f"/sisep/jobs/{job_id}/events").text
+        assert events.startswith("event: done\ndata: ")
+        assert json.loads(events.split("data: ", 1)[1])["job"]["job_id"] == job_id
+
+        assert client.delete(f"/sisep/jobs/{job_id}").status_code == 204
+        assert client.get(f"/sisep/jobs/{job_id}").status_code == 404
+
+def test_job_submission_errors():
+    client = TestClient(app)
+    assert client.post("/sisep/jobs", json={"filename": "inexistente.m"}).status_code == 400
+    assert client.post("/sisep/jobs", json={}).status_code == 422
+    response = client.post("/sisep/jobs", json={"filename": "case14p.m",
+                                                "solver": {"algorithm": "bogus", "tolerance_mva": -1}})
+    assert response.status_code == 400 and "Algoritmo inválido" in response.json()["detail"]
+    assert client.get("/sisep/jobs/desconhecido").status_code == 404
+
+    scenarios = [{"load_scaling": 1.0}] * (BATCH_MAX_SCENARIOS + 1)
+    response = client.post("/sisep/jobs/batch", json={"filename": "case9p.m", "scenarios": scenarios})
+    assert response.status_code == 400
+
+def test_queue_limits_concurrency_cancels_and_expires():
+    queue = JobQueue(max_running=1, max_jobs=3, ttl=0.05)
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow(job):
+            await release.wait()
+            return "ok"
+
+        first, second = queue.submit("simulation", "a", slow), queue.submit("simulation", "b", slow)
+        await asyncio.sleep(0.01)
+        assert (first.status, second.status) == ("running", "queued")
+
+        queue.cancel(second.job_id)
+        third = queue.submit("simulation", "c", slow)
+        queue.cancel(first.job_id)
+        await asyncio.sleep(0.01)
+        assert (first.status, second.status, third.status) == ("cancelled", "cancelled", "running")
+
+        release.set()
+        await asyncio.sleep(0.01)
+        assert third.status == "done" and third.result == "ok"
+        await asyncio.sleep(0.06)
+        return queue.get(third.job_id)
+
+    assert asyncio.run(scenario()) is None
+    assert queue.stats()["cancelled"] == 2 and queue.stats()["expired"] == 3
+
+def test_event_stream_sends_progress_only_on_changes(monkeypatch):
+    from app.routes import job_routes
+
+    monkeypatch.setattr(job_routes, "EVENTS_KEEPALIVE", 0.02)
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow(job):
+            await release.wait()
+            return []
+
+        job = job_routes.job_queue.submit("batch", "teste", slow)
+        await asyncio.sleep(0.01)
+        response = await job_routes.get_job_events(job.job_id)
+        stream = response.body_iterator
+        chunks = [await stream.__anext__() for _ in range(5)]
+        # Esperas encerradas pelo keep-alive não deixam futures para trás
+        assert len(job._waiters) <= 1
+        release.set()
+        chunks += [chunk async for chunk in stream]
+        return job, chunks
+
+    job, chunks = asyncio.run(scenario())
+    assert [chunk.split("\n", 1)[0] for chunk in chunks[:2]] == ["event: progress", ": keep-alive"]
+    assert sum(chunk.startswith("event: progress") for chunk in chunks) == 1
+    assert chunks[-1].startswith("event: done")
+    assert job._waiters == []
@@ -0,0 +1,64 @@
+import os
+import re
+import pytest
+import numpy as np
+from pandapower.converter.matpower import from_mpc
+from pandapower.converter.pypower import from_ppc
+from pandapower.toolbox import nets_equal
+from app.services.matpower_parser import DEFAULT_BASE_KV, parse_matpower
+from app.services.matpower_service import MatpowerService
+
+service = MatpowerService()
+CASES = sorted(f for f in os.listdir(service.data_dir) if f.endswith(".m"))
+
+# Referência: baseKV zerado corrigido no texto, como era feito antes do from_mpc
+BUS_SECTION = re.compile(r"^[ \t]*mpc\.bus\s*=\s*\[(?P<rows>.*?)\]", re.MULTILINE | re.DOTALL)
+ZERO_BASE_KV_ROW = re.compile(r"^(?P<prefix>[ \t]*[-+]?\d[^\s;,]*(?:[ \t,]+[^\s;,%]+){8}[ \t,]+)0+(?:\.0*)?(?=[\s;,\]%]|$)",
+                              re.MULTILINE)
+
+def fix_basekv_reference(content: str) -> str:
+    match = BUS_SECTION.search(content)
+    if match is None:
+        return content
+    start, end = match.span("rows")
+    rows = ZERO_BASE_KV_ROW.sub(rf"\g<prefix>{DEFAULT_BASE_KV:g}", content[start:end])
+    return content[:start] + rows + content[end:]
+
+@pytest.mark.parametrize("filename", CASES)
+def test_parser_matches_from_mpc(filename, tmp_path):
+    with open(os.path.join(service.data_dir, filename)) as f:
+        content = f.read()
+
+    # Referência: caminho antigo (texto corrigido gravado em arquivo + from_mpc)
+    fixed_path = tmp_path / filename
+    fixed_path.write_text(fix_basekv_reference(content))
+    expected = from_mpc(str(fixed_path))
+
+    assert nets_equal(from_ppc(parse_matpower(content), f_hz=50), expected)
+
+def test_parser_accepts_inline_rows_and_fixes_basekv():
+    ppc = parse_matpower("""
+        mpc.baseMVA = 100
+        mpc.bus = [1 3 0 0 0 0 1 1 0 0 1 1.1 0.9; 2 1 10 5 0 0 1 1 0 138 1 1.1 0.9];
+        mpc.gen = [1, 0, 0, 50, -50, 1, 100, 1, 100, 0];
+        mpc.branch = [
+            1 2 0.01 0.1 0 0 0 0 0 0 1 -360 360  % linha única
+        ];
+    """)
+
+    assert ppc["version"] == "2"
+    assert ppc["baseMVA"] == 100
+    np.testing.assert_array_equal(ppc["bus"][:, 0], [0, 1])
+    np.testing.assert_array_equal(ppc["bus"][:, 9], [DEFAULT_BASE_KV, 138])
+    assert ppc["gen"].shape == (1, 10)
+    assert ppc["branch"][0, 8] == 1  # tap 0 -> 1
+
+@pytest.mark.parametrize("content, message", [
+    ("mpc.baseMVA = 100;\nmpc.bus = [\n1 3 x 0;\n];", "não numérico"),
+    ("mpc.baseMVA = 100;\nmpc.bus = [\n1 3 0 0;\n2 1 0;\n];", "inconsistente"),
+    ("mpc.baseMVA = 100;\nmpc.bus = [\n1 3 0 0;\n", "não foi fechada"),
+    ("mpc.baseMVA = 100;\nmpc.bus = [\n1 3 0 0;\n];", "mpc.gen, mpc.branch"),
+])
+def test_parser_rejects_malformed_cases(content, message):
+    with pytest.raises(ValueError, match=message):
+        parse_matpower(content)
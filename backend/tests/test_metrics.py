@@ -0,0 +1,49 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.routes.simulation_routes import case_catalog
+from app.services.metrics import Histogram, Timings, collect, server_timing_header, stage
+
+client = TestClient(app)
+
+def test_histogram_renders_prometheus_buckets():
+    histogram = Histogram("sisep_teste_seconds", "Teste", ("stage",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "solve")
+    histogram.observe(0.5, "solve")
+    lines = histogram.render()
+
+    assert '# TYPE sisep_teste_seconds histogram' in lines
+    assert 'sisep_teste_seconds_bucket{stage="solve",le="0.1"} 1' in lines
+    assert 'sisep_teste_seconds_bucket{stage="solve",le="1"} 2' in lines
+    assert 'sisep_teste_seconds_bucket{stage="solve",le="+Inf"} 2' in lines
+    assert 'sisep_teste_seconds_count{stage="solve"} 2' in lines
+
+def test_stage_records_only_inside_collection():
+    with stage("fora"):
+        pass
+    with collect() as timings:
+        with stage("parse"):
+            pass
+        with stage("parse"):
+            pass
+    assert list(timings.spans) == ["parse"]
+    assert server_timing_header(timings).startswith("parse;dur=")
+    assert server_timing_header(Timings()) == ""
+
+def test_server_timing_header_and_metrics_endpoint(monkeypatch):
+    # Simulação de fato, sem o catálogo de modelos pré carregados
+    monkeypatch.setattr(case_catalog, "lookup", lambda filename: None)
+    response = client.get("/sisep/matpower/case5p.m")
+    assert response.status_code == 200
+    stages = [item.split(";")[0] for item in response.headers["Server-Timing"].split(", ")]
+    for expected in ("queue", "solve", "extract", "convert", "serialize", "total"):
+        assert expected in stages
+
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200
+    assert metrics.headers["content-type"].startswith("text/plain")
+    text = metrics.text
+    assert 'sisep_stage_duration_seconds_count{stage="solve",case="case5p.m"}' in text
+    assert 'sisep_solver_iterations_bucket{case="case5p.m",le="+Inf"}' in text
+    assert 'sisep_network_elements{case="case5p.m",element="buses"} 5' in text
+    assert 'route="/sisep/matpower/{filename}"' in text
+    assert 'sisep_executor{field="pending"} 0' in text
@@ -0,0 +1,88 @@
+import os
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.power_system_results import ColumnarPowerSystemResult
+
+client = TestClient(app)
+
+def test_columnar_format_matches_row_format():
+    rows = client.get("/sisep/matpower/case9p.m").json()
+    response = client.get("/sisep/matpower/case9p.m", params={"format": "columnar"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/vnd.sisep.columnar+json")
+    columnar = ColumnarPowerSystemResult.model_validate(response.json())
+    assert columnar.buses["vm_pu"] == pytest.approx([bus["vm_pu"] for bus in rows["buses"]])
+    assert columnar.lines["loading_percent"] == pytest.approx([line["loading_percent"] for line in rows["lines"]])
+    assert columnar.generators["bus_id"] == [gen["bus_id"] for gen in rows["generators"]]
+    assert columnar.loadSystemP == rows["loadSystemP"]
+
+def test_columnar_schema_is_documented_in_openapi():
+    response = app.openapi()["paths"]["/sisep/matpower/{filename}"]["get"]["responses"]["200"]
+    schema = response["content"]["application/vnd.sisep.columnar+json"]["schema"]
+    assert schema["title"] == "ColumnarPowerSystemResult"
+    assert {"buses", "lines"} <= set(schema["required"])
+
+def test_columnar_format_negotiated_by_accept_header_on_upload():
+    file_path = os.path.join(os.path.dirname(__file__), "../data/case5p.m")
+    with open(file_path, "rb") as f:
+        response = client.post(
+            "/sisep/simulate/matpower/upload",
+            files={"file": ("case5p.m", f, "text/plain")},
+            headers={"Accept": "application/vnd.sisep.columnar+json"},
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["format"] == "columnar"
+    assert len(data["buses"]["bus_id"]) == 5
+    assert response.headers["X-Cache"] in ("HIT", "MISS")
+
+def test_unknown_format_is_rejected():
+    response = client.get("/sisep/matpower/case3p.m", params={"format": "xml"})
+    assert response.status_code == 406
+
+def test_catalog_response_is_preencoded_with_etag():
+    with TestClient(app) as catalog_client:
+        deadline = time.monotonic() + 120
+        while catalog_client.get("/health/ready").status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        plain = catalog_client.get("/sisep/matpower/case14p.m", headers={"Accept-Encoding": "identity"})
+        assert plain.status_code == 200
+        etag = plain.headers["ETag"]
+        assert "content-encoding" not in plain.headers
+
+        cached = catalog_client.get("/sisep/matpower/case14p.m", headers={"If-None-Match": etag,
+                                                                          "Accept-Encoding": "identity"})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+        compressed = catalog_client.get("/sisep/matpower/case14p.m", headers={"Accept-Encoding": "gzip"},
+                                        params={"format": "columnar"})
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["ETag"].endswith('-gzip"')
+        raw = catalog_client.get("/sisep/matpower/case14p.m", headers={"Accept-Encoding": "identity"},
+                                 params={"format": "columnar"})
+        assert compressed.json() == raw.json()
+        assert int(compressed.headers["content-length"]) < len(raw.content)
+
+        # A revalidação do cliente gzip recebe a ETag da variante que ele guardou
+        revalidated = catalog_client.get("/sisep/matpower/case14p.m", params={"format": "columnar"},
+                                         headers={"If-None-Match": compressed.headers["ETag"],
+                                                  "Accept-Encoding": "gzip"})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["ETag"] == compressed.headers["ETag"]
+
+def test_large_upload_results_are_compressed():
+    file_path = os.path.join(os.path.dirname(__file__), "../data/case14p.m")
+    with open(file_path, "rb") as f:
+        response = client.post(
+            "/sisep/simulate/matpower/upload",
+            files={"file": ("case14p.m", f, "text/plain")},
+            headers={"Accept-Encoding": "gzip"},
+        )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()["buses"]) == 14
@@ -0,0 +1,60 @@
+import os
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.matpower_service import MatpowerService
+from app.services.result_projection import build_selection
+
+client = TestClient(app)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "../data")
+
+def test_tables_and_fields_are_projected():
+    response = client.get("/sisep/matpower/case14p.m",
+                          params={"fields": "buses.vm_pu,lines.loading_percent"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"buses", "lines", "solver"}
+    assert set(data["buses"][0]) == {"bus_id", "vm_pu"}
+    assert set(data["lines"][0]) == {"from_bus", "to_bus", "loading_percent"}
+
+    totals = client.get("/sisep/matpower/case14p.m", params={"tables": "totals,ext_grid"}).json()
+    assert set(totals) == {"ext_grid", "genCapacityP", "genCapacityQmin", "genCapacityQmax",
+                           "loadSystemP", "loadSystemQ", "solver"}
+
+def test_filters_match_full_result_on_file_and_upload():
+    full = client.get("/sisep/matpower/case9p.m").json()
+    params = {"tables": "buses,lines", "min_loading": 30, "vm_min": 1.0, "vm_max": 1.03}
+    expected_buses = [bus["bus_id"] for bus in full["buses"] if not 1.0 <= bus["vm_pu"] <= 1.03]
+    expected_lines = [(line["from_bus"], line["to_bus"]) for line in full["lines"] if line["loading_percent"] > 30]
+    assert expected_buses and expected_lines
+
+    with open(os.path.join(DATA_DIR, "case9p.m"), "rb") as f:
+        content = f.read()
+    uploaded = client.post("/sisep/simulate/matpower/upload", params=params,
+                           files={"file": ("case9p.m", content, "text/plain")})
+    for data in (client.get("/sisep/matpower/case9p.m", params=params).json(), uploaded.json()):
+        assert [bus["bus_id"] for bus in data["buses"]] == expected_buses
+        assert [(line["from_bus"], line["to_bus"]) for line in data["lines"]] == expected_lines
+
+    columnar = client.get("/sisep/matpower/case9p.m", params={**params, "format": "columnar"}).json()
+    assert columnar["buses"]["bus_id"] == expected_buses
+
+def test_invalid_selection_returns_400():
+    response = client.get("/sisep/matpower/case14p.m", params={"fields": "buses.loading_percent"})
+    assert response.status_code == 400
+    response = client.get("/sisep/matpower/case14p.m", params={"tables": "trafos"})
+    assert response.status_code == 400
+
+def test_extraction_skips_unselected_tables_and_fields():
+    service = MatpowerService()
+    with open(os.path.join(DATA_DIR, "case9p.m")) as f:
+        net = service._net_from_string(f.read())
+    full = service._run_simulation_columns(net)
+
+    selection = build_selection(fields="lines.loading_percent", min_loading=50)
+    columns = service._extract_result_columns(net, selection)
+    assert set(columns) == {"lines"}
+    assert set(columns["lines"]) == {"from_bus", "to_bus", "loading_percent"}
+    assert columns["lines"]["loading_percent"] == pytest.approx(full["lines"]["loading_percent"])
@@ -0,0 +1,65 @@
+import os
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.scenario_models import LoadChange, ScenarioDelta
+from app.services.matpower_service import MatpowerService
+from app.services.session_store import SessionStore
+
+client = TestClient(app)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "../data")
+
+def test_session_applies_cumulative_deltas():
+    response = client.post("/sisep/sessions", json={"filename": "case9p.m"})
+    assert response.status_code == 201
+    session = response.json()["session"]
+    session_id = session["session_id"]
+    assert (session["source"], session["revision"]) == ("case9p.m", 0)
+
+    response = client.patch(f"/sisep/sessions/{session_id}", json={"loads": [{"bus_id": 4, "p_mw": 120.0}]})
+    assert response.status_code == 200
+    response = client.patch(f"/sisep/sessions/{session_id}", json={"branches": [{"index": 1, "in_service": False}]})
+    data = response.json()
+    assert data["session"]["revision"] == 2
+
+    # Mesmo resultado que simular as duas alterações juntas sobre o caso original
+    service = MatpowerService()
+    expected = service.simulate_scenario(service.load_case_net("case9p.m"), ScenarioDelta(
+        loads=[LoadChange(bus_id=4, p_mw=120.0)], branches=[{"index": 1, "in_service": False}],
+    ))
+    assert [bus["vm_pu"] for bus in data["result"]["buses"]] == pytest.approx([bus.vm_pu for bus in expected.buses])
+    current = client.get(f"/sisep/sessions/{session_id}").json()
+    assert (current["session"]["revision"], current["result"]) == (2, data["result"])
+
+    assert client.delete(f"/sisep/sessions/{session_id}").status_code == 204
+    assert client.get(f"/sisep/sessions/{session_id}").status_code == 404
+
+def test_invalid_delta_keeps_session_state():
+    with open(os.path.join(DATA_DIR, "case5p.m"), "rb") as f:
+        response = client.post("/sisep/sessions/upload", files={"file": ("case5p.m", f, "text/plain")})
+    assert response.status_code == 201
+    before = response.json()
+    session_id = before["session"]["session_id"]
+
+    response = client.patch(f"/sisep/sessions/{session_id}",
+                            json={"loads": [{"bus_id": 1, "p_mw": 50.0}, {"bus_id": 99, "p_mw": 1.0}]})
+    assert response.status_code == 400
+    current = client.get(f"/sisep/sessions/{session_id}").json()
+    assert (current["session"]["revision"], current["result"]) == (0, before["result"])
+
+    response = client.patch(f"/sisep/sessions/{session_id}", json={"loads": [{"bus_id": 1, "p_mw": 50.0}]})
+    assert response.json()["session"]["revision"] == 1
+    assert response.json()["result"]["buses"] != before["result"]["buses"]
+
+def test_sessions_expire_and_are_evicted():
+    store = SessionStore(max_sessions=2, ttl=0.05)
+    first = store.create("a", object())
+    store.create("b", object())
+    store.create("c", object())
+    assert store.get(first.session_id) is None
+
+    session = store.create("d", object())
+    time.sleep(0.1)
+    assert store.get(session.session_id) is None
@@ -0,0 +1,181 @@
+import asyncio
+import threading
+import pytest
+from app.services.matpower_service import MatpowerService
+from app.services.simulation_executor import (
+    SimulationExecutor, SimulationOverloadedError, SimulationTimeoutError
+)
+
+class SlowService:
+    """Serviço falso cuja simulação só termina quando liberada pelo teste"""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def simulate_from_filename(self, filename):
+        self.release.wait(5)
+        return filename
+
+def test_executor_rejects_when_queue_is_full():
+    service = SlowService()
+    executor = SimulationExecutor(service, mode="thread", max_workers=1, max_pending=1, timeout=5)
+
+    async def scenario():
+        first = asyncio.create_task(executor.run("simulate_from_filename", "case3p.m"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(SimulationOverloadedError):
+            await executor.run("simulate_from_filename", "case4p.m")
+        service.release.set()
+        return await first
+
+    assert asyncio.run(scenario()) == "case3p.m"
+    assert executor.stats()["rejected"] == 1
+    executor.shutdown()
+
+def test_waiting_calls_are_deferred_instead_of_rejected():
+    service = SlowService()
+    executor = SimulationExecutor(service, mode="thread", max_workers=1, max_pending=1, timeout=5)
+
+    async def scenario():
+        first = asyncio.create_task(executor.run("simulate_from_filename", "case3p.m"))
+        await asyncio.sleep(0.05)
+        waiting = asyncio.create_task(executor.run("simulate_from_filename", "case4p.m", wait=True))
+        await asyncio.sleep(0.1)
+        assert not waiting.done()
+        service.release.set()
+        return await first, await waiting
+
+    assert asyncio.run(scenario()) == ("case3p.m", "case4p.m")
+    assert executor.stats()["rejected"] == 0 and executor.stats()["deferred"] >= 1
+    executor.shutdown()
+
+def test_executor_times_out_and_keeps_slot_until_done():
+    service = SlowService()
+    executor = SimulationExecutor(service, mode="thread", max_workers=1, max_pending=2, timeout=0.05)
+
+    with pytest.raises(SimulationTimeoutError):
+        asyncio.run(executor.run("simulate_from_filename", "case3p.m"))
+    # A simulação continua no pool e ainda ocupa uma vaga
+    assert executor.pending == 1
+    service.release.set()
+    executor.shutdown()
+
+def test_auto_mode_uses_processes_on_multicore_hosts(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 4)
+    assert SimulationExecutor(SlowService(), mode="auto").mode == "process"
+    monkeypatch.setattr("os.cpu_count", lambda: 1)
+    assert SimulationExecutor(SlowService(), mode="auto").mode == "thread"
+    with pytest.raises(ValueError):
+        SimulationExecutor(SlowService(), mode="fiber")
+
+def test_process_pool_runs_simulation():
+    executor = SimulationExecutor(MatpowerService(), mode="process", max_workers=1, timeout=120)
+    result = asyncio.run(executor.run("simulate_from_filename", "case3p.m"))
+
+    assert len(result.buses) == 3
+    assert executor.pending == 0
+    executor.shutdown()
+
+def test_concurrent_identical_calls_share_one_execution():
+    service = SlowService()
+    executor = SimulationExecutor(service, mode="thread", max_workers=2, max_pending=8, timeout=5)
+
+    async def scenario():
+        calls = [asyncio.create_task(executor.run_coalesced("case3p.m", "simulate_from_filename", "case3p.m"))
+                 for _ in range(5)]
+        other = asyncio.create_task(executor.run_coalesced("case4p.m", "simulate_from_filename", "case4p.m"))
+        await asyncio.sleep(0.05)
+        assert executor.stats()["coalescing"]["in_flight"] == 2
+        service.release.set()
+        return await asyncio.gather(*calls), await other
+
+    results, other = asyncio.run(scenario())
+    assert sorted(results) == [("case3p.m", False)] + [("case3p.m", True)] * 4
+    assert other == ("case4p.m", False)
+    assert executor.stats()["coalescing"] == {"in_flight": 0, "executions": 2, "coalesced": 4}
+    executor.shutdown()
+
+def test_jobs_and_interactive_calls_do_not_share_executions():
+    service = SlowService()
+    executor = SimulationExecutor(service, mode="thread", max_workers=2, max_pending=8, timeout=5)
+
+    async def scenario():
+        # Job em andamento: a requisição interativa com a mesma chave mantém o próprio tempo limite
+        job = asyncio.create_task(executor.run_coalesced(
+            "case3p.m", "simulate_from_filename", "case3p.m", timeout=60, wait=True
+        ))
+        await asyncio.sleep(0.05)
+        with pytest.raises(SimulationTimeoutError):
+            await executor.run_coalesced("case3p.m", "simulate_from_filename", "case3p.m", timeout=0.1)
+        service.release.set()
+        first = await job
+
+        # E um job não herda o tempo limite da requisição interativa em andamento
+        service.release.clear()
+        interactive = asyncio.create_task(
+            executor.run_coalesced("case3p.m", "simulate_from_filename", "case3p.m", timeout=0.1)
+        )
+        job = asyncio.create_task(executor.run_coalesced(
+            "case3p.m", "simulate_from_filename", "case3p.m", timeout=60, wait=True
+        ))
+        with pytest.raises(SimulationTimeoutError):
+            await interactive
+        service.release.set()
+        return first, await job
+
+    assert asyncio.run(scenario()) == (("case3p.m", False), ("case3p.m", False))
+    assert executor.stats()["coalescing"]["coalesced"] == 0
+    executor.shutdown()
+
+def test_concurrent_requests_for_same_case_are_coalesced(monkeypatch):
+    import httpx
+    from app.main import app
+    from app.routes.simulation_routes import case_catalog, simulation_executor
+
+    monkeypatch.setattr(case_catalog, "lookup", lambda filename: None)
+    before = simulation_executor.single_flight.coalesced
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.get("/sisep/matpower/case9p.m") for _ in range(4)))
+
+    responses = asyncio.run(scenario())
+    assert all(response.status_code == 200 for response in responses)
+    assert simulation_executor.single_flight.coalesced - before == 3
+    # Apenas a requisição que iniciou a simulação informa o tempo do solver como seu
+    cached = sorted(response.json()["solver"]["cached"] for response in responses)
+    assert cached == [False, True, True, True]
+    buses = [response.json()["buses"] for response in responses]
+    assert all(b == buses[0] for b in buses)
+
+def test_concurrent_uploads_report_coalesced_cache_status(monkeypatch):
+    import os
+    import time
+    import httpx
+    from app.main import app
+    from app.routes.simulation_routes import matpower_service
+
+    # Simulação lenta o bastante para os envios simultâneos chegarem durante ela
+    run_simulation_columns = matpower_service._run_simulation_columns
+    def slow_simulation(*args, **kwargs):
+        time.sleep(0.2)
+        return run_simulation_columns(*args, **kwargs)
+    monkeypatch.setattr(matpower_service, "_run_simulation_columns", slow_simulation)
+    matpower_service.result_cache.clear()
+    with open(os.path.join(os.path.dirname(__file__), "../data/case9p.m"), "rb") as f:
+        content = f.read()
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(
+                client.post("/sisep/simulate/matpower/upload", files={"file": ("case9p.m", content, "text/plain")})
+                for _ in range(3)
+            ))
+
+    responses = asyncio.run(scenario())
+    statuses = sorted(response.headers["X-Cache"] for response in responses)
+    assert statuses == ["COALESCED", "COALESCED", "MISS"]
+    for response in responses:
+        assert response.json()["solver"]["cached"] == (response.headers["X-Cache"] != "MISS")
@@ -0,0 +1,40 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.routes.simulation_routes import case_catalog
+from app.services import solver_backend
+from app.services.solver_backend import build_solver_options, resolve_solver
+
+client = TestClient(app)
+
+def test_response_reports_solver_and_time(monkeypatch):
+    monkeypatch.setattr(case_catalog, "lookup", lambda filename: None)
+    solver = client.get("/sisep/matpower/case9p.m").json()["solver"]
+    assert solver["algorithm"] == "nr"
+    assert solver["backend"] == "pandapower"
+    assert solver["time_ms"] > 0
+
+def test_request_selects_algorithm():
+    for algorithm in ("iwamoto_nr", "fdbx", "fdxb"):
+        response = client.get("/sisep/matpower/case9p.m", params={"algorithm": algorithm, "tolerance_mva": 1e-6})
+        assert response.status_code == 200
+        assert response.json()["solver"]["algorithm"] == algorithm
+
+    # Fluxo DC: sem grandezas reativas (null), também no formato colunar
+    response = client.get("/sisep/matpower/case9p.m", params={"algorithm": "dc", "format": "columnar"})
+    assert response.status_code == 200
+    columns = response.json()
+    assert columns["solver"]["algorithm"] == "dc"
+    assert all(q is None for q in columns["buses"]["q_mvar"])
+
+def test_invalid_solver_options_are_rejected():
+    assert client.get("/sisep/matpower/case9p.m", params={"algorithm": "gs"}).status_code == 400
+    assert client.get("/sisep/matpower/case9p.m", params={"backend": "lightsim2grid",
+                                                          "algorithm": "fdbx"}).status_code == 400
+
+def test_auto_backend_depends_on_network_size(monkeypatch):
+    monkeypatch.setattr(solver_backend, "module_available", lambda name: name == "lightsim2grid")
+    large = solver_backend.LIGHTSIM_MIN_BUSES
+    assert resolve_solver(None, large).backend == "lightsim2grid"
+    assert resolve_solver(None, large - 1).backend == "pandapower"
+    assert resolve_solver(build_solver_options(algorithm="dc"), large).backend == "pandapower"
+    assert resolve_solver(build_solver_options(backend="pandapower"), large).backend == "pandapower"
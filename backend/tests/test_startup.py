@@ -0,0 +1,89 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from fastapi.testclient import TestClient
+from app.main import app
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+# Módulos do solver que não podem ser carregados ao importar a aplicação
+SOLVER_MODULES = ("pandapower", "pandas", "scipy")
+
+# Orçamento (ms) do import de app.main; folgado para máquinas de CI lentas
+IMPORT_BUDGET_MS = float(os.getenv("SISEP_IMPORT_BUDGET_MS", "1500"))
+
+def wait_until_ready(client: TestClient, timeout: float = 120.0):
+    """Aguarda o aquecimento em segundo plano da inicialização"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = client.get("/health/ready")
+        if response.status_code == 200:
+            return response.json()
+        assert response.json()["status"] == "warming"
+        time.sleep(0.05)
+    raise AssertionError("Aplicação não ficou pronta a tempo")
+
+def test_import_does_not_load_solver_modules():
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    ).stderr
+
+    # Linhas "import time: self | cumulative | módulo" (em microssegundos)
+    imported = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imported[name.strip()] = int(cumulative)
+
+    loaded = sorted(name for name in imported if name.split(".")[0] in SOLVER_MODULES)
+    assert loaded == []
+    assert imported["app.main"] / 1000 < IMPORT_BUDGET_MS
+
+def test_liveness_and_readiness():
+    with TestClient(app) as client:
+        assert client.get("/health/live").json() == {"status": "live"}
+        ready = wait_until_ready(client)
+        assert ready["status"] == "ready"
+        assert ready["solver_warm"]
+
+# Aplicação em modo process (variável de ambiente lida no import): simula e
+# devolve o que as rotas de monitoramento informam sobre os processos do pool
+PROCESS_MODE_SCRIPT = """
+import json, time
+from fastapi.testclient import TestClient
+from app.main import app
+
+with TestClient(app) as client:
+    deadline = time.monotonic() + 120
+    while client.get("/health/ready").status_code != 200 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    with open("data/case9p.m", "rb") as f:
+        upload = client.post("/sisep/simulate/matpower/upload", files={"file": ("case9p.m", f, "text/plain")})
+    print(json.dumps({
+        "upload": [upload.status_code, upload.headers["X-Cache"]],
+        "ready": client.get("/health/ready").json(),
+        "stats": client.get("/sisep/cache/stats").json(),
+        "metrics": client.get("/metrics").text,
+    }))
+"""
+
+def test_process_mode_reports_worker_caches():
+    env = {**os.environ, "SISEP_EXECUTOR_MODE": "process", "SISEP_EXECUTOR_WORKERS": "1"}
+    output = subprocess.run(
+        [sys.executable, "-c", PROCESS_MODE_SCRIPT], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True, timeout=300,
+    ).stdout
+    report = json.loads(output.splitlines()[-1])
+
+    assert report["upload"] == [200, "MISS"]
+    assert report["ready"]["solver_warm"]
+    # O resultado fica no cache do processo do pool, não no do processo principal
+    (worker, service), = report["stats"]["workers"].items()
+    assert worker.startswith("pid-") and service["solver_warm"]
+    assert service["caches"]["results"]["size"] == 1
+    assert report["stats"]["results"]["size"] == 0
+    assert f'sisep_cache{{worker="{worker}",cache="results",field="size"}} 1' in report["metrics"]
@@ -0,0 +1,70 @@
+import io
+import json
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.scenario_models import ScenarioDelta
+from app.services.matpower_service import MatpowerService
+from app.services.timeseries_service import read_profile
+
+client = TestClient(app)
+
+def _npy(array) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, np.asarray(array, dtype=float))
+    return buffer.getvalue()
+
+def test_read_profile_formats():
+    assert read_profile(b"load\n1.0\n0.5\n", "perfil.csv").shape == (2, 1)
+    assert read_profile(b"1.0,0.9\n0.5,0.4\n0.8,0.7\n", "perfil.csv").shape == (3, 2)
+    assert read_profile(_npy([1.0, 0.9, 0.8]), "perfil.npy").shape == (3, 1)
+    with pytest.raises(ValueError):
+        read_profile(b"a,b\nc,d\n", "perfil.csv")
+
+def test_timeseries_steps_match_individual_simulations():
+    service = MatpowerService()
+    net = service.load_case_net("case14p.m")
+    factors = [1.0, 1.1, 0.9]
+    results = service.simulate_timeseries(net, np.array(factors)[:, None], None)
+
+    assert results["converged"].all()
+    assert results["bus_vm_pu"].shape == (3, 14)
+    assert results["line_loading_percent"].shape == (3, 20)
+    assert (results["iterations"] > 0).all()
+    # A rede é devolvida com o escalonamento original
+    assert (net.load.scaling == 1.0).all()
+
+    for step, factor in enumerate(factors):
+        expected = service.simulate_scenario(net, ScenarioDelta(load_scaling=factor))
+        assert results["bus_vm_pu"][step] == pytest.approx([b.vm_pu for b in expected.buses], abs=1e-6)
+        assert results["load_p_mw"][step] == pytest.approx(expected.loadSystemP * factor)
+
+def test_timeseries_endpoint_streams_chunks_and_npz():
+    profile = b"\n".join(str(1 + 0.05 * i).encode() for i in range(5))
+    response = client.post(
+        "/sisep/simulate/timeseries", params={"chunk_size": 2},
+        data={"filename": "case9p.m"}, files={"load_profile": ("carga.csv", profile, "text/csv")},
+    )
+    assert response.status_code == 200
+    chunks = [json.loads(line) for line in response.text.splitlines()]
+    assert [c["start"] for c in chunks] == [0, 2, 4]
+    assert sum(c["steps"] for c in chunks) == 5
+    assert all(all(c["converged"]) for c in chunks)
+
+    response = client.post(
+        "/sisep/simulate/timeseries", params={"format": "npz"},
+        data={"filename": "case9p.m"}, files={"load_profile": ("carga.npy", _npy([1.0, 1.05]), "application/octet-stream")},
+    )
+    assert response.status_code == 200
+    with np.load(io.BytesIO(response.content)) as results:
+        assert results["bus_vm_pu"].shape == (2, 9)
+        assert results["load_p_mw"][1] == pytest.approx(1.05 * results["load_p_mw"][0])
+
+def test_timeseries_rejects_profile_with_wrong_columns():
+    response = client.post(
+        "/sisep/simulate/timeseries",
+        data={"filename": "case9p.m"}, files={"load_profile": ("carga.csv", b"1,1\n1,1\n", "text/csv")},
+    )
+    assert response.status_code == 400
+    assert "colunas" in response.json()["detail"]
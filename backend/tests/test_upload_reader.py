@@ -0,0 +1,66 @@
+import os
+import pytest
+from fastapi.testclient import TestClient
+import app.main as main
+from app.main import app
+from app.services import upload_reader
+from app.services.cache import content_hash
+from app.services.matpower_parser import parse_matpower
+from app.services.upload_reader import MatpowerUploadReader, UploadTooLargeError
+
+client = TestClient(app)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "../data")
+
+def _read_case(name: str) -> str:
+    with open(os.path.join(DATA_DIR, name)) as f:
+        return f.read()
+
+def test_reader_matches_parser_and_hash_across_chunk_boundaries():
+    # Comentário com caractere multibyte e quebras de linha Windows
+    content = "% Sistema de operação\r\n" + _read_case("case9p.m").replace("\n", "\r\n")
+    data = content.encode()
+    reader = MatpowerUploadReader()
+    for start in range(0, len(data), 7):
+        reader.feed(data[start:start + 7])
+    ppc, key = reader.result()
+
+    expected = parse_matpower(content)
+    assert key == content_hash(content) == content_hash(_read_case("case9p.m"))
+    for name in ("bus", "gen", "branch"):
+        assert (ppc[name] == expected[name]).all()
+
+def test_malformed_section_is_rejected_before_the_rest_is_read():
+    reader = MatpowerUploadReader()
+    with pytest.raises(ValueError, match="linha 3"):
+        reader.feed(b"function mpc = bad\nmpc.bus = [\n1 3 x 0;\n")
+
+def test_upload_over_limit_returns_413(monkeypatch):
+    content = _read_case("case14p.m").encode()
+    monkeypatch.setattr(upload_reader, "MAX_UPLOAD_BYTES", len(content) - 1)
+    response = client.post("/sisep/simulate/matpower/upload", files={"file": ("case14p.m", content, "text/plain")})
+    assert response.status_code == 413
+
+    # Content-Length acima do limite: recusado sem ler o corpo
+    monkeypatch.setattr(main, "MAX_UPLOAD_BYTES", 0)
+    monkeypatch.setattr(main, "UPLOAD_FORM_OVERHEAD", 0)
+    response = client.post("/sisep/sessions/upload", files={"file": ("case14p.m", content, "text/plain")})
+    assert response.status_code == 413
+
+def test_timeseries_profile_over_limit_returns_413(monkeypatch):
+    monkeypatch.setattr(upload_reader, "MAX_UPLOAD_BYTES", 16)
+    response = client.post(
+        "/sisep/simulate/timeseries",
+        data={"filename": "case9p.m"}, files={"load_profile": ("carga.csv", b"1.0\n" * 10, "text/csv")},
+    )
+    assert response.status_code == 413
+    assert "carga.csv" in response.json()["detail"]
+
+def test_upload_rejects_invalid_utf8_and_reader_limit():
+    response = client.post("/sisep/simulate/matpower/upload",
+                           files={"file": ("case.m", b"mpc.bus = [\xff\xfe];", "text/plain")})
+    assert response.status_code == 400
+
+    reader = MatpowerUploadReader(max_bytes=10)
+    with pytest.raises(UploadTooLargeError):
+        reader.feed(b"x" * 11)